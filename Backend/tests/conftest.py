@@ -0,0 +1,10 @@
+"""
+测试公共配置（在 Backend 目录执行：python -m pytest tests）
+"""
+import os
+import sys
+
+# 添加项目根目录到 Python 路径（确保可导入 user 包）
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+import pytest
+
+from user.domains.analysis.value_objects import HistoryCursor
+
+
+def test_history_cursor_survives_unencoded_query_string():
+    cursor = HistoryCursor(datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=timezone.utc), uuid4())
+    encoded = cursor.encode()
+    # 客户端直接拼接到 URL 而未做百分号编码
+    (value,) = parse_qs(f"limit=20&cursor={encoded}")["cursor"]
+    assert HistoryCursor.decode(value) == cursor
+
+
+def test_history_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        HistoryCursor.decode("2024-05-01T08:30:15 00:00_not-a-uuid")
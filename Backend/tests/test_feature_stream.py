@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from user.application.dto.gis_dto import FeatureQueryDTO
+from user.application.use_cases.gis.feature_query_use_case import FeatureQueryUseCase
+from user.domains.gis.entities import LayerEntity
+from user.domains.gis.repositories import MockLayerRepository
+from user.domains.gis.services import FeatureQueryService, LayerService
+from user.infrastructure.database.postgres.gis_repositories import PostgreSQLFeatureRepository
+
+
+def _use_case() -> FeatureQueryUseCase:
+    layers = MockLayerRepository()
+    layers.layers["parcels"] = LayerEntity(
+        name="parcels",
+        schema="sdx",
+        geometry_column="geom",
+        srid=4326,
+        columns={"geom": "geometry", "area": "integer", "name": "text"},
+    )
+    # 构造语句不访问数据库，无需会话
+    service = FeatureQueryService(LayerService(layers), PostgreSQLFeatureRepository(session=None))
+    return FeatureQueryUseCase(service)
+
+
+@pytest.mark.parametrize("payload", [
+    {"conditions": [{"field_name": "area", "operator": "gt", "value": "abc"}]},
+    {"cursor": "1; drop table parcels"},
+])
+def test_prepare_stream_rejects_bad_values_before_streaming(payload):
+    query_data = FeatureQueryDTO(**payload)
+    with pytest.raises(ValueError):
+        asyncio.run(_use_case().prepare_stream("parcels", query_data))
+
+
+def test_prepare_stream_accepts_valid_query():
+    query_data = FeatureQueryDTO(
+        conditions=[{"field_name": "area", "operator": "gt", "value": "10"}],
+        cursor="(0,3)",
+    )
+    layer, query = asyncio.run(_use_case().prepare_stream("parcels", query_data))
+    assert layer.name == "parcels" and query.after == "(0,3)"
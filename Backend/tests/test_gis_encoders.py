@@ -0,0 +1,48 @@
+"""
+GIS 编码器测试
+"""
+import json
+
+from user.infrastructure.gis.encoders import _bbox_of, encode_topojson
+
+POLYGON_WITH_HOLE = {
+    "type": "Polygon",
+    "coordinates": [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[2, 2], [3, 2], [2, 3], [2, 2]],
+    ],
+}
+MULTIPOLYGON_UNEVEN = {
+    "type": "MultiPolygon",
+    "coordinates": [
+        [[[20, 20], [21, 20], [21, 21], [20, 20]]],
+        [[[30, 30], [31, 30], [31, 31], [30, 31], [30, 30]]],
+    ],
+}
+
+
+def _collection(*geometries):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": i, "properties": {}, "geometry": g}
+            for i, g in enumerate(geometries)
+        ],
+    }
+
+
+def test_bbox_polygon_with_hole():
+    assert _bbox_of(_collection(POLYGON_WITH_HOLE)) == (0.0, 0.0, 10.0, 10.0)
+
+
+def test_bbox_multipolygon_uneven_parts_and_collection():
+    point = {"type": "GeometryCollection", "geometries": [{"type": "Point", "coordinates": [-5, 40]}]}
+    assert _bbox_of(_collection(MULTIPOLYGON_UNEVEN, point)) == (-5.0, 20.0, 31.0, 40.0)
+
+
+def test_topojson_polygon_with_hole():
+    topology = json.loads(encode_topojson(_collection(POLYGON_WITH_HOLE, MULTIPOLYGON_UNEVEN)))
+    polygon, multipolygon = topology["objects"]["features"]["geometries"]
+    assert polygon["arcs"] == [[0], [1]]
+    assert multipolygon["arcs"] == [[[2]], [[3]]]
+    assert len(topology["arcs"][1]) == 4
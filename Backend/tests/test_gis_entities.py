@@ -0,0 +1,23 @@
+from user.domains.gis.entities import LayerEntity
+
+
+def test_attribute_columns_skip_only_supermap_system_fields():
+    layer = LayerEntity(
+        name="roads",
+        schema="sdx",
+        geometry_column="smgeometry",
+        srid=4326,
+        id_column="SmID",
+        columns={
+            "SmID": "integer",
+            "SmUserID": "integer",
+            "SmSdriW": "double precision",
+            "SmLength": "double precision",
+            "smgeometry": "geometry",
+            "smoke": "integer",
+            "smart_id": "text",
+            "name": "text",
+            "thumbnail": "bytea",
+        },
+    )
+    assert layer.attribute_columns == ["SmID", "smoke", "smart_id", "name"]
@@ -0,0 +1,17 @@
+import pytest
+
+from user.infrastructure.jobs.handlers import buffer, thiessen
+
+
+def _report(*args, **kwargs):
+    pass
+
+
+@pytest.mark.parametrize("handler, params", [
+    (buffer, {"distance": 100}),
+    (buffer, {"geometry": {"type": "Point"}, "distance": 100}),
+    (thiessen, {"points": [{"type": "Feature", "properties": {}}, {"type": "Point", "coordinates": [0, 0]}]}),
+])
+def test_missing_or_malformed_geometry_raises_value_error(handler, params):
+    with pytest.raises(ValueError, match="geometry"):
+        handler(params, _report)
@@ -0,0 +1,19 @@
+"""
+仓储查询执行计划检查（需要已执行 alembic upgrade head 的数据库）
+
+设置 DATABASE_URL（postgresql+asyncpg://...）后运行，未设置时跳过。
+"""
+import asyncio
+import os
+
+import pytest
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="未设置 DATABASE_URL")
+
+
+def test_repository_queries_use_indexes():
+    from user.utils.check_query_plans import check
+
+    assert asyncio.run(check(DATABASE_URL)) == 0
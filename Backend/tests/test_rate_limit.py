@@ -0,0 +1,23 @@
+"""
+限流客户端识别测试
+"""
+from user.core.rate_limit import _client_ip
+
+
+def _scope(*forwarded):
+    return {"client": ("10.0.0.2", 1234), "headers": [(b"x-forwarded-for", value.encode()) for value in forwarded]}
+
+
+def test_forwarded_ignored_when_untrusted():
+    assert _client_ip(_scope("1.1.1.1"), False) == "10.0.0.2"
+
+
+def test_spoofed_leftmost_entry_is_ignored():
+    assert _client_ip(_scope("6.6.6.6, 203.0.113.7"), True) == "203.0.113.7"
+
+
+def test_trusted_hops_skip_inner_proxies():
+    scope = _scope("6.6.6.6, 203.0.113.7", "172.16.0.5")
+    assert _client_ip(scope, True, trusted_hops=2) == "203.0.113.7"
+    assert _client_ip(_scope("203.0.113.7"), True, trusted_hops=3) == "203.0.113.7"
+    assert _client_ip(_scope(), True) == "10.0.0.2"
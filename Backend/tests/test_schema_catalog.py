@@ -0,0 +1,34 @@
+import json
+import multiprocessing
+import os
+
+from user.infrastructure.database.postgres.catalog import CATALOG_FORMAT_VERSION, SchemaCatalogService
+
+
+def _write_catalog(cache_path: str, worker: int) -> None:
+    service = SchemaCatalogService(engine=None, schema="sdx", cache_path=cache_path)
+    catalog = {
+        "format_version": CATALOG_FORMAT_VERSION,
+        "schema": "sdx",
+        "tables": [{"name": f"t{worker}_{i}", "columns": ["x" * 200]} for i in range(500)],
+    }
+    for _ in range(20):
+        service._store(catalog)
+        service._write_cache_file()
+
+
+def test_concurrent_cache_writes_leave_a_complete_file(tmp_path):
+    """多个工作进程同时刷新时，缓存文件始终是某一次完整写入的结果"""
+    cache_path = str(tmp_path / "catalog" / "sdx.json")
+    processes = [
+        multiprocessing.Process(target=_write_catalog, args=(cache_path, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+    with open(cache_path, encoding="utf-8") as f:
+        assert len(json.load(f)["tables"]) == 500
+    assert os.listdir(tmp_path / "catalog") == ["sdx.json"]
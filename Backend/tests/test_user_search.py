@@ -0,0 +1,36 @@
+"""
+Mock 仓储词相似度与 pg_trgm word_similarity 的一致性测试
+"""
+import asyncio
+
+import pytest
+
+from user.domains.user.entities import UserEntity
+from user.domains.user.repositories import MockUserRepository, word_similarity
+
+
+@pytest.mark.parametrize("query, text, expected", [
+    # PostgreSQL 文档 pg_trgm 一节的示例
+    ("word", "two words", 0.8),
+    ("word", "word", 1.0),
+    # 查询三元组分散在不相邻的词中：按最相似的连续片段计分，而非全文命中比例（后者为 1.0）
+    ("abcd", "abc zzzz bcd", 0.6),
+    ("abcde", "abc zzzz cde", 0.5),
+    ("alcie", "alice", 2 / 6),
+    ("", "alice", 0.0),
+])
+def test_word_similarity_matches_pg_trgm(query, text, expected):
+    assert word_similarity(query, text) == pytest.approx(expected, abs=1e-6)
+
+
+def test_search_threshold_uses_extent_similarity():
+    repository = MockUserRepository()
+
+    async def run():
+        # 前者全文命中 5/6 个查询三元组，但最相似片段仅 0.5，低于阈值 0.6
+        for name in ("abc_zzzz_cde", "abcdex"):
+            await repository.create(UserEntity.create_new(f"{name}@example.com", name, "x"))
+        return await repository.search("abcde", 10)
+
+    names = [user.username for user, _ in asyncio.run(run())]
+    assert names == ["abcdex"]
@@ -5,6 +5,15 @@ API v1 版本路由管理器
 from fastapi import APIRouter
 
 from user.api.v1.user.auth import router as user_auth_router
+from user.api.v1.user.admin import router as user_admin_api_router
+from user.api.v1.gis.tiles import router as gis_tiles_router
+from user.api.v1.gis.features import router as gis_features_router
+from user.api.v1.gis.catalog import router as gis_catalog_router
+from user.api.v1.analysis.history import router as analysis_history_router
+from user.api.v1.knowledge.vectors import router as knowledge_vectors_router
+from user.api.v1.jobs.jobs import router as jobs_api_router
+from user.api.v1.system.profiling import router as system_profiling_router
+from user.core.config import settings
 
 # 创建主路由
 api_v1_router = APIRouter()
@@ -14,11 +23,48 @@ user_router = APIRouter(prefix="/user", tags=["用户认证"])
 user_router.include_router(user_auth_router)
 api_v1_router.include_router(user_router)
 
+# 用户管理路由组（超级用户）
+user_admin_router = APIRouter(prefix="/user/admin", tags=["用户管理"])
+user_admin_router.include_router(user_admin_api_router)
+api_v1_router.include_router(user_admin_router)
+
 # 健康检查路由仅保留根级 `/health`（见 app/main.py）
 
-# GIS 模块已移除
+# 矢量切片路由组
+tiles_router = APIRouter(prefix="/tiles", tags=["矢量切片"])
+tiles_router.include_router(gis_tiles_router)
+api_v1_router.include_router(tiles_router)
+
+# 空间要素查询路由组
+features_router = APIRouter(prefix="/features", tags=["要素查询"])
+features_router.include_router(gis_features_router)
+api_v1_router.include_router(features_router)
+
+# sdx schema 目录路由组
+catalog_router = APIRouter(prefix="/catalog", tags=["空间目录"])
+catalog_router.include_router(gis_catalog_router)
+api_v1_router.include_router(catalog_router)
+
+# 空间分析路由组
+analysis_router = APIRouter(prefix="/analysis", tags=["空间分析"])
+analysis_router.include_router(analysis_history_router)
+api_v1_router.include_router(analysis_router)
+
+# 后台任务路由组
+jobs_router = APIRouter(prefix="/jobs", tags=["后台任务"])
+jobs_router.include_router(jobs_api_router)
+api_v1_router.include_router(jobs_router)
+
+# 知识库向量检索路由组
+knowledge_router = APIRouter(prefix="/knowledge", tags=["知识库"])
+knowledge_router.include_router(knowledge_vectors_router)
+api_v1_router.include_router(knowledge_router)
+
+# 系统管理路由组（运行时剖析，超级用户）
+if settings.profiling_enabled:
+    system_router = APIRouter(prefix="/system/profiling", tags=["系统管理"])
+    system_router.include_router(system_profiling_router)
+    api_v1_router.include_router(system_router)
 
 # TODO: 后续添加其他模块路由
 # agent_router = APIRouter(prefix="/agent", tags=["智能体"])
-# knowledge_router = APIRouter(prefix="/knowledge", tags=["知识库"])
-# system_router = APIRouter(prefix="/system", tags=["系统管理"])
@@ -0,0 +1,138 @@
+"""
+空间分析历史API
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from user.application.dto.analysis_dto import AnalysisLookupDTO, AnalysisSaveDTO
+from user.core.database import get_db
+from user.core.security import get_current_user_id
+from user.core.container import build_analysis_history_use_case
+from user.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.get("/history")
+async def get_analysis_history(
+    limit: Optional[int] = Query(None, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    analysis_type: Optional[str] = Query(None, description="按分析类型过滤"),
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """获取分析历史（按创建时间倒序，键集分页）"""
+    try:
+        analysis_history_use_case = build_analysis_history_use_case(session)
+        
+        result = await analysis_history_use_case.get_history(
+            UUID(current_user_id), limit, cursor, analysis_type
+        )
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取分析历史失败"
+        )
+
+
+@router.post("/save")
+async def save_analysis_result(
+    save_data: AnalysisSaveDTO,
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """保存分析结果（相同参数的结果覆盖保存）"""
+    try:
+        analysis_history_use_case = build_analysis_history_use_case(session)
+        
+        result = await analysis_history_use_case.save_result(UUID(current_user_id), save_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="保存分析结果失败"
+        )
+
+
+@router.post("/lookup")
+async def lookup_analysis_result(
+    lookup_data: AnalysisLookupDTO,
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """按分析参数查找已保存结果（命中则无需重新计算）"""
+    try:
+        analysis_history_use_case = build_analysis_history_use_case(session)
+        
+        result = await analysis_history_use_case.lookup_result(UUID(current_user_id), lookup_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="查找分析结果失败"
+        )
+
+
+@router.get("/results/{result_id}")
+async def get_analysis_result(
+    result_id: UUID,
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """获取分析结果详情"""
+    try:
+        analysis_history_use_case = build_analysis_history_use_case(session)
+        
+        result = await analysis_history_use_case.get_result(UUID(current_user_id), result_id)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取分析结果失败"
+        )
+
+
+@router.delete("/results/{result_id}")
+async def delete_analysis_result(
+    result_id: UUID,
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """删除分析结果"""
+    try:
+        analysis_history_use_case = build_analysis_history_use_case(session)
+        
+        result = await analysis_history_use_case.delete_result(UUID(current_user_id), result_id)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="删除分析结果失败"
+        )
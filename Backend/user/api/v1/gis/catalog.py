@@ -0,0 +1,63 @@
+"""
+sdx schema 目录API
+"""
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from user.api.v1.user.admin import get_current_superuser_id
+from user.core.container import get_catalog_use_case
+from user.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.get("/schema")
+async def get_catalog(request: Request) -> Response:
+    """获取 schema 目录（按版本号协商缓存）"""
+    try:
+        catalog_use_case = get_catalog_use_case()
+        
+        version, body = await catalog_use_case.get_catalog()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取目录失败"
+        )
+    
+    etag = f'"{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/layers")
+async def list_layers() -> Dict[str, Any]:
+    """获取可用空间图层列表"""
+    try:
+        catalog_use_case = get_catalog_use_case()
+        
+        result = await catalog_use_case.list_layers()
+        return result
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取图层列表失败"
+        )
+
+
+@router.post("/refresh")
+async def refresh_catalog(
+    exact_counts: bool = False,
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """重新采集目录（exact_counts=true 时执行精确计数，仅超级用户）"""
+    try:
+        catalog_use_case = get_catalog_use_case()
+        
+        result = await catalog_use_case.refresh_catalog(exact_counts=exact_counts)
+        return result
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="目录刷新失败"
+        )
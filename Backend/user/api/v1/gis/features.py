@@ -0,0 +1,91 @@
+"""
+空间要素查询API
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from user.application.dto.gis_dto import FeatureQueryDTO
+from user.core.database import get_db, get_db_session
+from user.core.container import build_feature_query_use_case
+from user.core.responses import FastJSONRoute
+from user.infrastructure.gis.encoders import (
+    GEOJSON_MEDIA_TYPE,
+    encode_collection,
+    negotiate,
+    transform_collection,
+)
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+def _encode(collection, zoom, method, media_type) -> bytes:
+    """简化/量化并编码（CPU 密集，在线程池中执行）"""
+    if zoom is not None:
+        collection = transform_collection(collection, zoom=zoom, method=method)
+    return encode_collection(collection, media_type)
+
+
+@router.post("/{layer}/query")
+async def query_features(
+    layer: str,
+    query_data: FeatureQueryDTO,
+    accept: Optional[str] = Header(None),
+    session = Depends(get_db)
+) -> Response:
+    """按范围/空间关系/属性条件查询要素（键集分页，返回 next_cursor）
+    
+    提供 zoom 时按级别简化几何并量化坐标；Accept 可选 application/topo+json、application/flatgeobuf。
+    """
+    try:
+        feature_query_use_case = build_feature_query_use_case(session)
+        
+        media_type = negotiate(accept)
+        if query_data.zoom is None and media_type == GEOJSON_MEDIA_TYPE:
+            # 原样输出：几何文本直接拼接，不做解析
+            result = await feature_query_use_case.query_features(layer, query_data)
+            return Response(content=result, media_type=GEOJSON_MEDIA_TYPE)
+        
+        collection = await feature_query_use_case.query_feature_collection(layer, query_data)
+        content = await run_in_threadpool(
+            _encode, collection, query_data.zoom, query_data.simplify, media_type
+        )
+        return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="要素查询失败"
+        )
+
+
+@router.post("/{layer}/stream")
+async def stream_features(
+    layer: str,
+    query_data: FeatureQueryDTO,
+    session = Depends(get_db)
+) -> StreamingResponse:
+    """流式输出全部匹配要素（服务端游标逐批读取，适合大范围导出）"""
+    try:
+        feature_query_use_case = build_feature_query_use_case(session)
+        
+        layer_entity, query = await feature_query_use_case.prepare_stream(layer, query_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    async def body():
+        # 流式响应在依赖清理后仍在发送，使用独立会话持有服务端游标
+        async with get_db_session() as stream_session:
+            stream_use_case = build_feature_query_use_case(stream_session)
+            async for chunk in stream_use_case.stream_features(layer_entity, query):
+                yield chunk
+    
+    return StreamingResponse(body(), media_type=GEOJSON_MEDIA_TYPE)
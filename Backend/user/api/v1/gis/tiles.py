@@ -0,0 +1,99 @@
+"""
+矢量切片API
+"""
+import gzip
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from user.application.dto.gis_dto import TileSeedDTO
+from user.core.config import settings
+from user.core.database import get_db
+from user.api.v1.user.admin import get_current_superuser_id
+from user.core.container import build_tile_use_case
+from user.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@router.get("/{layer}/{z}/{x}/{y}.mvt")
+async def get_vector_tile(
+    layer: str,
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    session = Depends(get_db)
+) -> Response:
+    """获取矢量切片（MVT，gzip 压缩）"""
+    try:
+        tile_use_case = build_tile_use_case(session)
+        
+        tile = await tile_use_case.get_tile(layer, z, x, y)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="矢量切片生成失败"
+        )
+    
+    headers = {
+        "Cache-Control": f"public, max-age={settings.tile_cache_ttl}",
+        "Vary": "Accept-Encoding"
+    }
+    if not tile:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
+    return Response(content=gzip.decompress(tile), media_type=MVT_MEDIA_TYPE, headers=headers)
+
+
+@router.post("/{layer}/seed")
+async def seed_vector_tiles(
+    layer: str,
+    seed_data: TileSeedDTO,
+    current_user_id: str = Depends(get_current_superuser_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """预热图层的矢量切片缓存（仅超级用户）"""
+    try:
+        tile_use_case = build_tile_use_case(session)
+        
+        result = await tile_use_case.seed_tiles(layer, seed_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="瓦片预热失败"
+        )
+
+
+@router.delete("/{layer}/cache")
+async def clear_vector_tile_cache(
+    layer: str,
+    current_user_id: str = Depends(get_current_superuser_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """清除图层的矢量切片缓存（数据更新后调用，仅超级用户）"""
+    try:
+        tile_use_case = build_tile_use_case(session)
+        
+        result = await tile_use_case.clear_cache(layer)
+        return result
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="清除瓦片缓存失败"
+        )
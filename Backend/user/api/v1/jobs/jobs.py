@@ -0,0 +1,124 @@
+"""
+后台任务API
+"""
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from user.application.dto.job_dto import JobSubmitDTO
+from user.core.database import get_db
+from user.core.security import get_current_user_id
+from user.core.container import build_job_use_case, get_job_use_case
+from user.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.post("/submit")
+async def submit_job(
+    submit_data: JobSubmitDTO,
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """提交后台任务，返回任务ID（结果完成后存入分析历史）"""
+    try:
+        job_use_case = build_job_use_case(session)
+        
+        result = await job_use_case.submit_job(current_user_id, submit_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="提交任务失败"
+        )
+
+
+@router.get("/list")
+async def list_jobs(
+    limit: int = Query(50, ge=1, le=200, description="返回数量"),
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """列出当前用户的任务"""
+    try:
+        job_use_case = get_job_use_case()
+        
+        result = await job_use_case.list_jobs(current_user_id, limit)
+        return result
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取任务列表失败"
+        )
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """查询任务状态与进度（轮询）"""
+    try:
+        job_use_case = get_job_use_case()
+        
+        result = await job_use_case.get_job(current_user_id, job_id)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取任务失败"
+        )
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    current_user_id: str = Depends(get_current_user_id)
+) -> StreamingResponse:
+    """以 SSE 推送任务进度（event: progress / done）"""
+    job_use_case = get_job_use_case()
+    try:
+        await job_use_case.get_job(current_user_id, job_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    
+    return StreamingResponse(
+        job_use_case.stream_events(current_user_id, job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(
+    job_id: str,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """取消任务"""
+    try:
+        job_use_case = get_job_use_case()
+        
+        result = await job_use_case.cancel_job(current_user_id, job_id)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="取消任务失败"
+        )
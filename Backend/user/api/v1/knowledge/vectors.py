@@ -0,0 +1,129 @@
+"""
+知识库向量检索API
+"""
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from user.application.dto.knowledge_dto import (
+    CollectionCreateDTO, VectorDeleteDTO, VectorSearchDTO, VectorUpsertDTO
+)
+from user.core.security import get_current_user_id
+from user.core.container import get_knowledge_use_case
+from user.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.put("/collections/{name}")
+async def create_collection(
+    name: str,
+    collection_data: CollectionCreateDTO,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """创建向量集合（已存在且配置一致时直接返回）"""
+    try:
+        knowledge_use_case = get_knowledge_use_case()
+        
+        result = await knowledge_use_case.create_collection(name, collection_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="创建向量集合失败"
+        )
+
+
+@router.get("/collections/{name}")
+async def get_collection(
+    name: str,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """获取向量集合信息"""
+    try:
+        knowledge_use_case = get_knowledge_use_case()
+        
+        result = await knowledge_use_case.get_collection(name)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取向量集合失败"
+        )
+
+
+@router.put("/collections/{name}/points")
+async def upsert_points(
+    name: str,
+    upsert_data: VectorUpsertDTO,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """批量写入向量（按批次并发写入）"""
+    try:
+        knowledge_use_case = get_knowledge_use_case()
+        
+        result = await knowledge_use_case.upsert_points(name, upsert_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="写入向量失败"
+        )
+
+
+@router.post("/collections/{name}/search")
+async def search_points(name: str, search_data: VectorSearchDTO) -> Dict[str, Any]:
+    """向量检索（支持载荷过滤，结果按查询向量缓存）"""
+    try:
+        knowledge_use_case = get_knowledge_use_case()
+        
+        result = await knowledge_use_case.search(name, search_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="向量检索失败"
+        )
+
+
+@router.post("/collections/{name}/points/delete")
+async def delete_points(
+    name: str,
+    delete_data: VectorDeleteDTO,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """删除向量"""
+    try:
+        knowledge_use_case = get_knowledge_use_case()
+        
+        result = await knowledge_use_case.delete_points(name, delete_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="删除向量失败"
+        )
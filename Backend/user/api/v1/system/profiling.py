@@ -0,0 +1,173 @@
+"""
+运行时剖析API（需要超级用户权限）
+
+单请求剖析的令牌与结果经 Redis 在各工作进程间共享；
+采样剖析与内存追踪只作用于处理该请求的进程（响应中带 pid）。
+"""
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from user.api.v1.user.admin import get_current_superuser_id
+from user.core.profiling import memory_profiler, request_profiler, sampling_profiler
+from user.core.query_metrics import query_budget
+from user.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.get("/sampler")
+@query_budget(1)
+async def get_sampler_status(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """采样剖析状态"""
+    return {"success": True, "message": "获取成功", "data": sampling_profiler.status()}
+
+
+@router.post("/sampler/start")
+@query_budget(1)
+async def start_sampler(
+    interval_ms: float = Query(10.0, ge=1.0, le=1000.0, description="采样间隔（毫秒）"),
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """开始采样剖析（清空之前的样本）"""
+    started = sampling_profiler.start(interval_ms / 1000)
+    return {
+        "success": started,
+        "message": "采样已开始" if started else "采样已在运行",
+        "data": sampling_profiler.status()
+    }
+
+
+@router.post("/sampler/stop")
+@query_budget(1)
+async def stop_sampler(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """停止采样剖析（保留样本供导出）"""
+    stopped = sampling_profiler.stop()
+    return {
+        "success": stopped,
+        "message": "采样已停止" if stopped else "采样未在运行",
+        "data": sampling_profiler.status()
+    }
+
+
+@router.get("/sampler/flamegraph")
+@query_budget(1)
+async def export_flamegraph(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Response:
+    """导出 collapsed stacks（flamegraph.pl / speedscope 格式）"""
+    return Response(content=sampling_profiler.collapsed(), media_type="text/plain")
+
+
+@router.post("/requests/token")
+@query_budget(1)
+async def issue_request_profile_token(
+    uses: int = Query(1, ge=1, le=100, description="可剖析的请求数"),
+    ttl: int = Query(600, ge=10, le=3600, description="有效期（秒）"),
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """签发单请求剖析令牌（请求头 X-Profile 携带，响应头 X-Profile-Id 返回结果编号）"""
+    return {
+        "success": True,
+        "message": "令牌已签发",
+        "data": {"token": await request_profiler.issue_token(uses, ttl), "uses": uses, "expires_in": ttl}
+    }
+
+
+@router.get("/requests")
+@query_budget(1)
+async def list_request_profiles(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """最近的单请求剖析结果"""
+    return {"success": True, "message": "获取成功", "data": await request_profiler.recent()}
+
+
+@router.get("/requests/{profile_id}")
+@query_budget(1)
+async def get_request_profile(
+    profile_id: str,
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """单请求剖析详情（按函数自身耗时排序）"""
+    result = await request_profiler.get(profile_id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="剖析结果不存在或已过期"
+        )
+    return {"success": True, "message": "获取成功", "data": result}
+
+
+@router.get("/memory")
+@query_budget(1)
+async def get_memory_status(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """内存追踪状态"""
+    return {"success": True, "message": "获取成功", "data": memory_profiler.status()}
+
+
+@router.post("/memory/start")
+@query_budget(1)
+async def start_memory_tracing(
+    frames: int = Query(1, ge=1, le=50, description="每次分配记录的调用栈深度"),
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """开启 tracemalloc 并记录基线快照"""
+    started = memory_profiler.start(frames)
+    return {
+        "success": started,
+        "message": "内存追踪已开启" if started else "内存追踪已在运行",
+        "data": memory_profiler.status()
+    }
+
+
+@router.post("/memory/stop")
+@query_budget(1)
+async def stop_memory_tracing(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """关闭 tracemalloc"""
+    stopped = memory_profiler.stop()
+    return {
+        "success": stopped,
+        "message": "内存追踪已关闭" if stopped else "内存追踪未开启",
+        "data": memory_profiler.status()
+    }
+
+
+@router.post("/memory/snapshot")
+@query_budget(1)
+async def mark_memory_baseline(
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """以当前快照作为新的基线"""
+    try:
+        memory_profiler.mark()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"success": True, "message": "基线已记录", "data": memory_profiler.status()}
+
+
+@router.get("/memory/diff")
+@query_budget(1)
+async def get_memory_diff(
+    limit: int = Query(20, ge=1, le=200, description="返回的位置数"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$", description="汇总方式"),
+    current_user_id: str = Depends(get_current_superuser_id)
+) -> Dict[str, Any]:
+    """当前快照相对基线的内存增长（前 N 个位置）"""
+    try:
+        return {"success": True, "message": "获取成功", "data": memory_profiler.diff(limit, group_by)}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
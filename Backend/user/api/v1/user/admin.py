@@ -0,0 +1,81 @@
+"""
+用户管理API（需要超级用户权限）
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from user.core.container import build_user_admin_use_case
+from user.core.database import get_db
+from user.core.query_metrics import query_budget
+from user.core.responses import FastJSONRoute
+from user.core.security import get_current_user_id
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+async def get_current_superuser_id(
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> str:
+    """校验当前用户为有效的超级用户（以数据库状态为准），返回用户ID"""
+    if not await build_user_admin_use_case(session).is_superuser(UUID(current_user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="权限不足，需要超级用户权限"
+        )
+    return current_user_id
+
+
+@router.get("/users/search")
+@query_budget(2)
+async def search_users(
+    q: str = Query(..., min_length=2, max_length=100, description="搜索关键字（用户名或邮箱，支持模糊匹配）"),
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    current_user_id: str = Depends(get_current_superuser_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """搜索用户（按相关度排序，键集分页）"""
+    try:
+        user_admin_use_case = build_user_admin_use_case(session)
+        
+        result = await user_admin_use_case.search_users(q, limit, cursor)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="搜索用户失败"
+        )
+
+
+@router.get("/users/autocomplete")
+@query_budget(2)
+async def autocomplete_users(
+    prefix: str = Query(..., min_length=1, max_length=50, description="用户名前缀"),
+    limit: int = Query(10, ge=1, le=50, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    current_user_id: str = Depends(get_current_superuser_id),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """用户名前缀补全"""
+    try:
+        user_admin_use_case = build_user_admin_use_case(session)
+        
+        result = await user_admin_use_case.autocomplete_users(prefix, limit, cursor)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="用户补全失败"
+        )
@@ -1,24 +1,31 @@
 """
 用户认证API
 """
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from user.application.dto.user_dto import (
     UserRegisterDTO, UserLoginDTO, UserUpdateDTO, 
-    PasswordChangeDTO, AuthResponseDTO
+    PasswordChangeDTO, AuthResponseDTO, RefreshTokenDTO, AvailabilityCheckDTO
 )
 from user.application.use_cases.user.auth_use_case import AuthUseCase
+from user.domains.user.value_objects import ProfileVersionConflict, RefreshTokenReused
 from user.core.database import get_db
-from user.core.security import get_current_user_id
+from user.core.security import decode_access_token, get_current_user_id
 from user.core.container import build_auth_use_case
+from user.core.responses import FastJSONResponse, FastJSONRoute
+from user.core.conditional import PROFILE_CACHE_CONTROL, etag_matches, not_modified, profile_etag
+from user.core.query_metrics import query_budget
+from user.core.deadline import request_timeout
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 security = HTTPBearer()
 
 
 @router.post("/register", response_model=AuthResponseDTO)
+@query_budget(4)
+@request_timeout(5)
 async def register_user(
     user_data: UserRegisterDTO,
     session = Depends(get_db)
@@ -41,7 +48,34 @@ async def register_user(
         )
 
 
+@router.post("/availability")
+@query_budget(3)
+@request_timeout(2)
+async def check_availability(
+    check_data: AvailabilityCheckDTO,
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """注册标识可用性检查（过滤器判定可用时不访问数据库）"""
+    try:
+        auth_use_case = build_auth_use_case(session)
+        
+        result = await auth_use_case.check_availability(check_data)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="可用性检查失败"
+        )
+
+
 @router.post("/login", response_model=AuthResponseDTO)
+@query_budget(3)
+@request_timeout(5)
 async def login_user(
     login_data: UserLoginDTO,
     session = Depends(get_db)
@@ -64,20 +98,69 @@ async def login_user(
         )
 
 
-@router.get("/profile")
-async def get_user_profile(
-    current_user_id: str = Depends(get_current_user_id),
+@router.post("/refresh", response_model=AuthResponseDTO)
+@query_budget(3)
+@request_timeout(3)
+async def refresh_token(
+    refresh_data: RefreshTokenDTO,
     session = Depends(get_db)
 ) -> Dict[str, Any]:
-    """获取用户资料"""
+    """刷新令牌（轮换刷新令牌并签发新的访问令牌）"""
     try:
-        from uuid import UUID
-        user_id = UUID(current_user_id)
-        
         auth_use_case = build_auth_use_case(session)
         
-        result = await auth_use_case.get_user_profile(user_id)
+        result = await auth_use_case.refresh_tokens(refresh_data)
         return result
+    except RefreshTokenReused as e:
+        # 家族吊销须先提交：抛出的 HTTPException 会使 get_db 回滚会话
+        await session.commit()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="刷新令牌失败，请重新登录"
+        )
+
+
+async def _profile_response(request: Request, current_user_id: str, session) -> Response:
+    """资料响应（带 ETag）：If-None-Match 与缓存版本号一致时直接返回 304，不访问数据库"""
+    from uuid import UUID
+    user_id = UUID(current_user_id)
+    
+    auth_use_case = build_auth_use_case(session)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await auth_use_case.cached_profile_version(user_id)
+        if version is not None and etag_matches(if_none_match, profile_etag(user_id, version)):
+            return not_modified(profile_etag(user_id, version))
+    
+    result = await auth_use_case.get_user_profile(user_id)
+    etag = profile_etag(user_id, result["data"]["version"])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return FastJSONResponse(result, headers={"ETag": etag, "Cache-Control": PROFILE_CACHE_CONTROL})
+
+
+@router.get("/profile")
+@query_budget(1)
+@request_timeout(2)
+async def get_user_profile(
+    request: Request,
+    current_user_id: str = Depends(get_current_user_id),
+    session = Depends(get_db)
+) -> Response:
+    """获取用户资料（支持 If-None-Match 条件请求）"""
+    try:
+        return await _profile_response(request, current_user_id, session)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,19 +174,16 @@ async def get_user_profile(
 
 
 @router.get("/me")
+@query_budget(1)
+@request_timeout(2)
 async def get_current_user(
+    request: Request,
     current_user_id: str = Depends(get_current_user_id),
     session = Depends(get_db)
-) -> Dict[str, Any]:
-    """获取当前用户信息"""
+) -> Response:
+    """获取当前用户信息（支持 If-None-Match 条件请求）"""
     try:
-        from uuid import UUID
-        user_id = UUID(current_user_id)
-        
-        auth_use_case = build_auth_use_case(session)
-        
-        result = await auth_use_case.get_user_profile(user_id)
-        return result
+        return await _profile_response(request, current_user_id, session)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,6 +197,8 @@ async def get_current_user(
 
 
 @router.get("/stats")
+@query_budget(3)
+@request_timeout(5)
 async def get_user_stats(
     session = Depends(get_db)
 ) -> Dict[str, Any]:
@@ -134,14 +216,23 @@ async def get_user_stats(
 
 
 @router.post("/logout")
-async def logout_user() -> Dict[str, Any]:
-    """用户登出"""
+@query_budget(2)
+@request_timeout(3)
+async def logout_user(
+    refresh_data: Optional[RefreshTokenDTO] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session = Depends(get_db)
+) -> Dict[str, Any]:
+    """用户登出（吊销当前令牌；请求体带刷新令牌时一并吊销）"""
+    token_payload = decode_access_token(credentials.credentials)
     try:
-        # 这里可以添加令牌黑名单逻辑
-        return {
-            "success": True,
-            "message": "登出成功，已清除用户会话"
-        }
+        auth_use_case = build_auth_use_case(session)
+        
+        result = await auth_use_case.logout_user(
+            token_payload,
+            refresh_token=refresh_data.refresh_token if refresh_data else None
+        )
+        return result
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -150,6 +241,8 @@ async def logout_user() -> Dict[str, Any]:
 
 
 @router.post("/update-profile")
+@query_budget(2)
+@request_timeout(3)
 async def update_user_profile(
     update_data: UserUpdateDTO,
     current_user_id: str = Depends(get_current_user_id),
@@ -164,6 +257,11 @@ async def update_user_profile(
         
         result = await auth_use_case.update_user_profile(user_id, update_data)
         return result
+    except ProfileVersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -177,6 +275,8 @@ async def update_user_profile(
 
 
 @router.post("/change-password")
+@query_budget(3)
+@request_timeout(8)
 async def change_password(
     password_data: PasswordChangeDTO,
     current_user_id: str = Depends(get_current_user_id),
@@ -0,0 +1,27 @@
+"""
+空间分析数据传输对象
+"""
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, validator
+
+
+class AnalysisSaveDTO(BaseModel):
+    """保存分析结果DTO"""
+    analysis_type: str = Field(..., min_length=1, max_length=50, description="分析类型（如 buffer、distance）")
+    params: Dict[str, Any] = Field(default_factory=dict, description="分析参数")
+    result: Any = Field(..., description="分析结果（通常为 GeoJSON）")
+    name: Optional[str] = Field(None, max_length=100, description="结果名称")
+    
+    @validator('analysis_type')
+    def validate_analysis_type(cls, v):
+        return v.strip().lower()
+
+
+class AnalysisLookupDTO(BaseModel):
+    """按参数查找已保存结果DTO"""
+    analysis_type: str = Field(..., min_length=1, max_length=50, description="分析类型")
+    params: Dict[str, Any] = Field(default_factory=dict, description="分析参数")
+    
+    @validator('analysis_type')
+    def validate_analysis_type(cls, v):
+        return v.strip().lower()
@@ -0,0 +1,62 @@
+"""
+GIS 数据传输对象
+"""
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field, validator
+
+
+class TileSeedDTO(BaseModel):
+    """矢量切片预热DTO"""
+    min_zoom: int = Field(..., ge=0, le=22, description="最小缩放级别")
+    max_zoom: int = Field(..., ge=0, le=22, description="最大缩放级别")
+    bbox: Optional[List[float]] = Field(None, description="经纬度范围 [min_lon, min_lat, max_lon, max_lat]")
+    
+    @validator('bbox')
+    def validate_bbox(cls, v):
+        if v is None:
+            return v
+        if len(v) != 4:
+            raise ValueError('bbox 必须包含4个数值')
+        if v[0] >= v[2] or v[1] >= v[3]:
+            raise ValueError('bbox 最小值必须小于最大值')
+        return v
+    
+    @validator('max_zoom')
+    def validate_max_zoom(cls, v, values):
+        if 'min_zoom' in values and v < values['min_zoom']:
+            raise ValueError('最大级别不能小于最小级别')
+        return v
+
+
+class AttributeConditionDTO(BaseModel):
+    """属性条件DTO"""
+    field_name: str = Field(..., description="字段名")
+    operator: Literal['eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'like', 'in'] = Field(..., description="比较操作符")
+    value: Any = Field(..., description="比较值（like 支持 % 通配，in 为列表）")
+
+
+class SpatialFilterDTO(BaseModel):
+    """空间过滤DTO"""
+    mode: Literal['intersects', 'contains', 'within', 'touches', 'crosses', 'overlaps'] = Field(
+        'intersects', description="空间关系（要素 与 查询几何）"
+    )
+    geometry: Dict[str, Any] = Field(..., description="GeoJSON 几何（EPSG:4326）")
+
+
+class FeatureQueryDTO(BaseModel):
+    """要素查询DTO"""
+    bbox: Optional[List[float]] = Field(None, description="范围 [minx, miny, maxx, maxy]")
+    bbox_srid: int = Field(4326, description="bbox 坐标系")
+    spatial_filter: Optional[SpatialFilterDTO] = Field(None, description="空间过滤条件")
+    conditions: List[AttributeConditionDTO] = Field(default_factory=list, description="属性过滤条件")
+    match: Literal['all', 'any'] = Field('all', description="多个属性条件的组合方式")
+    limit: Optional[int] = Field(None, ge=1, description="每页数量（流式输出时为总数上限）")
+    cursor: Optional[Union[int, str]] = Field(None, description="分页游标（上一页返回的 next_cursor）")
+    zoom: Optional[float] = Field(None, ge=0, le=24, description="显示级别，提供时按级别简化几何并量化坐标")
+    simplify: Literal['dp', 'vw'] = Field('dp', description="简化算法：dp=Douglas-Peucker，vw=Visvalingam-Whyatt")
+    
+    @validator('bbox')
+    def validate_bbox(cls, v):
+        if v is not None and len(v) != 4:
+            raise ValueError('bbox 必须包含4个数值')
+        return v
@@ -0,0 +1,15 @@
+"""
+后台任务数据传输对象
+"""
+from typing import Any, Dict
+from pydantic import BaseModel, Field, validator
+
+
+class JobSubmitDTO(BaseModel):
+    """提交后台任务DTO"""
+    job_type: str = Field(..., min_length=1, max_length=50, description="任务类型（thiessen、buffer）")
+    params: Dict[str, Any] = Field(default_factory=dict, description="任务参数（与对应分析接口参数一致）")
+    
+    @validator('job_type')
+    def validate_job_type(cls, v):
+        return v.strip().lower()
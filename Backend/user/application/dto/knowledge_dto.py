@@ -0,0 +1,42 @@
+"""
+知识库数据传输对象
+"""
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field, validator
+
+
+class CollectionCreateDTO(BaseModel):
+    """创建向量集合DTO"""
+    dimension: int = Field(..., ge=1, le=65536, description="向量维度")
+    distance: Literal['cosine', 'dot', 'euclid'] = Field('cosine', description="距离类型")
+
+
+class VectorPointDTO(BaseModel):
+    """向量点DTO"""
+    id: Union[int, str] = Field(..., description="点ID（整数或 UUID 字符串）")
+    vector: List[float] = Field(..., min_items=1, description="嵌入向量")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="业务载荷（文档片段、图层、来源等）")
+
+
+class VectorUpsertDTO(BaseModel):
+    """批量写入向量DTO"""
+    points: List[VectorPointDTO] = Field(..., min_items=1, max_items=10000, description="向量点列表")
+
+
+class VectorSearchDTO(BaseModel):
+    """向量检索DTO"""
+    vector: List[float] = Field(..., min_items=1, description="查询向量")
+    limit: int = Field(10, ge=1, le=100, description="返回数量")
+    filter: Optional[Dict[str, Any]] = Field(
+        None, description="载荷过滤：{字段: 值 | [值...] | {gte/gt/lte/lt: 数值}}"
+    )
+    score_threshold: Optional[float] = Field(None, description="分数阈值")
+
+
+class VectorDeleteDTO(BaseModel):
+    """删除向量DTO"""
+    ids: List[Union[int, str]] = Field(..., min_items=1, description="点ID列表")
+    
+    @validator('ids')
+    def validate_ids(cls, v):
+        return list(dict.fromkeys(v))
@@ -1,7 +1,7 @@
 """
 用户数据传输对象
 """
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, Field, validator
 import re
 
@@ -47,6 +47,7 @@ class UserProfileDTO(BaseModel):
     phone: Optional[str]
     is_active: bool
     registered_at: Optional[str]
+    version: int = 1
 
 
 class UserUpdateDTO(BaseModel):
@@ -57,6 +58,7 @@ class UserUpdateDTO(BaseModel):
     new_email: Optional[EmailStr] = Field(None, description="新邮箱")
     old_phone: str = Field(..., description="原手机号")
     new_phone: Optional[str] = Field(None, max_length=20, description="新手机号")
+    version: Optional[int] = Field(None, ge=1, description="资料版本号（来自资料接口）；提供时若资料已被修改则拒绝更新")
     
     @validator('new_username')
     def validate_new_username(cls, v):
@@ -96,4 +98,19 @@ class AuthResponseDTO(BaseModel):
     success: bool
     message: str
     token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
     data: Optional[dict] = None
+
+
+class RefreshTokenDTO(BaseModel):
+    """刷新令牌DTO（刷新与登出共用）"""
+    refresh_token: str = Field(..., min_length=16, max_length=256, description="刷新令牌")
+
+
+
+class AvailabilityCheckDTO(BaseModel):
+    """注册标识可用性检查DTO（批量，用于输入过程中的即时提示）"""
+    username: List[str] = Field(default_factory=list, max_length=20, description="待检查的用户名")
+    email: List[str] = Field(default_factory=list, max_length=20, description="待检查的邮箱")
+    phone: List[str] = Field(default_factory=list, max_length=20, description="待检查的手机号")
@@ -0,0 +1,81 @@
+"""
+空间分析结果用例
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+from user.domains.analysis.services import AnalysisResultService
+from user.application.dto.analysis_dto import AnalysisLookupDTO, AnalysisSaveDTO
+
+
+class AnalysisHistoryUseCase:
+    """分析历史用例：结果保存、复用与历史查询"""
+    
+    def __init__(self, analysis_result_service: AnalysisResultService, default_limit: int = 20):
+        self.analysis_result_service = analysis_result_service
+        self.default_limit = default_limit
+    
+    async def save_result(self, user_id: UUID, save_data: AnalysisSaveDTO) -> Dict[str, Any]:
+        """保存分析结果（相同参数的结果会被覆盖而非重复保存）"""
+        saved = await self.analysis_result_service.save_result(
+            user_id,
+            save_data.analysis_type,
+            save_data.params,
+            save_data.result,
+            name=save_data.name
+        )
+        return {
+            "success": True,
+            "message": "分析结果已保存",
+            "data": saved.to_summary()
+        }
+    
+    async def lookup_result(self, user_id: UUID, lookup_data: AnalysisLookupDTO) -> Dict[str, Any]:
+        """按参数查找已保存结果"""
+        found = await self.analysis_result_service.find_result(
+            user_id, lookup_data.analysis_type, lookup_data.params
+        )
+        if not found:
+            raise ValueError("未找到相同参数的分析结果")
+        return {
+            "success": True,
+            "message": "命中已保存结果",
+            "data": found.to_dict()
+        }
+    
+    async def get_history(
+        self,
+        user_id: UUID,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        analysis_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """获取分析历史（键集分页）"""
+        items, next_cursor = await self.analysis_result_service.list_history(
+            user_id,
+            limit or self.default_limit,
+            cursor=cursor,
+            analysis_type=analysis_type
+        )
+        return {
+            "success": True,
+            "message": "获取分析历史成功",
+            "data": {
+                "items": [item.to_summary() for item in items],
+                "next_cursor": next_cursor
+            }
+        }
+    
+    async def get_result(self, user_id: UUID, result_id: UUID) -> Dict[str, Any]:
+        """获取分析结果详情"""
+        result = await self.analysis_result_service.get_result(user_id, result_id)
+        return {
+            "success": True,
+            "message": "获取分析结果成功",
+            "data": result.to_dict()
+        }
+    
+    async def delete_result(self, user_id: UUID, result_id: UUID) -> Dict[str, Any]:
+        """删除分析结果"""
+        if not await self.analysis_result_service.delete_result(user_id, result_id):
+            raise ValueError("分析结果不存在")
+        return {"success": True, "message": "分析结果已删除"}
@@ -0,0 +1,49 @@
+"""
+schema 目录用例
+"""
+from typing import Any, Dict, Optional, Tuple
+from user.infrastructure.database.postgres.catalog import SchemaCatalogService
+
+
+class CatalogUseCase:
+    """schema 目录用例：目录下发与图层发现"""
+    
+    def __init__(self, catalog_service: SchemaCatalogService):
+        self.catalog_service = catalog_service
+    
+    async def get_catalog(self) -> Tuple[str, bytes]:
+        """获取目录版本号与预序列化的目录 JSON"""
+        catalog = await self.catalog_service.get_catalog()
+        return catalog["version"], await self.catalog_service.get_catalog_json()
+    
+    async def list_layers(self) -> Dict[str, Any]:
+        """列出可用空间图层（附估算行数）"""
+        catalog = await self.catalog_service.get_catalog()
+        layers = []
+        for layer in await self.catalog_service.list_layers():
+            item = layer.to_dict()
+            item["row_count"] = catalog["tables"][layer.name]["row_count"]
+            layers.append(item)
+        
+        return {
+            "success": True,
+            "message": "图层列表获取成功",
+            "data": {
+                "version": catalog["version"],
+                "layers": layers
+            }
+        }
+    
+    async def refresh_catalog(self, exact_counts: bool = False) -> Dict[str, Any]:
+        """重新采集目录"""
+        catalog = await self.catalog_service.refresh(exact_counts=exact_counts)
+        
+        return {
+            "success": True,
+            "message": "目录刷新成功",
+            "data": {
+                "version": catalog["version"],
+                "generated_at": catalog["generated_at"],
+                "table_count": len(catalog["tables"])
+            }
+        }
@@ -0,0 +1,115 @@
+"""
+空间要素查询用例
+"""
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from user.domains.gis.entities import FeatureEntity, LayerEntity
+from user.domains.gis.services import FeatureQueryService
+from user.domains.gis.value_objects import AttributeCondition, FeatureQuery, SpatialFilter
+from user.application.dto.gis_dto import FeatureQueryDTO
+
+
+def _feature_to_json(feature: FeatureEntity) -> str:
+    """序列化单个要素，几何直接拼接数据库输出的 GeoJSON 文本"""
+    return (
+        '{"type":"Feature","id":' + json.dumps(feature.id, default=str)
+        + ',"geometry":' + (feature.geometry or "null")
+        + ',"properties":' + json.dumps(feature.properties, ensure_ascii=False, default=str)
+        + '}'
+    )
+
+
+class FeatureQueryUseCase:
+    """空间要素查询用例：DTO 转换与 GeoJSON 输出"""
+    
+    def __init__(
+        self,
+        feature_query_service: FeatureQueryService,
+        default_limit: int = 500,
+        stream_max_features: int = 200000
+    ):
+        self.feature_query_service = feature_query_service
+        self.default_limit = default_limit
+        self.stream_max_features = stream_max_features
+    
+    @staticmethod
+    def _to_query(query_data: FeatureQueryDTO, limit: int) -> FeatureQuery:
+        """DTO 转换为领域查询对象"""
+        spatial_filter: Optional[SpatialFilter] = None
+        if query_data.spatial_filter:
+            spatial_filter = SpatialFilter(
+                predicate=query_data.spatial_filter.mode,
+                geometry=query_data.spatial_filter.geometry
+            )
+        return FeatureQuery(
+            bbox=tuple(query_data.bbox) if query_data.bbox else None,
+            bbox_srid=query_data.bbox_srid,
+            spatial_filter=spatial_filter,
+            conditions=tuple(
+                AttributeCondition(c.field_name, c.operator, c.value)
+                for c in query_data.conditions
+            ),
+            match_all=query_data.match == 'all',
+            limit=limit,
+            after=query_data.cursor
+        )
+    
+    async def query_features(self, layer_name: str, query_data: FeatureQueryDTO) -> str:
+        """查询一页要素，返回 GeoJSON FeatureCollection 文本"""
+        query = self._to_query(query_data, query_data.limit or self.default_limit)
+        page = await self.feature_query_service.query_features(layer_name, query)
+        return (
+            '{"type":"FeatureCollection","features":['
+            + ",".join(_feature_to_json(f) for f in page.features)
+            + '],"next_cursor":' + json.dumps(page.next_cursor, default=str) + '}'
+        )
+    
+    async def query_feature_collection(self, layer_name: str, query_data: FeatureQueryDTO) -> Dict[str, Any]:
+        """查询一页要素，返回 FeatureCollection 字典（供简化与其它编码使用）"""
+        query = self._to_query(query_data, query_data.limit or self.default_limit)
+        page = await self.feature_query_service.query_features(layer_name, query)
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "id": f.id,
+                    "geometry": json.loads(f.geometry) if f.geometry else None,
+                    "properties": f.properties,
+                }
+                for f in page.features
+            ],
+            "next_cursor": page.next_cursor,
+        }
+    
+    async def prepare_stream(
+        self,
+        layer_name: str,
+        query_data: FeatureQueryDTO
+    ) -> Tuple[LayerEntity, FeatureQuery]:
+        """流式输出前的校验（在响应头发出之前暴露错误）"""
+        limit = min(query_data.limit or self.stream_max_features, self.stream_max_features)
+        query = self._to_query(query_data, limit)
+        layer = await self.feature_query_service.layer_service.get_layer(layer_name)
+        self.feature_query_service.prepare_stream(layer, query)
+        return layer, query
+    
+    async def stream_features(
+        self,
+        layer: LayerEntity,
+        query: FeatureQuery,
+        chunk_features: int = 256
+    ) -> AsyncIterator[str]:
+        """流式输出 GeoJSON FeatureCollection，按要素数分块写出"""
+        yield '{"type":"FeatureCollection","features":['
+        buffer = []
+        first = True
+        async for feature in self.feature_query_service.iter_features(layer, query):
+            buffer.append(_feature_to_json(feature))
+            if len(buffer) >= chunk_features:
+                yield ("" if first else ",") + ",".join(buffer)
+                buffer.clear()
+                first = False
+        if buffer:
+            yield ("" if first else ",") + ",".join(buffer)
+        yield ']}'
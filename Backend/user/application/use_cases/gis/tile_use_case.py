@@ -0,0 +1,93 @@
+"""
+矢量切片用例
+"""
+import gzip
+from typing import Any, Dict, Optional
+from user.domains.gis.entities import LayerEntity
+from user.domains.gis.services import TileService
+from user.domains.gis.value_objects import TileCoord
+from user.application.dto.gis_dto import TileSeedDTO
+from user.core.cache import MemoryCache
+
+
+class TileUseCase:
+    """矢量切片用例：缓存、压缩与预热编排"""
+    
+    def __init__(
+        self,
+        tile_service: TileService,
+        tile_cache: MemoryCache,
+        layer_cache: MemoryCache,
+        cache_ttl: int = 3600,
+        seed_max_tiles: Optional[int] = None
+    ):
+        self.tile_service = tile_service
+        self.tile_cache = tile_cache
+        self.layer_cache = layer_cache
+        self.cache_ttl = cache_ttl
+        self.seed_max_tiles = seed_max_tiles
+    
+    @staticmethod
+    def _tile_key(layer_name: str, coord: TileCoord) -> str:
+        return f"tile:{layer_name}:{coord}"
+    
+    async def _get_layer(self, layer_name: str) -> LayerEntity:
+        """获取图层元数据（进程内缓存，避免每个瓦片都查询系统表）"""
+        layer = await self.layer_cache.get(layer_name)
+        if layer is None:
+            layer = await self.tile_service.layer_service.get_layer(layer_name)
+            await self.layer_cache.set(layer_name, layer)
+        return layer
+    
+    async def _render(self, layer: LayerEntity, coord: TileCoord) -> bytes:
+        """生成并缓存 gzip 压缩后的瓦片，空瓦片缓存为空字节串"""
+        data = await self.tile_service.render_tile(layer, coord)
+        tile = gzip.compress(data, compresslevel=6) if data else b""
+        await self.tile_cache.set(self._tile_key(layer.name, coord), tile, expire=self.cache_ttl)
+        return tile
+    
+    async def get_tile(self, layer_name: str, z: int, x: int, y: int) -> bytes:
+        """获取 gzip 压缩的 MVT 瓦片，空瓦片返回空字节串"""
+        coord = self.tile_service.make_coord(z, x, y)
+        cached = await self.tile_cache.get(self._tile_key(layer_name, coord))
+        if cached is not None:
+            return cached
+        layer = await self._get_layer(layer_name)
+        return await self._render(layer, coord)
+    
+    async def seed_tiles(self, layer_name: str, seed_data: TileSeedDTO) -> Dict[str, Any]:
+        """按级别与范围预热瓦片缓存"""
+        layer = await self._get_layer(layer_name)
+        bbox = tuple(seed_data.bbox) if seed_data.bbox else None
+        generated = skipped = empty = 0
+        for coord in self.tile_service.plan_seed(
+            seed_data.min_zoom, seed_data.max_zoom, bbox, self.seed_max_tiles
+        ):
+            if await self.tile_cache.exists(self._tile_key(layer.name, coord)):
+                skipped += 1
+                continue
+            tile = await self._render(layer, coord)
+            generated += 1
+            if not tile:
+                empty += 1
+        
+        return {
+            "success": True,
+            "message": "瓦片预热完成",
+            "data": {
+                "layer": layer.name,
+                "generated": generated,
+                "skipped": skipped,
+                "empty": empty
+            }
+        }
+    
+    async def clear_cache(self, layer_name: str) -> Dict[str, Any]:
+        """清除图层的瓦片与元数据缓存"""
+        removed = self.tile_cache.clear(f"tile:{layer_name}:")
+        await self.layer_cache.delete(layer_name)
+        return {
+            "success": True,
+            "message": "瓦片缓存已清除",
+            "data": {"layer": layer_name, "removed": removed}
+        }
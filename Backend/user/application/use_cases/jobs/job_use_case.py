@@ -0,0 +1,76 @@
+"""
+后台任务用例
+"""
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import UUID
+from user.domains.analysis.services import AnalysisResultService
+from user.domains.jobs.services import JobService
+from user.application.dto.job_dto import JobSubmitDTO
+
+
+class JobUseCase:
+    """后台任务用例：提交（相同参数复用已保存结果）、查询、取消与进度推送"""
+    
+    def __init__(
+        self,
+        job_service: JobService,
+        analysis_result_service: Optional[AnalysisResultService] = None,
+        event_interval: float = 0.5,
+        keepalive_interval: float = 15.0
+    ):
+        self.job_service = job_service
+        self.analysis_result_service = analysis_result_service
+        self.event_interval = event_interval
+        self.keepalive_interval = keepalive_interval
+    
+    async def submit_job(self, user_id: str, submit_data: JobSubmitDTO) -> Dict[str, Any]:
+        """提交任务；已有相同参数的分析结果时直接返回已完成任务"""
+        if self.analysis_result_service is not None:
+            found = await self.analysis_result_service.find_result(
+                UUID(user_id), submit_data.job_type, submit_data.params
+            )
+            if found:
+                job = await self.job_service.create_completed(
+                    user_id, submit_data.job_type, submit_data.params, str(found.id)
+                )
+                return {"success": True, "message": "命中已保存结果", "data": job.to_dict()}
+        job = await self.job_service.submit(user_id, submit_data.job_type, submit_data.params)
+        return {"success": True, "message": "任务已提交", "data": job.to_dict()}
+    
+    async def get_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
+        """获取任务状态"""
+        job = await self.job_service.get_job(user_id, job_id)
+        return {"success": True, "message": "获取任务成功", "data": job.to_dict()}
+    
+    async def list_jobs(self, user_id: str, limit: int = 50) -> Dict[str, Any]:
+        """列出任务"""
+        jobs = await self.job_service.list_jobs(user_id, limit)
+        return {"success": True, "message": "获取任务列表成功", "data": [job.to_dict() for job in jobs]}
+    
+    async def cancel_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
+        """取消任务"""
+        job = await self.job_service.cancel(user_id, job_id)
+        return {"success": True, "message": "已请求取消任务", "data": job.to_dict()}
+    
+    async def stream_events(self, user_id: str, job_id: str) -> AsyncIterator[str]:
+        """以 SSE 格式推送任务进度，任务结束后关闭"""
+        await self.job_service.get_job(user_id, job_id)
+        last = None
+        idle = 0.0
+        while True:
+            job = await self.job_service.get_job(user_id, job_id)
+            data = job.to_dict()
+            if data != last:
+                last = data
+                idle = 0.0
+                event = "done" if job.is_terminal else "progress"
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if job.is_terminal:
+                    return
+            elif idle >= self.keepalive_interval:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(self.event_interval)
+            idle += self.event_interval
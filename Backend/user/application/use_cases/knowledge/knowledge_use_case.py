@@ -0,0 +1,50 @@
+"""
+知识库检索用例
+"""
+from typing import Any, Dict
+from user.domains.knowledge.entities import VectorRecord
+from user.domains.knowledge.services import KnowledgeService
+from user.application.dto.knowledge_dto import (
+    CollectionCreateDTO, VectorDeleteDTO, VectorSearchDTO, VectorUpsertDTO
+)
+
+
+class KnowledgeUseCase:
+    """知识库用例：集合管理、向量写入与检索"""
+    
+    def __init__(self, knowledge_service: KnowledgeService):
+        self.knowledge_service = knowledge_service
+    
+    async def create_collection(self, name: str, collection_data: CollectionCreateDTO) -> Dict[str, Any]:
+        """创建向量集合"""
+        info = await self.knowledge_service.create_collection(
+            name, collection_data.dimension, collection_data.distance
+        )
+        return {"success": True, "message": "向量集合已就绪", "data": info.to_dict()}
+    
+    async def get_collection(self, name: str) -> Dict[str, Any]:
+        """获取集合信息"""
+        info = await self.knowledge_service.get_collection(name)
+        return {"success": True, "message": "获取集合信息成功", "data": info.to_dict()}
+    
+    async def upsert_points(self, name: str, upsert_data: VectorUpsertDTO) -> Dict[str, Any]:
+        """批量写入向量"""
+        records = [VectorRecord(p.id, p.vector, p.payload) for p in upsert_data.points]
+        count = await self.knowledge_service.upsert(name, records)
+        return {"success": True, "message": "向量写入成功", "data": {"count": count}}
+    
+    async def search(self, name: str, search_data: VectorSearchDTO) -> Dict[str, Any]:
+        """向量检索"""
+        hits = await self.knowledge_service.search(
+            name,
+            search_data.vector,
+            limit=search_data.limit,
+            payload_filter=search_data.filter,
+            score_threshold=search_data.score_threshold
+        )
+        return {"success": True, "message": "检索成功", "data": [hit.to_dict() for hit in hits]}
+    
+    async def delete_points(self, name: str, delete_data: VectorDeleteDTO) -> Dict[str, Any]:
+        """删除向量"""
+        count = await self.knowledge_service.delete(name, delete_data.ids)
+        return {"success": True, "message": "向量删除成功", "data": {"count": count}}
@@ -1,36 +1,47 @@
 """
 用户认证用例
 """
-from typing import Optional, Dict, Any
-from uuid import UUID
+from typing import Callable, Optional, Dict, Any
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from user.domains.user.entities import UserEntity
-from user.domains.user.services import UserService
+from user.domains.user.services import RefreshTokenService, UserService
 from user.application.dto.user_dto import (
     UserRegisterDTO, UserLoginDTO, UserProfileDTO, 
-    UserUpdateDTO, PasswordChangeDTO
+    UserUpdateDTO, PasswordChangeDTO, RefreshTokenDTO, AvailabilityCheckDTO
 )
 from user.core.config import settings
+from user.core.security import get_password_hash_async, password_needs_update, verify_password_async
 
-# 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 后台重新哈希回调：(用户ID, 明文密码, 旧哈希)
+PasswordRehasher = Callable[[UUID, str, str], None]
 
 
 class AuthUseCase:
     """用户认证用例"""
     
-    def __init__(self, user_service: UserService):
+    def __init__(
+        self,
+        user_service: UserService,
+        token_revocation: Any = None,
+        refresh_token_service: Optional[RefreshTokenService] = None,
+        password_rehasher: Optional[PasswordRehasher] = None,
+        profile_versions: Any = None
+    ):
         self.user_service = user_service
+        self.token_revocation = token_revocation
+        self.refresh_token_service = refresh_token_service
+        self.password_rehasher = password_rehasher
+        self.profile_versions = profile_versions
     
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """验证密码"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """验证密码（哈希线程池中执行）"""
+        return await verify_password_async(plain_password, hashed_password)
     
-    def _get_password_hash(self, password: str) -> str:
-        """获取密码哈希"""
-        return pwd_context.hash(password)
+    async def _get_password_hash(self, password: str) -> str:
+        """获取密码哈希（哈希线程池中执行）"""
+        return await get_password_hash_async(password)
     
     def _create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """创建访问令牌"""
@@ -40,7 +51,7 @@ class AuthUseCase:
         else:
             expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
         
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
         return encoded_jwt
     
@@ -51,7 +62,7 @@ class AuthUseCase:
             raise ValueError("密码和确认密码不匹配")
         
         # 创建用户（内部包含唯一性检查）
-        hashed_password = self._get_password_hash(user_data.password)
+        hashed_password = await self._get_password_hash(user_data.password)
         created_user = await self.user_service.create_user(
             email=user_data.email,
             username=user_data.username,
@@ -67,6 +78,22 @@ class AuthUseCase:
             }
         }
     
+    async def check_availability(self, check_data: AvailabilityCheckDTO) -> Dict[str, Any]:
+        """检查用户名/邮箱/手机号是否可注册（true 为可用）"""
+        identifiers = {
+            "username": check_data.username,
+            "email": check_data.email,
+            "phone": check_data.phone,
+        }
+        if not any(identifiers.values()):
+            raise ValueError("请至少提供一个待检查的用户名、邮箱或手机号")
+        
+        return {
+            "success": True,
+            "message": "检查完成",
+            "data": await self.user_service.check_availability(identifiers)
+        }
+    
     async def login_user(self, login_data: UserLoginDTO) -> Dict[str, Any]:
         """用户登录"""
         # 根据登录标识符获取用户
@@ -79,28 +106,65 @@ class AuthUseCase:
             raise ValueError("用户账户已被禁用")
         
         # 验证密码
-        if not self._verify_password(login_data.password, user.hashed_password):
+        if not await self._verify_password(login_data.password, user.hashed_password):
             raise ValueError("密码错误")
         
+        # 哈希策略已变更（算法或成本）时在后台重新哈希，不延迟登录响应
+        if self.password_rehasher is not None and password_needs_update(user.hashed_password):
+            self.password_rehasher(user.id, login_data.password, user.hashed_password)
+        
         # 更新最后登录时间
         await self.user_service.update_last_login(user.id)
         
-        # 创建访问令牌
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+        return {
+            "success": True,
+            "message": "登录成功",
+            **await self._issue_tokens(user.id, user.username),
+            "data": {
+                "username": user.username
+            }
+        }
+    
+    async def _issue_tokens(
+        self,
+        user_id: UUID,
+        username: str,
+        refresh_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """签发访问令牌；未传入轮换后的刷新令牌时为本次登录签发新的刷新令牌"""
         access_token = self._create_access_token(
-            data={"sub": str(user.id), "username": user.username},
-            expires_delta=access_token_expires
+            data={"sub": str(user_id), "username": username},
+            expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
         )
+        if refresh_token is None and self.refresh_token_service is not None:
+            refresh_token = await self.refresh_token_service.issue(user_id)
+        return {
+            "token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": settings.access_token_expire_minutes * 60
+        }
+    
+    async def refresh_tokens(self, refresh_data: RefreshTokenDTO) -> Dict[str, Any]:
+        """用刷新令牌换取新的令牌对（不查询密码、不做 bcrypt 校验）"""
+        if self.refresh_token_service is None:
+            raise ValueError("未启用刷新令牌")
+        consumed, new_refresh_token = await self.refresh_token_service.rotate(refresh_data.refresh_token)
         
         return {
             "success": True,
-            "message": "登录成功",
-            "token": access_token,
+            "message": "令牌刷新成功",
+            **await self._issue_tokens(consumed.user_id, consumed.username or "", new_refresh_token),
             "data": {
-                "username": user.username
+                "username": consumed.username
             }
         }
     
+    async def cached_profile_version(self, user_id: UUID) -> Optional[int]:
+        """缓存的资料版本号（不访问数据库，未缓存时为 None）"""
+        if self.profile_versions is None:
+            return None
+        return await self.profile_versions.get(user_id)
+    
     async def get_user_profile(self, user_id: UUID) -> Dict[str, Any]:
         """获取用户资料"""
         user = await self.user_service.get_user_by_id(user_id)
@@ -108,6 +172,8 @@ class AuthUseCase:
         if not user:
             raise ValueError("用户不存在")
         
+        if self.profile_versions is not None:
+            await self.profile_versions.remember(user_id, user.version, replace=False)
         return {
             "success": True,
             "message": "用户资料获取成功",
@@ -115,14 +181,7 @@ class AuthUseCase:
         }
     
     async def update_user_profile(self, user_id: UUID, update_data: UserUpdateDTO) -> Dict[str, Any]:
-        """更新用户资料"""
-        user = await self.user_service.get_user_by_id(user_id)
-        
-        if not user:
-            raise ValueError("用户不存在")
-        
-        # 构建更新数据
-        update_dict = {}
+        """更新用户资料（不预先读取用户，一次往返完成）"""
         old_info = {}
         new_info = {}
         
@@ -137,7 +196,10 @@ class AuthUseCase:
                 username=new_username,
                 email=new_email,
                 phone=new_phone,
+                expected_version=update_data.version,
             )
+            if self.profile_versions is not None:
+                await self.profile_versions.remember(user_id, updated_user.version)
             if new_username:
                 old_info["username"] = update_data.old_username
                 new_info["username"] = new_username
@@ -153,7 +215,8 @@ class AuthUseCase:
                 "message": "用户信息修改成功",
                 "data": {
                     "old_info": old_info,
-                    "new_info": new_info
+                    "new_info": new_info,
+                    "version": updated_user.version
                 }
             }
         return {
@@ -163,27 +226,29 @@ class AuthUseCase:
         }
     
     async def change_password(self, user_id: UUID, password_data: PasswordChangeDTO) -> Dict[str, Any]:
-        """修改密码"""
+        """修改密码（一次校验 + 一次哈希）"""
+        # 先做不需要哈希计算的检查
+        if password_data.new_password != password_data.confirm_new_password:
+            raise ValueError("新密码和确认密码不匹配")
+        
+        # 当前密码校验通过后，明文比较即可判断新旧密码是否相同，无需再次校验哈希
+        if password_data.new_password == password_data.current_password:
+            raise ValueError("新密码不能与当前密码相同")
+        
         user = await self.user_service.get_user_by_id(user_id)
         
         if not user:
             raise ValueError("用户不存在")
         
         # 验证当前密码
-        if not self._verify_password(password_data.current_password, user.hashed_password):
+        if not await self._verify_password(password_data.current_password, user.hashed_password):
             raise ValueError("当前密码错误")
         
-        # 验证新密码确认
-        if password_data.new_password != password_data.confirm_new_password:
-            raise ValueError("新密码和确认密码不匹配")
-        
-        # 检查新密码是否与当前密码相同
-        if self._verify_password(password_data.new_password, user.hashed_password):
-            raise ValueError("新密码不能与当前密码相同")
-        
         # 更新密码
-        hashed_new_password = self._get_password_hash(password_data.new_password)
+        hashed_new_password = await self._get_password_hash(password_data.new_password)
         updated_user = await self.user_service.change_password_hashed(user_id, hashed_new_password)
+        if self.refresh_token_service is not None:
+            await self.refresh_token_service.revoke_user(user_id)
         
         return {
             "success": True,
@@ -204,9 +269,17 @@ class AuthUseCase:
             "data": stats
         }
     
-    async def logout_user(self) -> Dict[str, Any]:
-        """用户登出"""
-        # 在实际应用中，这里可能需要将令牌加入黑名单
+    async def logout_user(
+        self,
+        token_payload: Dict[str, Any],
+        refresh_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """用户登出：吊销当前访问令牌直至其自然过期，并吊销对应的刷新令牌"""
+        jti = token_payload.get("jti")
+        if jti and self.token_revocation is not None:
+            await self.token_revocation.revoke(jti, float(token_payload["exp"]))
+        if refresh_token and self.refresh_token_service is not None:
+            await self.refresh_token_service.revoke(refresh_token)
         return {
             "success": True,
             "message": "登出成功，已清除用户会话"
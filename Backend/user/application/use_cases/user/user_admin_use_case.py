@@ -0,0 +1,42 @@
+"""
+用户管理用例（超级用户）
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+from user.domains.user.services import UserService
+
+
+class UserAdminUseCase:
+    """用户管理用例：用户搜索与补全"""
+    
+    def __init__(self, user_service: UserService):
+        self.user_service = user_service
+    
+    async def is_superuser(self, user_id: UUID) -> bool:
+        """是否为有效的超级用户"""
+        user = await self.user_service.get_user_by_id(user_id)
+        return bool(user and user.is_active and user.is_superuser)
+    
+    async def search_users(self, query: str, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """按用户名/邮箱模糊搜索（相关度排序，键集分页）"""
+        matches, next_cursor = await self.user_service.search_users(query, limit, cursor)
+        return {
+            "success": True,
+            "message": "搜索完成",
+            "data": {
+                "items": [{**user.to_dict(), "score": round(score, 4)} for user, score in matches],
+                "next_cursor": next_cursor
+            }
+        }
+    
+    async def autocomplete_users(self, prefix: str, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """用户名前缀补全"""
+        users, next_cursor = await self.user_service.autocomplete_users(prefix, limit, cursor)
+        return {
+            "success": True,
+            "message": "补全完成",
+            "data": {
+                "items": [{"id": str(user.id), "username": user.username, "email": user.email} for user in users],
+                "next_cursor": next_cursor
+            }
+        }
@@ -0,0 +1,161 @@
+"""
+用户标识可用性过滤器
+
+按 用户名/邮箱/手机号 各维护一个布隆过滤器，启动时流式读取 users 表构建，
+注册与资料修改后加入新值，并通过 Redis pub/sub 同步到其它进程：
+- 过滤器判定"不存在"时，标识一定可用，无需访问数据库；
+- 判定"可能存在"时再查询数据库确认。
+过滤器只增不减（改名后旧值仍为"可能存在"，由数据库确认），按 refresh_interval 定期重建。
+注册提交时仍以数据库唯一性检查为准，过滤器只用于输入过程中的即时提示。
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from user.core.bloom import BloomFilter
+from user.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+IDENTIFIER_FIELDS = ("username", "email", "phone")
+IDENTIFIER_CHANNEL = "users:identifiers"
+
+IdentifierRows = AsyncIterator[Tuple[str, str, Optional[str]]]
+
+
+def normalize_identifier(field: str, value: str) -> str:
+    """与仓储查询一致的规范化（邮箱不区分大小写）"""
+    value = value.strip()
+    return value.lower() if field == "email" else value
+
+
+class IdentifierFilter:
+    """用户标识布隆过滤器（进程内，Redis 同步增量）"""
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.01, refresh_interval: int = 3600):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self._filters: Dict[str, BloomFilter] = self._new_filters(capacity)
+        self._pending: Optional[List[Tuple[str, str]]] = None  # 构建期间到达的增量
+        self.ready = False
+        self._redis: Optional[redis.Redis] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _new_filters(self, capacity: int) -> Dict[str, BloomFilter]:
+        return {field: BloomFilter(capacity, self.error_rate) for field in IDENTIFIER_FIELDS}
+
+    async def start(self, loader: Callable[["IdentifierFilter"], Awaitable[None]]) -> None:
+        """后台构建过滤器并订阅增量（构建完成前所有检查都回落到数据库）"""
+        try:
+            self._redis = redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+            await self._redis.ping()
+            self._tasks.append(asyncio.create_task(self._listen()))
+        except Exception as e:
+            logger.warning("标识过滤器无法连接 Redis，仅同步本进程内的新增: %s", e)
+            await self._close_redis()
+        self._tasks.append(asyncio.create_task(self._refresh(loader)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._close_redis()
+
+    async def _close_redis(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def _refresh(self, loader: Callable[["IdentifierFilter"], Awaitable[None]]) -> None:
+        while True:
+            try:
+                await loader(self)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("标识过滤器构建失败，稍后重试: %s", e)
+                self._pending = None
+                await asyncio.sleep(min(60, self.refresh_interval))
+                continue
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(IDENTIFIER_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        field, _, value = message["data"].partition(" ")
+                        self._add(field, value)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("标识过滤器订阅中断，稍后重试: %s", e)
+                await asyncio.sleep(1.0)
+
+    async def load(self, rows: IdentifierRows) -> int:
+        """从数据流构建新过滤器并整体替换，返回用户数"""
+        self._pending = []
+        count = 0
+        filters = self._new_filters(self.capacity)
+        username_filter, email_filter, phone_filter = (filters[field] for field in IDENTIFIER_FIELDS)
+        async for username, email, phone in rows:
+            username_filter.add(username)
+            email_filter.add(email.lower())
+            if phone:
+                phone_filter.add(phone)
+            count += 1
+        for field, value in self._pending:
+            filters[field].add(value)
+        self._filters = filters
+        self._pending = None
+        self.ready = True
+        if count > self.capacity:
+            # 下次重建时扩容，保持误判率
+            self.capacity = count * 2
+        logger.info("标识过滤器已构建：%d 个用户", count)
+        return count
+
+    def _add(self, field: str, value: str) -> None:
+        if field not in self._filters or not value:
+            return
+        self._filters[field].add(value)
+        if self._pending is not None:
+            self._pending.append((field, value))
+
+    async def remember(self, **identifiers: Optional[str]) -> None:
+        """记录新占用的标识（本进程立即生效，并广播给其它进程）"""
+        values = [
+            (field, normalize_identifier(field, value))
+            for field, value in identifiers.items() if value
+        ]
+        for field, value in values:
+            self._add(field, value)
+        if self._redis is None:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for field, value in values:
+                    pipe.publish(IDENTIFIER_CHANNEL, f"{field} {value}")
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("标识过滤器广播失败: %s", e)
+
+    def might_exist(self, field: str, value: str) -> bool:
+        """False 表示一定未被占用；True 表示需要查询数据库确认"""
+        if not self.ready:
+            return True
+        return normalize_identifier(field, value) in self._filters[field]
+
+
+# 全局标识过滤器实例
+identifier_filter = IdentifierFilter(
+    capacity=settings.identifier_filter_capacity,
+    error_rate=settings.identifier_filter_error_rate,
+    refresh_interval=settings.identifier_filter_refresh_interval
+)
@@ -0,0 +1,73 @@
+"""
+布隆过滤器
+
+进程内使用：位置由 Python 内置 hash 派生（同一进程内稳定，跨进程不一致），
+因此过滤器不可序列化共享，各进程从权威数据源（Redis/数据库）各自构建。
+"""
+import math
+from typing import Hashable, Iterable
+
+
+class BloomFilter:
+    """布隆过滤器：不存在的判断绝对准确，存在的判断有 error_rate 的误判率"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity 必须大于0，error_rate 必须在 (0, 1) 之间")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        size = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(64, 1 << (size - 1).bit_length())  # 取 2 的幂，用位与代替取模
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._mask = self.size - 1
+        self._bits = bytearray(self.size >> 3)
+        self.count = 0
+
+    def _positions(self, item: Hashable):
+        # 双重哈希：h1 + i*h2 生成 k 个位置
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        mask = self._mask
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) & mask
+
+    def add(self, item: Hashable) -> None:
+        """加入元素"""
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """批量加入元素"""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: Hashable) -> bool:
+        if not self.count:
+            return False
+        # 内联位置计算：未命中的元素通常在第一、二个位置即可返回
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        mask = self._mask
+        bits = self._bits
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) & mask
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def clear(self) -> None:
+        """清空过滤器"""
+        self._bits = bytearray(self.size >> 3)
+        self.count = 0
+
+    @property
+    def saturated(self) -> bool:
+        """元素数已超过设计容量（误判率开始上升，应当重建）"""
+        return self.count > self.capacity
+
+    def __len__(self) -> int:
+        return self.count
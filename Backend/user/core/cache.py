@@ -2,80 +2,354 @@
 Redis 缓存管理
 """
 import json
-from typing import Any, Optional, Union
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from uuid import UUID
+
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError
+
 from user.core.config import settings
 
+try:
+    import orjson  # type: ignore
+except Exception:  # 未安装 orjson 时退回标准库
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except Exception:  # 未安装 msgpack 时只能使用 json 编码
+    msgpack = None
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # 未安装 zstandard 时不压缩
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 值首字节标记编码方式，读取时据此解码（切换编码配置后旧值仍可读取）
+_FORMAT_JSON = 0x01
+_FORMAT_MSGPACK = 0x02
+_FORMAT_BYTES = 0x03
+_FLAG_ZSTD = 0x80
+
+TTL = Union[None, int, Mapping[str, Optional[int]]]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"无法序列化类型: {type(value).__name__}")
+
+
+class CacheCodec:
+    """缓存值编解码：json / msgpack，可选 zstd 压缩；bytes 原样存储"""
+
+    def __init__(self, codec: str = "msgpack", compress_threshold: int = 4096, compress_level: int = 3):
+        if codec == "msgpack" and msgpack is None:
+            logger.warning("未安装 msgpack，缓存改用 json 编码")
+            codec = "json"
+        self.codec = codec
+        self.compress_threshold = compress_threshold if zstandard is not None else 0
+        self._compressor = zstandard.ZstdCompressor(level=compress_level) if zstandard else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            fmt, body = _FORMAT_BYTES, bytes(value)
+        elif self.codec == "msgpack":
+            fmt, body = _FORMAT_MSGPACK, msgpack.packb(value, use_bin_type=True, default=_default)
+        elif orjson is not None:
+            fmt, body = _FORMAT_JSON, orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS, default=_default)
+        else:
+            fmt, body = _FORMAT_JSON, json.dumps(value, ensure_ascii=False, default=_default).encode("utf-8")
+        if self.compress_threshold and len(body) >= self.compress_threshold:
+            fmt, body = fmt | _FLAG_ZSTD, self._compressor.compress(body)
+        return bytes((fmt,)) + body
+
+    def decode(self, raw: Optional[bytes]) -> Any:
+        if raw is None:
+            return None
+        fmt = raw[0] if raw else 0
+        body = raw[1:]
+        if fmt & _FLAG_ZSTD:
+            if self._decompressor is None:
+                raise ValueError("缓存值为 zstd 压缩，但未安装 zstandard")
+            fmt, body = fmt & ~_FLAG_ZSTD, self._decompressor.decompress(body)
+        if fmt == _FORMAT_BYTES:
+            return body
+        if fmt == _FORMAT_MSGPACK:
+            return msgpack.unpackb(body, raw=False)
+        if fmt == _FORMAT_JSON:
+            return orjson.loads(body) if orjson is not None else json.loads(body)
+        # 无标记的旧值（早期以 JSON 文本或纯字符串写入）
+        text = raw.decode("utf-8")
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
 
 class CacheService:
-    """缓存服务"""
+    """Redis 缓存服务
+
+    值以二进制编码存储（见 CacheCodec）；批量读写通过 MGET / pipeline 一次往返完成。
+    连接池为阻塞式：连接耗尽时最多等待 pool_timeout 秒。缓存为尽力而为，Redis 异常时
+    读返回 None、写返回 False，并计入 stats()。
+    """
     
-    def __init__(self):
+    def __init__(self, codec: Optional[CacheCodec] = None):
         self._redis: Optional[redis.Redis] = None
+        self._pool: Optional[redis.BlockingConnectionPool] = None
+        self.codec = codec or CacheCodec(
+            settings.cache_codec,
+            compress_threshold=settings.cache_compress_threshold,
+            compress_level=settings.cache_compress_level
+        )
+        self._stats: Dict[str, int] = {
+            "hits": 0, "misses": 0, "writes": 0, "errors": 0, "pool_timeouts": 0, "round_trips": 0
+        }
     
     async def connect(self) -> None:
         """连接到 Redis"""
-        self._redis = redis.from_url(
+        self._pool = redis.BlockingConnectionPool.from_url(
             settings.redis_url,
-            encoding="utf-8",
-            decode_responses=True,
-            max_connections=20
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout
         )
+        self._redis = redis.Redis(connection_pool=self._pool)
     
     async def disconnect(self) -> None:
         """断开 Redis 连接"""
         if self._redis:
             await self._redis.close()
+            await self._pool.disconnect()
+            self._redis = None
+            self._pool = None
+    
+    def _failed(self, operation: str, error: Exception) -> None:
+        self._stats["errors"] += 1
+        if isinstance(error, RedisConnectionError) and "No connection available" in str(error):
+            self._stats["pool_timeouts"] += 1
+        logger.warning("缓存 %s 失败: %s", operation, error)
+    
+    def _count(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self._stats["hits" if value is not None else "misses"] += 1
     
     async def get(self, key: str) -> Optional[Any]:
         """获取缓存值"""
         if not self._redis:
             return None
         
-        value = await self._redis.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
-        return None
+        try:
+            self._stats["round_trips"] += 1
+            value = self.codec.decode(await self._redis.get(key))
+        except RedisError as e:
+            self._failed("get", e)
+            return None
+        self._count((value,))
+        return value
+    
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """批量获取缓存值（一次往返），结果与 keys 顺序一致，未命中为 None"""
+        if not self._redis or not keys:
+            return [None] * len(keys)
+        
+        try:
+            self._stats["round_trips"] += 1
+            values = [self.codec.decode(raw) for raw in await self._redis.mget(keys)]
+        except RedisError as e:
+            self._failed("mget", e)
+            return [None] * len(keys)
+        self._count(values)
+        return values
     
     async def set(
         self,
         key: str,
         value: Any,
-        expire: Optional[int] = None
+        expire: Optional[int] = None,
+        nx: bool = False
     ) -> bool:
-        """设置缓存值"""
+        """设置缓存值（nx 时仅在键不存在时写入）"""
         if not self._redis:
             return False
         
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value, ensure_ascii=False)
-        
-        result = await self._redis.set(key, value, ex=expire)
+        try:
+            self._stats["round_trips"] += 1
+            result = await self._redis.set(key, self.codec.encode(value), ex=expire, nx=nx)
+        except RedisError as e:
+            self._failed("set", e)
+            return False
+        self._stats["writes"] += 1
         return bool(result)
     
+    async def mset(self, items: Mapping[str, Any], expire: TTL = None) -> bool:
+        """批量设置缓存值（一次往返）
+
+        expire 可为统一秒数，也可为 {key: 秒数} 以逐键设置过期时间。
+        """
+        if not self._redis or not items:
+            return False
+        
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    ttl = expire.get(key) if isinstance(expire, Mapping) else expire
+                    pipe.set(key, self.codec.encode(value), ex=ttl)
+                self._stats["round_trips"] += 1
+                results = await pipe.execute()
+        except RedisError as e:
+            self._failed("mset", e)
+            return False
+        self._stats["writes"] += len(items)
+        return all(results)
+    
+    def pipeline(self, transaction: bool = False) -> "redis.client.Pipeline":
+        """获取原生 pipeline（值需经 self.codec 编解码）"""
+        if not self._redis:
+            raise RuntimeError("缓存未连接")
+        self._stats["round_trips"] += 1
+        return self._redis.pipeline(transaction=transaction)
+    
     async def delete(self, key: str) -> bool:
         """删除缓存"""
         if not self._redis:
             return False
         
-        return bool(await self._redis.delete(key))
+        try:
+            return bool(await self._redis.delete(key))
+        except RedisError as e:
+            self._failed("delete", e)
+            return False
     
     async def exists(self, key: str) -> bool:
         """检查键是否存在"""
         if not self._redis:
             return False
         
-        return bool(await self._redis.exists(key))
+        try:
+            return bool(await self._redis.exists(key))
+        except RedisError as e:
+            self._failed("exists", e)
+            return False
     
     async def expire(self, key: str, seconds: int) -> bool:
         """设置过期时间"""
         if not self._redis:
             return False
         
-        return await self._redis.expire(key, seconds)
+        try:
+            return bool(await self._redis.expire(key, seconds))
+        except RedisError as e:
+            self._failed("expire", e)
+            return False
+    
+    def stats(self) -> Dict[str, Any]:
+        """命中/错误计数与连接池占用情况"""
+        data: Dict[str, Any] = dict(self._stats)
+        if self._pool is not None:
+            data.update(
+                pool_max_connections=self._pool.max_connections,
+                pool_in_use=len(getattr(self._pool, "_in_use_connections", ())),
+                pool_idle=len(getattr(self._pool, "_available_connections", ()))
+            )
+        return data
+
+
+class MemoryCache:
+    """进程内缓存（TTL + LRU 淘汰），接口与 CacheService 保持一致
+
+    用于无需跨进程共享、但需要保存二进制值的场景（如矢量切片），
+    也可作为 Redis 不可用时的本地兜底。
+    """
+
+    def __init__(self, max_entries: int = 10000, default_ttl: Optional[int] = None):
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+
+    def _alive(self, key: str) -> bool:
+        item = self._data.get(key)
+        if item is None:
+            return False
+        expires_at = item[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    async def get(self, key: str) -> Optional[Any]:
+        """获取缓存值（命中时刷新 LRU 顺序）"""
+        if not self._alive(key):
+            return None
+        self._data.move_to_end(key)
+        return self._data[key][0]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[int] = None,
+        nx: bool = False
+    ) -> bool:
+        """设置缓存值（nx 时仅在键不存在时写入）"""
+        if nx and self._alive(key):
+            return False
+        ttl = expire if expire is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """删除缓存"""
+        return self._data.pop(key, None) is not None
+
+    async def exists(self, key: str) -> bool:
+        """检查键是否存在"""
+        return self._alive(key)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        """设置过期时间"""
+        if not self._alive(key):
+            return False
+        value, _ = self._data[key]
+        self._data[key] = (value, time.monotonic() + seconds)
+        return True
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """批量获取缓存值"""
+        return [await self.get(key) for key in keys]
+
+    async def mset(self, items: Mapping[str, Any], expire: TTL = None) -> bool:
+        """批量设置缓存值（expire 可为 {key: 秒数}）"""
+        for key, value in items.items():
+            await self.set(key, value, expire.get(key) if isinstance(expire, Mapping) else expire)
+        return True
+
+    def clear(self, prefix: str = "") -> int:
+        """按前缀清除缓存，返回清除数量"""
+        keys = [key for key in self._data if key.startswith(prefix)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 # 全局缓存实例
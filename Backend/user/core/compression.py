@@ -0,0 +1,197 @@
+"""
+响应压缩
+
+按 Accept-Encoding 协商 zstd / br / gzip（q 值优先，相同时按 COMPRESS_ENCODINGS 顺序）：
+- 只压缩 _LEVELS 中列出的内容类型；已编码（如预压缩的矢量切片）、小于 COMPRESS_MIN_SIZE、
+  204/304 响应与 SSE 原样输出；
+- 压缩级别按内容类型选择：体量大的 GIS 载荷取较低级别换吞吐，体量小的 JSON/文本取较高级别；
+- 流式响应（StreamingResponse）逐块压缩并 flush，客户端可边收边解；
+- 单块超过 COMPRESS_OFFLOAD_SIZE 时在线程池中压缩，不阻塞事件循环。
+br 需安装 brotli，zstd 需安装 zstandard（均为可选，未安装时不参与协商）。
+各级别的 CPU 耗时与压缩率见 utils/bench_compression.py。
+"""
+import zlib
+from typing import Dict, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli  # type: ignore
+except Exception:  # 未安装 brotli 时不提供 br
+    brotli = None
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # 未安装 zstandard 时不提供 zstd
+    zstandard = None
+
+AVAILABLE_ENCODINGS = tuple(
+    encoding for encoding, module in (("zstd", zstandard), ("br", brotli), ("gzip", zlib)) if module is not None
+)
+
+# 内容类型 -> 各编码的压缩级别（依据 bench_compression.py）
+# GIS 载荷体量大：取吞吐不低于约 100MB/s 的级别中压缩率最高者；普通 JSON/文本体量小，取较高级别
+_GIS_LEVELS = {"zstd": 1, "br": 3, "gzip": 3}
+_TEXT_LEVELS = {"zstd": 3, "br": 5, "gzip": 6}
+_LEVELS: Dict[str, Dict[str, int]] = {
+    "application/geo+json": _GIS_LEVELS,
+    "application/topo+json": _GIS_LEVELS,
+    "application/flatgeobuf": _GIS_LEVELS,
+    "application/vnd.mapbox-vector-tile": _TEXT_LEVELS,
+    "application/json": _TEXT_LEVELS,
+    "text/html": _TEXT_LEVELS,
+    "text/plain": _TEXT_LEVELS,
+    "text/css": _TEXT_LEVELS,
+    "application/javascript": _TEXT_LEVELS,
+}
+
+
+def compression_level(content_type: str, encoding: str) -> Optional[int]:
+    """内容类型对应的压缩级别，不压缩时为 None"""
+    levels = _LEVELS.get(content_type.split(";", 1)[0].strip().lower())
+    return levels.get(encoding) if levels else None
+
+
+def negotiate_encoding(accept_encoding: str, preferred: Sequence[str] = AVAILABLE_ENCODINGS) -> Optional[str]:
+    """从 Accept-Encoding 中选出编码（q 值最高者，相同时按 preferred 顺序）"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if name:
+            weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, wildcard), -rank, encoding)
+        for rank, encoding in enumerate(preferred)
+    ]
+    best = max(candidates, default=None)
+    return best[2] if best and best[0] > 0 else None
+
+
+class Compressor:
+    """增量压缩器：compress 追加数据，flush 输出已压缩部分（流式），finish 结束"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "gzip":
+            return self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.flush()
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        """压缩一块：final 时结束压缩流，否则 flush 使客户端可立即解出这部分"""
+        return self.compress(data) + (self.finish() if final else self.flush())
+
+
+class CompressionMiddleware:
+    """响应压缩中间件（纯 ASGI，支持流式响应）"""
+
+    def __init__(
+        self,
+        app,
+        encodings: Sequence[str] = AVAILABLE_ENCODINGS,
+        minimum_size: int = 1024,
+        offload_size: int = 262144
+    ):
+        self.app = app
+        self.encodings = [encoding for encoding in encodings if encoding in AVAILABLE_ENCODINGS]
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                level = self._level(start["status"], headers, encoding)
+                if level is None or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = Compressor(encoding, level)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = await self._compress(compressor, body, True)
+                    headers["Content-Length"] = str(len(body))
+                    await send({**start, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers.raw})
+
+            await send({
+                "type": "http.response.body",
+                "body": await self._compress(compressor, body, not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _level(status: int, headers: MutableHeaders, encoding: str) -> Optional[int]:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return None
+        return compression_level(headers.get("content-type", ""), encoding)
+
+    async def _compress(self, compressor: Compressor, data: bytes, final: bool) -> bytes:
+        if len(data) >= self.offload_size:
+            return await run_in_threadpool(compressor.chunk, data, final)
+        return compressor.chunk(data, final)
+
@@ -0,0 +1,53 @@
+"""
+条件请求（ETag / If-None-Match）
+
+用户资料的 ETag 由 用户 ID + 资料版本号 构成（资料修改与停用时版本号递增）。
+版本号缓存在 Redis：If-None-Match 与缓存版本一致时直接返回 304，不访问数据库、不序列化响应体；
+缓存缺失时查询数据库，一致时同样返回 304。
+资料修改后覆盖写入新版本号；读取路径只在键不存在时写入，避免并发读取把旧版本写回。
+"""
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import Response
+
+# 浏览器与代理每次都需携带 If-None-Match 重新验证
+PROFILE_CACHE_CONTROL = "private, no-cache"
+
+
+def profile_etag(user_id: UUID, version: int) -> str:
+    return f'W/"{user_id.hex}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否命中（弱比较，支持多个 ETag 与 *）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PROFILE_CACHE_CONTROL})
+
+
+class ProfileVersionCache:
+    """用户资料版本号缓存（尽力而为，缓存不可用时调用方回落到数据库）"""
+
+    def __init__(self, cache: Any, ttl: int = 86400):
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"user:profile_version:{user_id}"
+
+    async def get(self, user_id: UUID) -> Optional[int]:
+        version = await self.cache.get(self._key(user_id))
+        return int(version) if version is not None else None
+
+    async def remember(self, user_id: UUID, version: int, replace: bool = True) -> None:
+        """记录版本号；replace=False 时仅在缓存缺失时写入（读取路径使用）"""
+        await self.cache.set(self._key(user_id), version, expire=self.ttl, nx=not replace)
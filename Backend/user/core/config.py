@@ -2,6 +2,7 @@
 配置管理模块
 统一管理所有系统配置
 """
+import os
 from functools import lru_cache
 from typing import Optional, List
 from pydantic import Field, field_validator
@@ -17,6 +18,22 @@ class Settings(BaseSettings):
     debug: bool = False
     environment: str = "development"
     
+    # 服务进程（start_server.py --prod：gunicorn 主进程 + uvicorn 工作进程）
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0  # 工作进程数，0 表示按 CPU 核数
+    server_preload: bool = True  # fork 前在主进程加载应用，工作进程共享只读内存
+    server_graceful_timeout: int = 30  # 重载/关闭时等待进行中请求完成的秒数
+    server_timeout: int = 60  # 工作进程无响应超过该秒数时被主进程重启
+    server_keepalive: int = 5
+    
+    @property
+    def worker_count(self) -> int:
+        return self.server_workers if self.server_workers > 0 else (os.cpu_count() or 1)
+    
+    # 请求时限（路由以 @request_timeout 覆盖，客户端可用 X-Request-Timeout 缩短；0 表示不限）
+    request_timeout_default: float = 30.0
+    
     # API 配置
     api_v1_prefix: str = "/api/v1"
     cors_origins: str = Field(default="http://localhost:3000,http://localhost:8080")
@@ -41,6 +58,20 @@ class Settings(BaseSettings):
     postgres_port: int = Field(default=5432, alias="POSTGRES_PORT")
     postgres_db: str = Field(default="supermap_gis", alias="POSTGRES_DB")  # 目标数据库
     
+    # 连接池（每个工作进程独立一个池：进程数 × (pool_size + max_overflow) 应小于数据库 max_connections）
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_connection_budget: int = 0  # 全部工作进程合计的连接上限，>0 时按进程数均分，覆盖上面两项
+    db_pool_timeout: float = 10.0  # 池满时等待空闲连接的秒数
+    db_pool_recycle: int = 3600
+    db_pool_pre_ping: bool = True  # 每次签出前探活（多一次往返）
+    db_pgbouncer: bool = False  # 经 PgBouncer 事务池连接：关闭预编译语句缓存与 pre-ping
+    db_slow_query_ms: float = 200.0  # 超过该耗时的语句记录慢查询日志
+    db_query_default_budget: Optional[int] = None  # 未用 @query_budget 声明的路由的语句数上限
+    db_query_budget_strict: bool = False  # 超出上限时使请求失败（测试环境开启）
+    db_query_cache_size: int = 1200  # SQLAlchemy 编译缓存条目数
+    db_prepared_statement_cache_size: int = 500  # 每个连接的 asyncpg 预编译语句缓存
+    
     @property
     def database_url(self) -> str:
         return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
@@ -50,6 +81,27 @@ class Settings(BaseSettings):
     redis_port: int = 6379
     redis_password: Optional[str] = None
     redis_db: int = 0
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 2.0  # 连接池耗尽时等待空闲连接的秒数
+    redis_socket_timeout: float = 2.0
+    
+    # 响应压缩（zstd/br 分别需安装 zstandard/brotli，未安装的编码自动跳过）
+    compress_enabled: bool = True
+    compress_encodings: str = "zstd,br,gzip"  # 服务端优先顺序
+    compress_min_size: int = 1024  # 小于该字节数的响应不压缩
+    compress_offload_size: int = 262144  # 单块超过该字节数时在线程池中压缩
+    
+    @property
+    def compress_encodings_list(self) -> List[str]:
+        return [encoding.strip().lower() for encoding in self.compress_encodings.split(",") if encoding.strip()]
+    
+    # 资料版本号缓存（/me、/profile 的 ETag 校验，命中时不访问数据库）
+    profile_version_cache_ttl: int = 86400
+    
+    # 缓存编码（msgpack / json；超过阈值字节数的值使用 zstd 压缩，需安装 zstandard）
+    cache_codec: str = "msgpack"
+    cache_compress_threshold: int = 4096
+    cache_compress_level: int = 3
     
     @property
     def redis_url(self) -> str:
@@ -63,10 +115,97 @@ class Settings(BaseSettings):
     supermap_username: str = "admin"
     supermap_password: str = "admin"
 
+    # GIS 空间数据配置（SuperMap SDX+ 入库的 PostGIS schema）
+    sdx_schema: str = "sdx"
+    sdx_default_srid: int = 4326  # 图层未登记 SRID 时使用
+    sdx_catalog_path: str = ".cache/sdx_catalog.json"  # schema 目录缓存文件
+    sdx_catalog_ttl: int = 3600
+
+    # 矢量切片（MVT）配置
+    tile_extent: int = 4096
+    tile_buffer: int = 64
+    tile_min_zoom: int = 0
+    tile_max_zoom: int = 22
+    tile_simplify_pixels: float = 0.5  # 简化容差（以 256px 瓦片的像素计）
+    tile_simplify_max_zoom: int = 16  # 该级别及以上不再简化
+    tile_cache_ttl: int = 3600
+    tile_cache_max_entries: int = 10000
+    tile_seed_max_tiles: int = 5000
+
+    # 要素查询配置
+    feature_query_default_limit: int = 500
+    feature_query_max_limit: int = 5000
+    feature_stream_max_features: int = 200000
+    feature_stream_batch_size: int = 1000
+    geojson_precision: int = 6  # 输出坐标小数位（6 位约 0.1 米）
+
+    # 空间分析结果存储配置
+    analysis_result_ttl: int = 7 * 24 * 3600  # 结果保留时长（秒）
+    analysis_max_results_per_user: int = 500  # 超出后按最近访问时间淘汰
+    analysis_compress_threshold: int = 32768  # 结果超过该字节数时压缩存储
+    analysis_history_default_limit: int = 20
+    analysis_history_max_limit: int = 100
+    analysis_purge_interval: int = 3600  # 全量清理过期结果的间隔（秒），0 不启用
+
+    # 向量检索配置（未配置 QDRANT_URL 时使用进程内 NumPy 索引）
+    qdrant_url: Optional[str] = None
+    qdrant_api_key: Optional[str] = None
+    qdrant_timeout: float = 10.0
+    qdrant_max_connections: int = 20
+    qdrant_hnsw_ef: Optional[int] = 128  # 检索时 HNSW 候选数，越大越准越慢
+    vector_upsert_batch_size: int = 256
+    vector_upsert_concurrency: int = 4
+    vector_search_cache_ttl: int = 300
+    vector_search_cache_max_entries: int = 10000
+    vector_search_max_limit: int = 100
+
+    # 后台任务配置（多实例部署时使用 redis 队列）
+    job_queue_backend: str = "memory"  # memory / redis
+    job_workers_enabled: bool = True  # 是否在本服务进程内消费任务
+    job_process_workers: int = 2  # 每个服务进程同时执行任务的子进程数
+    job_consumers: int = 2  # 每个服务进程的队列消费协程数
+    job_max_active_per_user: int = 3
+    job_timeout: int = 1800
+    job_ttl: int = 86400  # 任务记录保留时长
+    job_poll_interval: float = 0.5
+
     # JWT 配置
     secret_key: str = "your-super-secret-key-change-this-in-production"
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 30
+    access_token_expire_minutes: int = 15  # 访问令牌短时有效，过期后用刷新令牌换取
+    refresh_token_expire_days: int = 14
+    token_revocation_capacity: int = 100000  # 吊销列表布隆过滤器设计容量
+    token_revocation_error_rate: float = 0.001
+    
+    # 密码哈希策略（成本参数用 utils/calibrate_password_hash.py 按目标耗时标定）
+    password_hash_scheme: str = "bcrypt"  # bcrypt / argon2（argon2id，需安装 argon2-cffi）
+    password_bcrypt_rounds: int = 12
+    password_argon2_time_cost: int = 3
+    password_argon2_memory_cost: int = 65536  # KiB
+    password_argon2_parallelism: int = 2
+    password_hash_workers: int = 4  # 哈希计算线程数，限制每个进程同时占用的 CPU 核数
+    
+    # 限流配置（"次数/秒数"，留空关闭对应规则）
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "redis"  # redis / memory，Redis 不可用时自动退化为进程内计数
+    rate_limit_redis_timeout: float = 0.2
+    rate_limit_trust_forwarded: bool = False  # 部署在反向代理后时按 X-Forwarded-For 识别客户端
+    rate_limit_trusted_hops: int = 1  # 应用前的可信代理层数（取 X-Forwarded-For 右起第 N 个地址）
+    rate_limit_default: str = "600/60"  # 全部 API，按 IP（令牌桶）
+    rate_limit_login_ip: str = "30/60"
+    rate_limit_login_identifier: str = "10/900"  # 同一登录标识符（滑动窗口）
+    rate_limit_register_ip: str = "10/3600"
+    rate_limit_refresh_ip: str = "60/60"
+    
+    # 注册标识可用性过滤器（布隆过滤器，每类标识一个）
+    identifier_filter_capacity: int = 1000000
+    identifier_filter_error_rate: float = 0.01
+    identifier_filter_refresh_interval: int = 3600  # 定期从数据库重建（秒）
+    identifier_filter_batch_size: int = 10000
+    
+    # 运行时剖析（/api/v1/system/profiling，仅超级用户）
+    profiling_enabled: bool = True  # 关闭后不注册单请求剖析中间件与剖析接口
+    profiling_request_history: int = 50  # 保留的单请求剖析结果数
     
     # 日志配置
     log_level: str = "INFO"
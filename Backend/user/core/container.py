@@ -2,14 +2,59 @@
 依赖注入容器模块
 实现真正的依赖倒置，管理所有服务的生命周期
 """
-from typing import Dict, Any
-from user.domains.user.repositories import UserRepository, MockUserRepository
-from user.domains.user.services import UserService
+import asyncio
+import logging
+from typing import Dict, Any, Set
+from uuid import UUID
+from user.domains.user.repositories import (
+    MockRefreshTokenRepository, MockUserRepository, UserRepository
+)
+from user.domains.user.services import RefreshTokenService, UserService
 from user.application.use_cases.user.auth_use_case import AuthUseCase
-from user.infrastructure.database.postgres.repositories import PostgreSQLUserRepository
+from user.application.use_cases.user.user_admin_use_case import UserAdminUseCase
+from user.infrastructure.database.postgres.repositories import (
+    PostgreSQLRefreshTokenRepository, PostgreSQLUserRepository
+)
+from user.domains.gis.repositories import LayerRepository
+from user.domains.gis.services import FeatureQueryService, LayerService, TileService
+from user.application.use_cases.gis.tile_use_case import TileUseCase
+from user.application.use_cases.gis.feature_query_use_case import FeatureQueryUseCase
+from user.infrastructure.database.postgres.gis_repositories import (
+    PostgreSQLFeatureRepository, PostgreSQLLayerRepository, PostgreSQLTileRepository
+)
+from user.infrastructure.database.postgres.catalog import (
+    CatalogLayerRepository, SchemaCatalogService
+)
+from user.application.use_cases.gis.catalog_use_case import CatalogUseCase
+from user.domains.analysis.services import AnalysisResultService
+from user.application.use_cases.analysis.analysis_history_use_case import AnalysisHistoryUseCase
+from user.infrastructure.database.postgres.analysis_repositories import PostgreSQLAnalysisResultRepository
+from user.domains.knowledge.repositories import VectorRepository
+from user.domains.knowledge.services import KnowledgeService
+from user.application.use_cases.knowledge.knowledge_use_case import KnowledgeUseCase
+from user.infrastructure.database.vector.qdrant_client import QdrantClient
+from user.infrastructure.database.vector.vector_service import (
+    InMemoryVectorRepository, QdrantVectorRepository
+)
+from user.domains.jobs.entities import JobEntity
+from user.domains.jobs.repositories import JobRepository, MockJobRepository
+from user.domains.jobs.services import JobService
+from user.application.use_cases.jobs.job_use_case import JobUseCase
+from user.infrastructure.database.redis.job_queue import RedisJobRepository
+from user.infrastructure.jobs.handlers import JOB_HANDLERS
+from user.infrastructure.jobs.worker import JobWorker
+from user.core.cache import MemoryCache, cache
+from user.core.conditional import ProfileVersionCache
+from user.core.revocation import token_revocation
+from user.core.availability import IdentifierFilter, identifier_filter
+from user.core.config import settings
+from user.core.database import engine, get_db_session
+from user.core.security import get_password_hash_async
 from sqlalchemy.ext.asyncio import AsyncSession
 # ProfileUseCase 已废弃，移除导入与注册
 
+logger = logging.getLogger(__name__)
+
 
 class Container:
     """依赖注入容器"""
@@ -23,17 +68,60 @@ class Container:
         # 仓储层
         self._services['user_repository'] = MockUserRepository()
         
+        self._services['refresh_token_repository'] = MockRefreshTokenRepository(
+            self._services['user_repository']
+        )
+        
         # 领域服务层
         self._services['user_service'] = UserService(
-            user_repository=self._services['user_repository']
+            user_repository=self._services['user_repository'],
+            identifier_filter=identifier_filter
+        )
+        self._services['refresh_token_service'] = RefreshTokenService(
+            self._services['refresh_token_repository'],
+            expire_days=settings.refresh_token_expire_days
         )
         
         # 用例层
         self._services['auth_use_case'] = AuthUseCase(
-            user_service=self._services['user_service']
+            user_service=self._services['user_service'],
+            token_revocation=token_revocation,
+            refresh_token_service=self._services['refresh_token_service']
         )
         
         # note: profile_use_case 已移除
+        
+        # 进程级缓存（跨请求共享）
+        self._services['tile_cache'] = MemoryCache(
+            max_entries=settings.tile_cache_max_entries,
+            default_ttl=settings.tile_cache_ttl
+        )
+        self._services['layer_cache'] = MemoryCache(max_entries=1000, default_ttl=300)
+        self._services['schema_catalog'] = SchemaCatalogService(
+            engine,
+            schema=settings.sdx_schema,
+            cache_path=settings.sdx_catalog_path,
+            ttl=settings.sdx_catalog_ttl
+        )
+        
+        # 向量检索（连接池为进程级单例）
+        self._services['vector_repository'] = _create_vector_repository()
+        self._services['vector_search_cache'] = MemoryCache(
+            max_entries=settings.vector_search_cache_max_entries,
+            default_ttl=settings.vector_search_cache_ttl
+        )
+        
+        # 后台任务（队列与工作器为进程级单例，工作器在应用启动时运行）
+        self._services['job_repository'] = _create_job_repository()
+        self._services['job_worker'] = JobWorker(
+            self._services['job_repository'],
+            handlers=JOB_HANDLERS,
+            result_sink=store_job_result,
+            max_workers=settings.job_process_workers,
+            consumers=settings.job_consumers,
+            poll_interval=settings.job_poll_interval,
+            job_timeout=settings.job_timeout
+        )
     
     def get(self, service_name: str) -> Any:
         """获取服务实例"""
@@ -56,13 +144,90 @@ class Container:
         # 重新配置依赖该仓储的服务
         if repository_name == 'user_repository':
             self._services['user_service'] = UserService(
-                user_repository=repository_instance
+                user_repository=repository_instance,
+                identifier_filter=identifier_filter
+            )
+            self._services['refresh_token_repository'] = MockRefreshTokenRepository(repository_instance)
+            self._services['refresh_token_service'] = RefreshTokenService(
+                self._services['refresh_token_repository'],
+                expire_days=settings.refresh_token_expire_days
             )
             self._services['auth_use_case'] = AuthUseCase(
-                user_service=self._services['user_service']
+                user_service=self._services['user_service'],
+                token_revocation=token_revocation,
+                refresh_token_service=self._services['refresh_token_service']
             )
 
 
+def _create_vector_repository() -> VectorRepository:
+    """按配置创建向量仓储：配置了 Qdrant 地址时使用 Qdrant，否则使用进程内索引"""
+    if not settings.qdrant_url:
+        return InMemoryVectorRepository()
+    client = QdrantClient(
+        settings.qdrant_url,
+        api_key=settings.qdrant_api_key,
+        timeout=settings.qdrant_timeout,
+        max_connections=settings.qdrant_max_connections,
+        upsert_batch_size=settings.vector_upsert_batch_size,
+        upsert_concurrency=settings.vector_upsert_concurrency,
+        hnsw_ef=settings.qdrant_hnsw_ef
+    )
+    return QdrantVectorRepository(client)
+
+
+def _create_job_repository() -> JobRepository:
+    """按配置创建任务仓储"""
+    if settings.job_queue_backend == "redis":
+        return RedisJobRepository(
+            settings.redis_url,
+            job_ttl=settings.job_ttl,
+            stale_after=settings.job_timeout * 2
+        )
+    return MockJobRepository()
+
+
+async def store_job_result(job: JobEntity, result: Any) -> str:
+    """任务结果交接：存入分析结果库，返回结果ID"""
+    from uuid import UUID
+    async with get_db_session() as session:
+        analysis_result_service = build_analysis_result_service(session)
+        saved = await analysis_result_service.save_result(
+            UUID(job.user_id), job.job_type, job.params, result
+        )
+        return str(saved.id)
+
+
+async def load_user_identifiers(user_identifier_filter: IdentifierFilter) -> None:
+    """从 users 表流式构建注册标识过滤器"""
+    async with get_db_session() as session:
+        repository = build_user_repository(session)
+        await user_identifier_filter.load(
+            repository.iter_identifiers(settings.identifier_filter_batch_size)
+        )
+
+
+# /me、/profile 条件请求使用的资料版本号缓存（共享 Redis 缓存连接）
+profile_versions = ProfileVersionCache(cache, ttl=settings.profile_version_cache_ttl)
+
+_rehash_tasks: Set[asyncio.Task] = set()
+
+
+def schedule_password_rehash(user_id: UUID, password: str, old_hash: str) -> None:
+    """登录成功后在后台按当前哈希策略重新哈希密码（独立会话，失败只记录日志）"""
+    task = asyncio.create_task(_rehash_password(user_id, password, old_hash))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+async def _rehash_password(user_id: UUID, password: str, old_hash: str) -> None:
+    try:
+        new_hash = await get_password_hash_async(password)
+        async with get_db_session() as session:
+            await build_user_service(session).upgrade_password_hash(user_id, old_hash, new_hash)
+    except Exception as e:
+        logger.warning("密码哈希升级失败: %s", e)
+
+
 # 全局容器实例
 container = Container()
 
@@ -91,16 +256,169 @@ def build_user_repository(session: AsyncSession) -> UserRepository:
 def build_user_service(session: AsyncSession) -> UserService:
     """基于给定数据库会话创建用户服务。"""
     repository = build_user_repository(session)
-    return UserService(user_repository=repository)
+    return UserService(user_repository=repository, identifier_filter=identifier_filter)
+
+
+def build_refresh_token_service(session: AsyncSession) -> RefreshTokenService:
+    """基于给定数据库会话创建刷新令牌服务。"""
+    return RefreshTokenService(
+        PostgreSQLRefreshTokenRepository(session),
+        expire_days=settings.refresh_token_expire_days
+    )
 
 
 def build_auth_use_case(session: AsyncSession) -> AuthUseCase:
     """基于给定数据库会话创建认证用例。"""
     user_service = build_user_service(session)
-    # AuthUseCase 构造函数将在后续重构为依赖 UserService
-    return AuthUseCase(user_service)  # type: ignore[arg-type]
+    return AuthUseCase(
+        user_service,
+        token_revocation=token_revocation,
+        refresh_token_service=build_refresh_token_service(session),
+        password_rehasher=schedule_password_rehash,
+        profile_versions=profile_versions
+    )
+
+
+def build_user_admin_use_case(session: AsyncSession) -> UserAdminUseCase:
+    """基于给定数据库会话创建用户管理用例。"""
+    return UserAdminUseCase(build_user_service(session))
+
+
+def build_layer_repository(session: AsyncSession) -> LayerRepository:
+    """基于给定数据库会话创建图层仓储实现（目录缓存优先，缺失时实时查询 PostGIS）。"""
+    return CatalogLayerRepository(
+        container.get('schema_catalog'),
+        fallback=PostgreSQLLayerRepository(session, schema=settings.sdx_schema)
+    )
+
+
+def build_layer_service(session: AsyncSession) -> LayerService:
+    """基于给定数据库会话创建图层服务。"""
+    return LayerService(layer_repository=build_layer_repository(session))
+
+
+def build_tile_service(session: AsyncSession) -> TileService:
+    """基于给定数据库会话创建矢量切片服务。"""
+    tile_repository = PostgreSQLTileRepository(
+        session,
+        extent=settings.tile_extent,
+        buffer=settings.tile_buffer,
+        default_srid=settings.sdx_default_srid
+    )
+    return TileService(
+        layer_service=build_layer_service(session),
+        tile_repository=tile_repository,
+        min_zoom=settings.tile_min_zoom,
+        max_zoom=settings.tile_max_zoom,
+        simplify_pixels=settings.tile_simplify_pixels,
+        simplify_max_zoom=settings.tile_simplify_max_zoom
+    )
+
+
+def build_tile_use_case(session: AsyncSession) -> TileUseCase:
+    """基于给定数据库会话创建矢量切片用例。"""
+    return TileUseCase(
+        tile_service=build_tile_service(session),
+        tile_cache=container.get('tile_cache'),
+        layer_cache=container.get('layer_cache'),
+        cache_ttl=settings.tile_cache_ttl,
+        seed_max_tiles=settings.tile_seed_max_tiles
+    )
+
+
+def build_feature_query_service(session: AsyncSession) -> FeatureQueryService:
+    """基于给定数据库会话创建要素查询服务。"""
+    feature_repository = PostgreSQLFeatureRepository(
+        session,
+        default_srid=settings.sdx_default_srid,
+        precision=settings.geojson_precision,
+        batch_size=settings.feature_stream_batch_size
+    )
+    return FeatureQueryService(
+        layer_service=build_layer_service(session),
+        feature_repository=feature_repository,
+        max_limit=settings.feature_query_max_limit
+    )
+
+
+def build_feature_query_use_case(session: AsyncSession) -> FeatureQueryUseCase:
+    """基于给定数据库会话创建要素查询用例。"""
+    return FeatureQueryUseCase(
+        feature_query_service=build_feature_query_service(session),
+        default_limit=settings.feature_query_default_limit,
+        stream_max_features=settings.feature_stream_max_features
+    )
+
+
+def get_catalog_use_case() -> CatalogUseCase:
+    """获取 schema 目录用例（目录为进程级缓存，不依赖请求会话）"""
+    return CatalogUseCase(container.get('schema_catalog'))
 
 
 # def get_profile_use_case() -> ProfileUseCase:
 #     """获取资料管理用例"""
 #     return container.get('profile_use_case')
+
+
+def build_analysis_result_service(session: AsyncSession) -> AnalysisResultService:
+    """基于给定数据库会话创建分析结果服务。"""
+    repository = PostgreSQLAnalysisResultRepository(
+        session,
+        compress_threshold=settings.analysis_compress_threshold
+    )
+    return AnalysisResultService(
+        analysis_result_repository=repository,
+        ttl_seconds=settings.analysis_result_ttl,
+        max_results_per_user=settings.analysis_max_results_per_user,
+        max_history_limit=settings.analysis_history_max_limit
+    )
+
+
+async def purge_expired_analysis_results(interval: int) -> None:
+    """定期清理所有用户的过期分析结果（保存时只清理当前用户，不活跃用户的记录靠此回收）"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with get_db_session() as session:
+                purged = await build_analysis_result_service(session).purge_expired()
+            if purged:
+                logger.info("已清理过期分析结果 %d 条", purged)
+        except Exception as e:
+            logger.warning("清理过期分析结果失败: %s", e)
+
+
+def build_analysis_history_use_case(session: AsyncSession) -> AnalysisHistoryUseCase:
+    """基于给定数据库会话创建分析历史用例。"""
+    return AnalysisHistoryUseCase(
+        analysis_result_service=build_analysis_result_service(session),
+        default_limit=settings.analysis_history_default_limit
+    )
+
+
+def get_knowledge_use_case() -> KnowledgeUseCase:
+    """获取知识库检索用例（向量仓储与检索缓存为进程级单例）"""
+    knowledge_service = KnowledgeService(
+        vector_repository=container.get('vector_repository'),
+        search_cache=container.get('vector_search_cache'),
+        generation_cache=cache,
+        cache_ttl=settings.vector_search_cache_ttl,
+        max_limit=settings.vector_search_max_limit
+    )
+    return KnowledgeUseCase(knowledge_service)
+
+
+def get_job_use_case() -> JobUseCase:
+    """获取后台任务用例（不访问数据库的查询、取消与进度推送）"""
+    job_service = JobService(
+        job_repository=container.get('job_repository'),
+        job_types=list(JOB_HANDLERS),
+        max_active_per_user=settings.job_max_active_per_user
+    )
+    return JobUseCase(job_service, event_interval=settings.job_poll_interval)
+
+
+def build_job_use_case(session: AsyncSession) -> JobUseCase:
+    """基于给定数据库会话创建后台任务用例（提交时复用已保存的分析结果）。"""
+    job_use_case = get_job_use_case()
+    job_use_case.analysis_result_service = build_analysis_result_service(session)
+    return job_use_case
@@ -2,22 +2,70 @@
 数据库连接管理
 """
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Tuple
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from user.core.config import settings
+from user.core.deadline import instrument_deadlines
+from user.core.pool_metrics import InstrumentedAsyncPool, pool_metrics
+from user.core.query_metrics import instrument_engine
+
+
+def pool_limits(connection_budget: int, workers: int) -> Tuple[int, int]:
+    """每个工作进程的 (pool_size, max_overflow)
+
+    connection_budget > 0 时按进程数均分总连接数，常驻连接不超过 DB_POOL_SIZE，其余作为溢出，
+    保证 进程数 × (pool_size + max_overflow) 不超过预算；否则直接使用 DB_POOL_SIZE / DB_MAX_OVERFLOW。
+    """
+    if connection_budget <= 0:
+        return settings.db_pool_size, settings.db_max_overflow
+    per_worker = max(1, connection_budget // max(1, workers))
+    pool_size = min(settings.db_pool_size, per_worker)
+    return pool_size, per_worker - pool_size
+
+
+def _engine_options() -> Dict[str, Any]:
+    """连接池与驱动参数
+
+    PgBouncer（事务池模式）下连接会在事务间切换后端，需关闭预编译语句缓存并使用唯一语句名，
+    且由 PgBouncer 负责连接健康检查，不再 pre-ping。
+    """
+    connect_args: Dict[str, Any] = {
+        # 每个连接缓存的预编译语句数（SQLAlchemy asyncpg 适配层）
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size
+    }
+    pre_ping = settings.db_pool_pre_ping
+    if settings.db_pgbouncer:
+        connect_args.update(
+            prepared_statement_cache_size=0,
+            statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__"
+        )
+        pre_ping = False
+    pool_size, max_overflow = pool_limits(settings.db_connection_budget, settings.worker_count)
+    return {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": pre_ping,
+        "query_cache_size": settings.db_query_cache_size,
+        "connect_args": connect_args,
+    }
 
 
 # 数据库引擎
-# 注意: 不包含自动建表功能，表结构由用户手动制作
+# 注意: 不包含自动建表功能，表结构由 Alembic 迁移管理（Backend 目录下执行 alembic upgrade head）
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600
+    **_engine_options()
 )
+pool_metrics.attach(engine.sync_engine.pool)
+instrument_engine(engine.sync_engine)
+instrument_deadlines(engine.sync_engine, Session)
 
 # 会话工厂
 AsyncSessionLocal = async_sessionmaker(
@@ -0,0 +1,155 @@
+"""
+请求截止时间
+
+- 路由以 @request_timeout(seconds) 声明处理时限（未声明时使用 REQUEST_TIMEOUT_DEFAULT），
+  客户端可用 X-Request-Timeout（秒）缩短时限，不能延长；
+- 会话开启事务时按剩余时间执行 SET LOCAL statement_timeout，数据库在截止前主动取消语句；
+- 到期时取消路由处理（等待中的查询、密码哈希、Redis 调用等），返回 504，会话随异常回滚；
+- 按路由统计请求数、超时数与语句超时数，见 GET /health/timeouts。
+"""
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from user.core.config import settings
+
+TIMEOUT_HEADER = "x-request-timeout"
+STATEMENT_TIMEOUT_SQLSTATE = "57014"  # query_canceled
+_STATEMENT_MARGIN = 0.05  # 语句超时比截止时间提前的秒数，让数据库先于任务取消结束语句
+
+
+class Deadline:
+    """单个请求的截止时间"""
+
+    __slots__ = ("expires_at", "finished", "statement_timeouts")
+
+    def __init__(self, timeout: float):
+        self.expires_at = time.monotonic() + timeout
+        self.finished = False
+        self.statement_timeouts = 0
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def request_timeout(seconds: float) -> Callable:
+    """声明路由的处理时限（秒）"""
+
+    def decorator(func: Callable) -> Callable:
+        func.__request_timeout__ = seconds
+        return func
+
+    return decorator
+
+
+def current_deadline() -> Optional[Deadline]:
+    """当前请求仍在处理中的截止时间（请求结束后派生的后台任务不受约束）"""
+    deadline = _current.get()
+    return deadline if deadline is not None and not deadline.finished else None
+
+
+def _client_timeout(request: Request) -> Optional[float]:
+    value = request.headers.get(TIMEOUT_HEADER)
+    try:
+        timeout = float(value) if value else None
+    except ValueError:
+        return None
+    return timeout if timeout is not None and timeout > 0 else None
+
+
+class DeadlineMetrics:
+    """按路由统计超时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes: Dict[str, Dict[str, int]] = defaultdict(
+                lambda: {"requests": 0, "timeouts": 0, "statement_timeouts": 0}
+            )
+
+    def record(self, route: str, timed_out: bool, statement_timeouts: int) -> None:
+        with self._lock:
+            stats = self.routes[route]
+            stats["requests"] += 1
+            stats["timeouts"] += int(timed_out)
+            stats["statement_timeouts"] += statement_timeouts
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                route: {**stats, "timeout_rate": round(stats["timeouts"] / stats["requests"], 4)}
+                for route, stats in self.routes.items()
+            }
+
+
+deadline_metrics = DeadlineMetrics()
+
+
+def with_deadline(handler: Callable, route: str, timeout: Optional[float]) -> Callable:
+    """为路由处理函数加上截止时间（timeout 为空时使用默认时限，默认时限为 0 表示不限）"""
+    timeout = timeout if timeout is not None else settings.request_timeout_default
+
+    async def app(request: Request) -> Any:
+        limit = _client_timeout(request)
+        limit = min(limit, timeout) if limit and timeout else (limit or timeout)
+        if not limit:
+            return await handler(request)
+
+        deadline = Deadline(limit)
+        token = _current.set(deadline)
+        timed_out = False
+        try:
+            return await asyncio.wait_for(handler(request), limit)
+        except asyncio.TimeoutError:
+            timed_out = True
+        except HTTPException as e:
+            # 语句超时被路由的通用异常处理转成了 500，这里还原为 504
+            if not (deadline.statement_timeouts and e.status_code >= 500):
+                raise
+            timed_out = True
+        finally:
+            deadline.finished = True
+            _current.reset(token)
+            deadline_metrics.record(route, timed_out, deadline.statement_timeouts)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="请求处理超时，请稍后重试"
+        )
+
+    return app
+
+
+def _after_begin(session: Any, transaction: Any, connection: Any) -> None:
+    deadline = current_deadline()
+    if deadline is None:
+        return
+    milliseconds = max(1, int((deadline.remaining() - _STATEMENT_MARGIN) * 1000))
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {milliseconds}",
+        execution_options={"query_metrics": False}
+    )
+
+
+def _handle_error(context: Any) -> None:
+    deadline = current_deadline()
+    if deadline is not None and getattr(context.original_exception, "sqlstate", None) == STATEMENT_TIMEOUT_SQLSTATE:
+        deadline.statement_timeouts += 1
+
+
+def instrument_deadlines(engine: Engine, session_class: type) -> None:
+    """事务开始时下发语句超时，并识别语句超时错误（传入同步引擎与同步会话类）"""
+    event.listen(session_class, "after_begin", _after_begin)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,149 @@
+"""
+数据库连接池观测
+
+通过连接池事件与签出计时记录：
+- 签出等待时间（含池满排队与新建连接）、等待超时次数；
+- 连接占用时长（签出到归还）、溢出连接使用峰值；
+- 连接生命周期（建立到关闭/失效）。
+snapshot() 返回当前统计，用于 /health/pool 与连接池调优基准。
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+_SAMPLES = 1000  # 分位数统计保留的最近样本数
+
+
+def _summary(samples: Iterable[float]) -> Dict[str, float]:
+    values = sorted(samples)
+    if not values:
+        return {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    return {
+        "avg_ms": round(sum(values) / len(values) * 1000, 3),
+        "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+class PoolMetrics:
+    """连接池统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checked_out = 0
+            self.connects = 0
+            self.closes = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.overflow_checkouts = 0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+            self.wait: Deque[float] = deque(maxlen=_SAMPLES)
+            self.hold: Deque[float] = deque(maxlen=_SAMPLES)
+            self.lifetime: Deque[float] = deque(maxlen=_SAMPLES)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait.append(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, pool: Pool) -> None:
+        """注册连接池事件"""
+
+        @event.listens_for(pool, "connect")
+        def on_connect(dbapi_connection: Any, record: Any) -> None:
+            record.info["connected_at"] = time.monotonic()
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(pool, "checkout")
+        def on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+            record.info["checked_out_at"] = time.monotonic()
+            overflow = max(0, pool.overflow()) if hasattr(pool, "overflow") else 0
+            with self._lock:
+                self.checkouts += 1
+                self.checked_out += 1
+                self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+                self.peak_overflow = max(self.peak_overflow, overflow)
+                if overflow > 0:
+                    self.overflow_checkouts += 1
+
+        @event.listens_for(pool, "checkin")
+        def on_checkin(dbapi_connection: Any, record: Any) -> None:
+            started = record.info.pop("checked_out_at", None)
+            with self._lock:
+                self.checked_out = max(0, self.checked_out - 1)
+                if started is not None:
+                    self.hold.append(time.monotonic() - started)
+
+        def on_close(dbapi_connection: Any, record: Any, *args: Any) -> None:
+            connected_at = record.info.pop("connected_at", None)
+            with self._lock:
+                self.closes += 1
+                if connected_at is not None:
+                    self.lifetime.append(time.monotonic() - connected_at)
+
+        def on_invalidate(dbapi_connection: Any, record: Any, exception: Any) -> None:
+            with self._lock:
+                self.invalidations += 1
+
+        event.listen(pool, "close", on_close)
+        event.listen(pool, "invalidate", on_invalidate)
+        event.listen(pool, "soft_invalidate", on_invalidate)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """当前统计（含连接池实时状态）"""
+        with self._lock:
+            data: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "overflow_checkouts": self.overflow_checkouts,
+                "peak_overflow": self.peak_overflow,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "checkout_wait": _summary(self.wait),
+                "hold_time": _summary(self.hold),
+                "connection_lifetime": _summary(self.lifetime),
+            }
+        if hasattr(pool, "size"):
+            data["pool"] = {
+                "size": pool.size(),
+                "max_overflow": getattr(pool, "_max_overflow", 0),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        return data
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """记录签出等待时间的异步队列连接池"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+# 全局连接池统计
+pool_metrics = PoolMetrics()
+InstrumentedAsyncPool.metrics = pool_metrics
@@ -0,0 +1,423 @@
+"""
+运行时性能剖析（超级用户接口 /api/v1/system/profiling 使用，无需重启工作进程）
+
+- 采样剖析：后台线程按固定间隔读取所有线程的调用栈（sys._current_frames），
+  按栈计数，输出 collapsed stacks 文本（flamegraph.pl / speedscope 可直接读取）；
+  不开启时无任何开销，开启后每次采样约数十微秒。
+- 单请求剖析：管理员签发一次性令牌，请求携带 X-Profile: <令牌> 时只记录该请求的调用。
+  剖析回调以 ContextVar 区分请求，事件循环上并发执行的其它请求不计入；
+  协程挂起期间不计时，结果即该请求在事件循环上占用的 CPU 时间（线程池中的调用见采样剖析）。
+  令牌与结果存于 Redis，任一工作进程签发的令牌可在其它进程使用、结果可从任一进程读取；
+  Redis 不可用时仅在本进程内有效。令牌无效时响应头 X-Profile-Status: invalid-token。
+- 内存快照：按需开启 tracemalloc，记录基线后与当前快照比较，输出增长最多的 N 个位置。
+
+采样剖析与内存快照为各工作进程独立的状态，结果中带进程号。
+"""
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from user.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_STACK_DEPTH = 64
+
+TOKEN_KEY_PREFIX = "profiling:token:"
+RESULT_KEY_PREFIX = "profiling:result:"
+RESULTS_KEY = "profiling:results"
+
+# 校验并消耗一次令牌（剩余 1 次时删除，否则递减；DECR 保留过期时间）
+_CONSUME_SCRIPT = """
+local uses = tonumber(redis.call('GET', KEYS[1]) or '0')
+if uses <= 0 then
+    return 0
+end
+if uses <= 1 then
+    redis.call('DEL', KEYS[1])
+else
+    redis.call('DECR', KEYS[1])
+end
+return 1
+"""
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """统计采样剖析器（进程内单例，运行时启停）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.interval = 0.01
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 0.01) -> bool:
+        """开始采样（interval 秒），已在运行时返回 False"""
+        if self.running:
+            return False
+        self.interval = interval
+        self.reset()
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        if not self.running:
+            return False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stacks = Counter()
+            self.samples = 0
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            collected = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                collected.append(";".join(reversed(stack)))
+            with self._lock:
+                self.stacks.update(collected)
+                self.samples += 1
+
+    def collapsed(self) -> str:
+        """collapsed stacks 文本：每行 "根;...;叶 次数" """
+        with self._lock:
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "running": self.running,
+                "interval_ms": round(self.interval * 1000, 3),
+                "samples": self.samples,
+                "distinct_stacks": len(self.stacks),
+                "started_at": self.started_at,
+            }
+
+
+class _RequestTrace:
+    """单个请求的调用计时（按函数汇总自身耗时与累计耗时）"""
+
+    __slots__ = ("id", "path", "started_at", "stack", "stats", "elapsed")
+
+    def __init__(self, path: str):
+        self.id = secrets.token_hex(8)
+        self.path = path
+        self.started_at = time.time()
+        self.stack: List[List[Any]] = []  # [标签, 开始时间, 子调用耗时]
+        self.stats: Dict[str, List[float]] = {}  # 标签 -> [调用次数, 自身耗时, 累计耗时]
+        self.elapsed = 0.0
+
+    def enter(self, label: str, now: float) -> None:
+        self.stack.append([label, now, 0.0])
+
+    def leave(self, now: float) -> None:
+        if not self.stack:
+            return
+        label, started, children = self.stack.pop()
+        total = now - started
+        entry = self.stats.setdefault(label, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += total - children
+        entry[2] += total
+        if self.stack:
+            self.stack[-1][2] += total
+
+    def report(self, limit: int) -> Dict[str, Any]:
+        rows = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return {
+            "id": self.id,
+            "pid": os.getpid(),
+            "path": self.path,
+            "started_at": self.started_at,
+            "wall_ms": round(self.elapsed * 1000, 3),
+            "cpu_on_loop_ms": round(sum(entry[1] for entry in self.stats.values()) * 1000, 3),
+            "functions": [
+                {
+                    "function": label,
+                    "calls": int(calls),
+                    "self_ms": round(own * 1000, 3),
+                    "cumulative_ms": round(total * 1000, 3),
+                }
+                for label, (calls, own, total) in rows
+            ],
+        }
+
+
+_current_trace: ContextVar[Optional[_RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def _profile_event(frame: Any, event: str, arg: Any) -> None:
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    now = time.perf_counter()
+    if event == "call":
+        trace.enter(_frame_label(frame.f_code), now)
+    elif event == "c_call":
+        trace.enter(f"{getattr(arg, '__qualname__', repr(arg))} (builtin)", now)
+    else:  # return / c_return / c_exception
+        trace.leave(now)
+
+
+class RequestProfiler:
+    """单请求剖析：令牌签发、剖析回调启停与结果保存（Redis 共享，不可用时仅本进程）"""
+
+    def __init__(self, history: int = 50, result_ttl: int = 86400):
+        self._tokens: Dict[str, Tuple[int, float]] = {}  # 令牌 -> (剩余次数, 过期时间)
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.history = history
+        self.result_ttl = result_ttl
+        self._active = 0
+        self._redis: Optional[redis.Redis] = None
+        self._consume_script: Any = None
+
+    async def start(self) -> None:
+        """连接 Redis（失败时令牌与结果仅在本进程内有效）"""
+        try:
+            self._redis = redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+            await self._redis.ping()
+            self._consume_script = self._redis.register_script(_CONSUME_SCRIPT)
+        except Exception as e:
+            logger.warning("剖析器无法连接 Redis，令牌与结果仅在本进程内有效: %s", e)
+            await self.stop()
+
+    async def stop(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def issue_token(self, uses: int = 1, ttl: int = 600) -> str:
+        token = secrets.token_urlsafe(16)
+        if self._redis is not None:
+            try:
+                await self._redis.set(TOKEN_KEY_PREFIX + token, uses, ex=ttl)
+                return token
+            except Exception as e:
+                logger.warning("剖析令牌写入 Redis 失败，仅在本进程内有效: %s", e)
+        self._tokens[token] = (uses, time.monotonic() + ttl)
+        return token
+
+    async def consume(self, token: str) -> bool:
+        """校验并消耗一次令牌"""
+        if self._consume_local(token):
+            return True
+        if self._redis is None:
+            return False
+        try:
+            return bool(await self._consume_script(keys=[TOKEN_KEY_PREFIX + token]))
+        except Exception as e:
+            logger.warning("剖析令牌校验失败: %s", e)
+            return False
+
+    def _consume_local(self, token: str) -> bool:
+        item = self._tokens.get(token)
+        if item is None:
+            return False
+        uses, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._tokens[token]
+            return False
+        if uses <= 1:
+            del self._tokens[token]
+        else:
+            self._tokens[token] = (uses - 1, expires_at)
+        return True
+
+    def begin(self, path: str) -> _RequestTrace:
+        """在当前上下文开始剖析（须在请求所在的事件循环线程调用）"""
+        trace = _RequestTrace(path)
+        _current_trace.set(trace)
+        if self._active == 0:
+            sys.setprofile(_profile_event)
+        self._active += 1
+        trace.elapsed = time.perf_counter()
+        return trace
+
+    async def end(self, trace: _RequestTrace, limit: int = 50) -> None:
+        trace.elapsed = time.perf_counter() - trace.elapsed
+        _current_trace.set(None)
+        self._active -= 1
+        if self._active == 0:
+            sys.setprofile(None)
+        report = trace.report(limit)
+        self._results[trace.id] = report
+        while len(self._results) > self.history:
+            self._results.popitem(last=False)
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.set(RESULT_KEY_PREFIX + trace.id, json.dumps(report, ensure_ascii=False), ex=self.result_ttl)
+                    pipe.lpush(RESULTS_KEY, trace.id)
+                    pipe.ltrim(RESULTS_KEY, 0, self.history - 1)
+                    pipe.expire(RESULTS_KEY, self.result_ttl)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning("剖析结果写入 Redis 失败，仅在本进程内可读: %s", e)
+
+    async def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        result = self._results.get(profile_id)
+        if result is not None or self._redis is None:
+            return result
+        try:
+            raw = await self._redis.get(RESULT_KEY_PREFIX + profile_id)
+        except Exception as e:
+            logger.warning("剖析结果读取失败: %s", e)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def recent(self) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = list(reversed(self._results.values()))
+        if self._redis is not None:
+            try:
+                ids = await self._redis.lrange(RESULTS_KEY, 0, self.history - 1)
+                raws = await self._redis.mget([RESULT_KEY_PREFIX + profile_id for profile_id in ids]) if ids else []
+                results = [json.loads(raw) for raw in raws if raw]
+            except Exception as e:
+                logger.warning("剖析结果读取失败，仅返回本进程结果: %s", e)
+        return [
+            {key: result[key] for key in ("id", "pid", "path", "started_at", "wall_ms", "cpu_on_loop_ms")}
+            for result in results
+        ]
+
+
+class MemoryProfiler:
+    """tracemalloc 快照对比"""
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    def start(self, frames: int = 1) -> bool:
+        if tracemalloc.is_tracing():
+            return False
+        tracemalloc.start(frames)
+        self._baseline = tracemalloc.take_snapshot()
+        return True
+
+    def stop(self) -> bool:
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.stop()
+        self._baseline = None
+        return True
+
+    def mark(self) -> None:
+        """记录新的基线快照"""
+        if not tracemalloc.is_tracing():
+            raise ValueError("内存追踪未开启")
+        self._baseline = tracemalloc.take_snapshot()
+
+    def diff(self, limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """当前快照相对基线增长最多的位置"""
+        if not tracemalloc.is_tracing() or self._baseline is None:
+            raise ValueError("内存追踪未开启")
+        current = tracemalloc.take_snapshot()
+        stats = current.compare_to(self._baseline, group_by)[:limit]
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "pid": os.getpid(),
+            "traced_kib": round(traced / 1024, 1),
+            "peak_kib": round(peak / 1024, 1),
+            "top": [
+                {
+                    "location": str(stat.traceback).strip(),
+                    "size_kib": round(stat.size / 1024, 1),
+                    "size_diff_kib": round(stat.size_diff / 1024, 1),
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats
+            ],
+        }
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "pid": os.getpid(),
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_kib": round(traced / 1024, 1),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+
+class RequestProfileMiddleware:
+    """携带有效 X-Profile 令牌的请求进行单请求剖析，响应头返回 X-Profile-Id"""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = next((value for key, value in scope["headers"] if key == b"x-profile"), None)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if not await self.profiler.consume(token.decode("latin-1")):
+            # 令牌未知、已用完或过期：照常处理请求，响应头提示未剖析
+            async def send_with_status(message) -> None:
+                if message["type"] == "http.response.start":
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-profile-status", b"invalid-token")]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+            return
+
+        trace = self.profiler.begin(scope["path"])
+
+        async def send_with_profile_id(message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", trace.id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await self.profiler.end(trace)
+
+
+# 全局剖析器实例
+sampling_profiler = SamplingProfiler()
+request_profiler = RequestProfiler(settings.profiling_request_history)
+memory_profiler = MemoryProfiler()
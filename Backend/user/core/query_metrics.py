@@ -0,0 +1,143 @@
+"""
+SQL 语句计数与慢查询日志
+
+- 引擎事件统计每个请求执行的语句数与数据库耗时（按请求上下文隔离），
+  响应头返回 X-DB-Queries 与 Server-Timing；
+- 超过 DB_SLOW_QUERY_MS 的语句记录日志，只输出参数的类型结构，不输出参数值；
+- 路由可用 @query_budget(n) 声明语句数上限：超出时记录警告，
+  DB_QUERY_BUDGET_STRICT=true（测试环境）时直接抛出 QueryBudgetExceeded 使请求失败。
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from user.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_PREVIEW = 500
+
+
+class QueryBudgetExceeded(AssertionError):
+    """请求执行的 SQL 语句数超过路由声明的上限"""
+
+
+class QueryStats:
+    """单个请求的语句统计"""
+
+    __slots__ = ("count", "total_time", "scope", "budget_reported")
+
+    def __init__(self, scope: Optional[Dict[str, Any]] = None):
+        self.count = 0
+        self.total_time = 0.0
+        self.scope = scope
+        self.budget_reported = False
+
+    @property
+    def budget(self) -> Optional[int]:
+        endpoint = self.scope.get("endpoint") if self.scope else None
+        budget = getattr(endpoint, "__query_budget__", None)
+        return budget if budget is not None else settings.db_query_default_budget
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """声明路由允许执行的 SQL 语句数上限"""
+
+    def decorator(func: Callable) -> Callable:
+        func.__query_budget__ = max_queries
+        return func
+
+    return decorator
+
+
+def track_queries(scope: Optional[Dict[str, Any]] = None) -> QueryStats:
+    """在当前上下文开始统计（中间件与测试使用）"""
+    stats = QueryStats(scope)
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """参数的类型结构（不含值），用于慢查询日志"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"executemany": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    if elapsed * 1000 >= settings.db_slow_query_ms:
+        logger.warning(
+            "慢查询 %.1fms: %s | 参数: %s",
+            elapsed * 1000, statement[:_STATEMENT_PREVIEW], parameter_shape(parameters)
+        )
+
+    stats = _current.get()
+    if stats is None or (context is not None and not context.execution_options.get("query_metrics", True)):
+        # 框架附加的语句（如 SET LOCAL statement_timeout）不计入路由的语句数
+        return
+    stats.count += 1
+    stats.total_time += elapsed
+    budget = stats.budget
+    if budget is None or stats.count <= budget or stats.budget_reported:
+        return
+    stats.budget_reported = True
+    endpoint = stats.scope.get("path") if stats.scope else None
+    message = f"{endpoint} 执行了 {stats.count} 条 SQL，超过上限 {budget}"
+    if settings.db_query_budget_strict:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """注册语句计数与慢查询事件（传入同步引擎，异步引擎使用 engine.sync_engine）"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryMetricsMiddleware:
+    """按请求统计 SQL 语句数与耗时，并写入响应头"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = track_queries(scope)
+
+        async def send_with_metrics(message) -> None:
+            if message["type"] == "http.response.start" and stats.count:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.total_time * 1000:.1f};desc="{stats.count} queries"'.encode()
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current.set(None)
@@ -0,0 +1,386 @@
+"""
+请求限流
+
+在 ASGI 层（路由、数据库会话与密码校验之前）按规则拦截超限请求：
+- 令牌桶：允许短时突发、长期平均速率受限，适合按 IP 的通用限流；
+- 滑动窗口：窗口内精确计数，适合按登录标识符限制尝试次数。
+计数存于 Redis（Lua 脚本原子执行，多实例共享）；Redis 不可用时退化为进程内计数。
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+
+from user.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+TOKEN_BUCKET = "token_bucket"
+SLIDING_WINDOW = "sliding_window"
+
+# 令牌桶：按流逝时间补充令牌，足够则扣减；返回 {是否放行, 剩余令牌, 需等待毫秒}
+_TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local capacity = tonumber(ARGV[1])
+local rate = capacity / tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, math.floor(tokens), wait}
+"""
+
+# 滑动窗口日志：清理窗口外记录后计数，未超限则记录本次请求
+_SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, 0, tonumber(oldest[2]) + window - now}
+end
+redis.call('ZADD', KEYS[1], now, now .. '-' .. ARGV[3])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, limit - count - 1, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """限流规则
+
+    path 以 * 结尾时按前缀匹配；key 为 ip 或 identifier（取 JSON 请求体中的 identifier_field）。
+    """
+    name: str
+    path: str
+    limit: int
+    window: int  # 秒
+    methods: Tuple[str, ...] = ("POST",)
+    key: str = "ip"
+    algorithm: str = TOKEN_BUCKET
+    identifier_field: str = "login_identifier"
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        if self.path.endswith("*"):
+            return path.startswith(self.path[:-1])
+        return path == self.path
+
+    @classmethod
+    def parse(cls, name: str, path: str, spec: str, **kwargs: Any) -> Optional["RateLimitRule"]:
+        """由 "次数/秒数" 形式的配置创建规则，配置为空时返回 None"""
+        if not spec:
+            return None
+        limit, _, window = spec.partition("/")
+        return cls(name=name, path=path, limit=int(limit), window=int(window or 60), **kwargs)
+
+
+@dataclass
+class RateLimitResult:
+    """单条规则的判定结果"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # 秒
+
+
+class MemoryRateLimitBackend:
+    """进程内限流计数（LRU 限制键数量）"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()  # key -> [tokens, ts]
+        self._windows: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _remember(self, table: OrderedDict, key: str, factory) -> Any:
+        value = table.get(key)
+        if value is None:
+            value = table[key] = factory()
+            if len(table) > self.max_keys:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return value
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        now = time.monotonic()
+        if rule.algorithm == SLIDING_WINDOW:
+            log = self._remember(self._windows, key, deque)
+            while log and log[0] <= now - rule.window:
+                log.popleft()
+            if len(log) >= rule.limit:
+                return RateLimitResult(False, rule.limit, 0, log[0] + rule.window - now)
+            log.append(now)
+            return RateLimitResult(True, rule.limit, rule.limit - len(log))
+
+        rate = rule.limit / rule.window
+        bucket = self._remember(self._buckets, key, lambda: [float(rule.limit), now])
+        tokens = min(rule.limit, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return RateLimitResult(True, rule.limit, int(bucket[0]))
+        bucket[0] = tokens
+        return RateLimitResult(False, rule.limit, 0, (1 - tokens) / rate)
+
+
+class RedisRateLimitBackend:
+    """Redis 限流计数（Lua 脚本原子执行）"""
+
+    def __init__(self, client: redis.Redis):
+        self._redis = client
+        self._token_bucket = client.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._sliding_window = client.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._seq = 0
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        window_ms = rule.window * 1000
+        if rule.algorithm == SLIDING_WINDOW:
+            self._seq += 1
+            allowed, remaining, wait = await self._sliding_window(
+                keys=[key], args=[rule.limit, window_ms, f"{id(self)}:{self._seq}"]
+            )
+        else:
+            allowed, remaining, wait = await self._token_bucket(keys=[key], args=[rule.limit, window_ms])
+        return RateLimitResult(bool(allowed), rule.limit, int(remaining), int(wait) / 1000)
+
+
+class RateLimiter:
+    """限流器：按规则计数，Redis 故障时临时切换到进程内计数"""
+
+    def __init__(
+        self,
+        rules: Sequence[RateLimitRule],
+        redis_url: Optional[str] = None,
+        redis_timeout: float = 0.2,
+        retry_interval: float = 30.0,
+        max_local_keys: int = 100000
+    ):
+        self.rules = list(rules)
+        self.redis_url = redis_url
+        self.redis_timeout = redis_timeout
+        self.retry_interval = retry_interval
+        self._local = MemoryRateLimitBackend(max_local_keys)
+        self._redis: Optional[redis.Redis] = None
+        self._remote: Optional[RedisRateLimitBackend] = None
+        self._remote_down_until = 0.0
+
+    @property
+    def needs_identifier(self) -> bool:
+        return any(rule.key == "identifier" for rule in self.rules)
+
+    async def start(self) -> None:
+        """连接 Redis（未配置或不可用时仅使用进程内计数）"""
+        if not self.redis_url:
+            return
+        try:
+            self._redis = redis.from_url(
+                self.redis_url,
+                socket_timeout=self.redis_timeout,
+                socket_connect_timeout=self.redis_timeout
+            )
+            await self._redis.ping()
+            self._remote = RedisRateLimitBackend(self._redis)
+        except Exception as e:
+            logger.warning("限流器无法连接 Redis，使用进程内计数: %s", e)
+            await self.stop()
+
+    async def stop(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+        self._redis = None
+        self._remote = None
+
+    def match(self, method: str, path: str) -> List[RateLimitRule]:
+        """返回适用于该请求的规则"""
+        return [rule for rule in self.rules if rule.matches(method, path)]
+
+    @staticmethod
+    def _key(rule: RateLimitRule, value: str) -> str:
+        # 标识符取哈希，避免在 Redis 中留存用户名/邮箱明文
+        if rule.key == "identifier":
+            value = hashlib.sha1(value.strip().lower().encode("utf-8")).hexdigest()
+        return f"{RATE_LIMIT_KEY_PREFIX}{rule.name}:{value}"
+
+    async def _hit(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        if self._remote is not None and time.monotonic() >= self._remote_down_until:
+            try:
+                return await self._remote.hit(key, rule)
+            except Exception as e:
+                logger.warning("限流 Redis 调用失败，%ss 内使用进程内计数: %s", self.retry_interval, e)
+                self._remote_down_until = time.monotonic() + self.retry_interval
+        return await self._local.hit(key, rule)
+
+    async def check(
+        self,
+        rules: Sequence[RateLimitRule],
+        client_ip: str,
+        identifier: Optional[str] = None
+    ) -> Optional[RateLimitResult]:
+        """逐条规则计数，返回第一条超限规则的结果；全部放行时返回 None"""
+        hits = []
+        for rule in rules:
+            value = identifier if rule.key == "identifier" else client_ip
+            if not value:
+                continue
+            hits.append(self._hit(self._key(rule, value), rule))
+        for result in await asyncio.gather(*hits):
+            if not result.allowed:
+                return result
+        return None
+
+
+def _client_ip(scope: Dict[str, Any], trust_forwarded: bool, trusted_hops: int = 1) -> str:
+    """客户端 IP：信任代理时从 X-Forwarded-For 右侧跳过 trusted_hops - 1 个代理追加的地址
+
+    最左侧的条目由客户端自行填写，不能作为限流键；每层可信代理在右侧追加其上游地址。
+    """
+    client = scope.get("client")
+    peer = client[0] if client else ""
+    if not trust_forwarded:
+        return peer
+    entries = [
+        entry.strip()
+        for name, value in scope.get("headers") or ()
+        if name == b"x-forwarded-for"
+        for entry in value.decode("latin-1").split(",")
+        if entry.strip()
+    ]
+    if not entries:
+        return peer
+    return entries[-min(max(trusted_hops, 1), len(entries))]
+
+
+def _extract_identifier(body: bytes, field: str) -> Optional[str]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    value = payload.get(field) if isinstance(payload, dict) else None
+    return value if isinstance(value, str) else None
+
+
+class RateLimitMiddleware:
+    """限流中间件（纯 ASGI，不经过路由与依赖注入）"""
+
+    def __init__(
+        self,
+        app,
+        limiter: RateLimiter,
+        trust_forwarded: bool = False,
+        trusted_hops: int = 1,
+        max_body_size: int = 65536
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.trust_forwarded = trust_forwarded
+        self.trusted_hops = trusted_hops
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rules = self.limiter.match(scope["method"], scope["path"])
+        if not rules:
+            await self.app(scope, receive, send)
+            return
+
+        identifier = None
+        identifier_rules = [rule for rule in rules if rule.key == "identifier"]
+        if identifier_rules:
+            # 读取请求体以取得登录标识符，随后原样回放给下游
+            body, more_body = b"", True
+            while more_body and len(body) <= self.max_body_size:
+                message = await receive()
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+            identifier = _extract_identifier(body, identifier_rules[0].identifier_field)
+            receive = _replay(body, more_body, receive)
+
+        blocked = await self.limiter.check(rules, _client_ip(scope, self.trust_forwarded, self.trusted_hops), identifier)
+        if blocked is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = max(1, math.ceil(blocked.retry_after))
+        content = json.dumps({
+            "success": False,
+            "message": "请求过于频繁，请稍后重试",
+            "error_code": 429
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(content)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                (b"x-ratelimit-limit", str(blocked.limit).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": content})
+
+
+def _replay(body: bytes, more_body: bool, receive):
+    """构造先返回已读取请求体、再继续读取剩余部分的 receive"""
+    sent = False
+
+    async def wrapped():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": more_body}
+        return await receive()
+
+    return wrapped
+
+
+def build_default_rules(prefix: str) -> List[RateLimitRule]:
+    """根据配置生成默认规则（认证接口按 IP 与登录标识符限流，其余接口按 IP 限流）"""
+    rules = [
+        RateLimitRule.parse("login_ip", f"{prefix}/user/login", settings.rate_limit_login_ip),
+        RateLimitRule.parse(
+            "login_identifier", f"{prefix}/user/login", settings.rate_limit_login_identifier,
+            key="identifier", algorithm=SLIDING_WINDOW
+        ),
+        RateLimitRule.parse("register_ip", f"{prefix}/user/register", settings.rate_limit_register_ip),
+        RateLimitRule.parse("refresh_ip", f"{prefix}/user/refresh", settings.rate_limit_refresh_ip),
+        RateLimitRule.parse(
+            "api_ip", f"{prefix}/*", settings.rate_limit_default,
+            methods=("GET", "POST", "PUT", "PATCH", "DELETE")
+        ),
+    ]
+    return [rule for rule in rules if rule is not None]
+
+
+# 全局限流器实例
+rate_limiter = RateLimiter(
+    build_default_rules(settings.api_v1_prefix),
+    redis_url=settings.redis_url if settings.rate_limit_backend == "redis" else None,
+    redis_timeout=settings.rate_limit_redis_timeout
+)
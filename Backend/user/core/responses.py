@@ -0,0 +1,81 @@
+"""
+JSON 响应编码
+
+- FastJSONResponse：orjson 编码（未安装时退回标准库），作为应用默认响应类；
+- FastJSONRoute：端点返回 dict/list 时直接编码输出，跳过响应模型的二次校验与 jsonable_encoder。
+  response_model 仍用于 OpenAPI 文档，用例层返回的字典结构需与之保持一致；
+  路由处理（依赖解析与端点）受 @request_timeout 截止时间约束。
+"""
+import asyncio
+import functools
+import json
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from user.core.deadline import with_deadline
+
+try:
+    import orjson  # type: ignore
+except Exception:  # 未安装 orjson 时退回标准库
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """orjson 不支持的类型（pydantic 模型、Decimal 等）交给 jsonable_encoder"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+
+def json_dumps(content: Any) -> bytes:
+    """紧凑 JSON 编码（优先 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=_default
+        )
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 编码的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """返回 dict/list 的端点直接输出 FastJSONResponse 的路由"""
+
+    def get_route_handler(self) -> Callable:
+        call = self.dependant.call
+        if call is not None:
+            self.dependant.call = self._wrap(call)
+        return with_deadline(
+            super().get_route_handler(),
+            self.path_format,
+            getattr(self.endpoint, "__request_timeout__", None)
+        )
+
+    def _wrap(self, call: Callable) -> Callable:
+        status_code = self.status_code or 200
+        is_coroutine = asyncio.iscoroutinefunction(call)
+
+        @functools.wraps(call)
+        async def endpoint(*args: Any, **kwargs: Any) -> Any:
+            if is_coroutine:
+                result = await call(*args, **kwargs)
+            else:
+                result = await run_in_threadpool(call, *args, **kwargs)
+            if isinstance(result, (dict, list)):
+                return FastJSONResponse(result, status_code=status_code)
+            return result
+
+        return endpoint
@@ -0,0 +1,140 @@
+"""
+令牌吊销列表
+
+权威数据存于 Redis（revoked:jti:{jti}，TTL 为令牌剩余有效期），
+各进程启动时加载现有吊销记录，并通过 pub/sub 接收新的吊销，
+在本地维护 布隆过滤器 + 精确表：
+- 绝大多数请求（未吊销）只需一次布隆过滤器检查即可放行，无网络往返；
+- 布隆命中时再查本地精确表，排除误判。
+Redis 不可用时退化为仅本进程有效的吊销列表。
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import redis.asyncio as redis
+
+from user.core.bloom import BloomFilter
+from user.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "revoked:jti:"
+REVOCATION_CHANNEL = "auth:revocations"
+
+
+class TokenRevocationList:
+    """令牌吊销列表（Redis 持久化 + 本地布隆过滤器快速路径）"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._revoked: Dict[str, float] = {}  # jti -> 过期时间戳
+        self._redis: Optional[redis.Redis] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """连接 Redis，加载现有吊销记录并订阅增量"""
+        try:
+            self._redis = redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+            await self._load()
+        except Exception as e:
+            logger.warning("令牌吊销列表无法连接 Redis，仅在本进程内生效: %s", e)
+            await self._close_redis()
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """停止订阅并断开连接"""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self._close_redis()
+
+    async def _close_redis(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def _load(self) -> None:
+        """从 Redis 加载仍在有效期内的吊销记录"""
+        now = time.time()
+        async for key in self._redis.scan_iter(match=f"{REVOKED_KEY_PREFIX}*", count=1000):
+            ttl = await self._redis.ttl(key)
+            if ttl > 0:
+                self._add(key[len(REVOKED_KEY_PREFIX):], now + ttl)
+
+    async def _listen(self) -> None:
+        """订阅吊销频道，断线后重新加载并重连"""
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                # 订阅建立后补齐断线期间的吊销
+                await self._load()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    jti, _, expires_at = message["data"].partition(" ")
+                    self._add(jti, float(expires_at or 0))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("令牌吊销订阅中断，稍后重试: %s", e)
+                await asyncio.sleep(1.0)
+
+    def _add(self, jti: str, expires_at: float) -> None:
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+        if self._bloom.saturated:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """清理已过期记录并重建布隆过滤器"""
+        now = time.time()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        self._bloom = BloomFilter(max(self.capacity, len(self._revoked) * 2), self.error_rate)
+        self._bloom.update(self._revoked)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """判断令牌是否已吊销（同步、无网络访问）"""
+        if not jti or jti not in self._bloom:
+            return False
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[jti]
+            return False
+        return True
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """吊销令牌：写入 Redis（TTL 为剩余有效期）并广播给其它进程"""
+        remaining = int(expires_at - time.time()) + 1
+        if remaining <= 0:
+            return
+        self._add(jti, expires_at)
+        if self._redis is None:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(f"{REVOKED_KEY_PREFIX}{jti}", 1, ex=remaining)
+                pipe.publish(REVOCATION_CHANNEL, f"{jti} {expires_at}")
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("令牌吊销写入 Redis 失败，仅在本进程内生效: %s", e)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+# 全局吊销列表实例
+token_revocation = TokenRevocationList(
+    capacity=settings.token_revocation_capacity,
+    error_rate=settings.token_revocation_error_rate
+)
@@ -1,19 +1,59 @@
 """
 JWT 安全认证模块
 提供JWT令牌创建、验证和密码处理功能
+
+密码哈希策略集中在此处：算法（bcrypt / argon2id）与成本参数来自配置，
+非当前算法或低于当前成本的旧哈希 needs_update 为真，登录成功后在后台重新哈希。
+哈希计算在固定大小的线程池中执行，不阻塞事件循环，并限制每个进程的哈希 CPU 占用。
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
+from uuid import uuid4
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer
 from user.core.config import settings
+from user.core.revocation import token_revocation
+
+
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_password_context(
+    scheme: Optional[str] = None,
+    bcrypt_rounds: Optional[int] = None,
+    argon2_time_cost: Optional[int] = None,
+    argon2_memory_cost: Optional[int] = None,
+    argon2_parallelism: Optional[int] = None
+) -> CryptContext:
+    """按配置构建密码哈希上下文（未指定的参数取 settings）"""
+    scheme = scheme or settings.password_hash_scheme
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"不支持的密码哈希算法: {scheme}")
+    bcrypt_rounds = bcrypt_rounds or settings.password_bcrypt_rounds
+    return CryptContext(
+        # 两种算法都保留用于校验；非默认算法标记为过时，登录后迁移
+        schemes=[scheme] + [other for other in PASSWORD_SCHEMES if other != scheme],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost or settings.password_argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost or settings.password_argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism or settings.password_argon2_parallelism,
+    )
 
 
 # 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_password_context()
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+)
 
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None):
@@ -25,31 +65,35 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
             minutes=settings.access_token_expire_minutes
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
-def verify_token(token: str) -> str:
-    """验证令牌并返回用户ID"""
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """解码并校验令牌（签名、过期、吊销），返回载荷"""
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
         )
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return str(user_id)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials", 
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if payload.get("sub") is None or token_revocation.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+def verify_token(token: str) -> str:
+    """验证令牌并返回用户ID"""
+    return str(decode_access_token(token)["sub"])
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -62,6 +106,23 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_update(hashed_password: str) -> bool:
+    """哈希是否需要按当前策略重新计算（算法或成本参数已变更）"""
+    return pwd_context.needs_update(hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在哈希线程池中验证密码"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """在哈希线程池中计算密码哈希"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
+
 def validate_password_strength(password: str) -> bool:
     """验证密码强度"""
     if len(password) < 8:
@@ -0,0 +1 @@
+# 空间分析结果领域
@@ -0,0 +1,83 @@
+"""
+空间分析结果实体模块
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+
+
+@dataclass
+class AnalysisResultEntity:
+    """分析结果实体（按用户保存，参数哈希相同视为同一次分析）"""
+    id: UUID
+    user_id: UUID
+    analysis_type: str
+    params_hash: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    name: Optional[str] = None
+    size_bytes: int = 0
+    hit_count: int = 0
+    created_at: Optional[datetime] = None
+    last_accessed_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    @classmethod
+    def create_new(
+        cls,
+        user_id: UUID,
+        analysis_type: str,
+        params_hash: str,
+        params: Dict[str, Any],
+        result: Any,
+        ttl_seconds: int,
+        name: Optional[str] = None,
+        size_bytes: int = 0
+    ) -> "AnalysisResultEntity":
+        """创建新的分析结果"""
+        now = datetime.utcnow()
+        return cls(
+            id=uuid4(),
+            user_id=user_id,
+            analysis_type=analysis_type,
+            params_hash=params_hash,
+            params=params,
+            result=result,
+            name=name,
+            size_bytes=size_bytes,
+            created_at=now,
+            last_accessed_at=now,
+            expires_at=now + timedelta(seconds=ttl_seconds),
+        )
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """是否已过期"""
+        if self.expires_at is None:
+            return False
+        now = now or datetime.utcnow()
+        expires_at = self.expires_at
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.replace(tzinfo=None) - (expires_at.utcoffset() or timedelta())
+        return expires_at <= now
+
+    def to_summary(self) -> Dict[str, Any]:
+        """历史列表使用的摘要（不含结果数据）"""
+        return {
+            "id": str(self.id),
+            "analysis_type": self.analysis_type,
+            "name": self.name,
+            "params": self.params,
+            "params_hash": self.params_hash,
+            "size_bytes": self.size_bytes,
+            "hit_count": self.hit_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "last_accessed_at": self.last_accessed_at.isoformat() if self.last_accessed_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（含结果数据）"""
+        data = self.to_summary()
+        data["result"] = self.result
+        return data
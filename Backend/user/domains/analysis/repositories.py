@@ -0,0 +1,147 @@
+"""
+空间分析结果仓储层模块
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from user.domains.analysis.entities import AnalysisResultEntity
+from user.domains.analysis.value_objects import HistoryCursor
+
+
+class AnalysisResultRepository:
+    """分析结果仓储接口"""
+    
+    async def upsert(self, result: AnalysisResultEntity) -> AnalysisResultEntity:
+        """保存分析结果（同一用户、类型与参数哈希只保留一条）"""
+        raise NotImplementedError
+    
+    async def get_by_params(
+        self,
+        user_id: UUID,
+        analysis_type: str,
+        params_hash: str
+    ) -> Optional[AnalysisResultEntity]:
+        """按参数哈希获取未过期结果，并记录一次访问"""
+        raise NotImplementedError
+    
+    async def get_by_id(self, user_id: UUID, result_id: UUID) -> Optional[AnalysisResultEntity]:
+        """按ID获取未过期结果，并记录一次访问"""
+        raise NotImplementedError
+    
+    async def list_history(
+        self,
+        user_id: UUID,
+        limit: int,
+        after: Optional[HistoryCursor] = None,
+        analysis_type: Optional[str] = None
+    ) -> List[AnalysisResultEntity]:
+        """按创建时间倒序列出历史（键集分页，不加载结果数据）"""
+        raise NotImplementedError
+    
+    async def delete(self, user_id: UUID, result_id: UUID) -> bool:
+        """删除分析结果"""
+        raise NotImplementedError
+    
+    async def delete_expired(self, user_id: Optional[UUID] = None) -> int:
+        """删除过期结果，返回删除数量"""
+        raise NotImplementedError
+    
+    async def evict_lru(self, user_id: UUID, keep: int) -> int:
+        """按最近访问时间只保留用户最新的 keep 条结果，返回淘汰数量"""
+        raise NotImplementedError
+
+
+class MockAnalysisResultRepository(AnalysisResultRepository):
+    """模拟分析结果仓储实现"""
+    
+    def __init__(self):
+        self.results: Dict[UUID, AnalysisResultEntity] = {}
+    
+    def _find(self, user_id: UUID, analysis_type: str, params_hash: str) -> Optional[AnalysisResultEntity]:
+        for item in self.results.values():
+            if (item.user_id, item.analysis_type, item.params_hash) == (user_id, analysis_type, params_hash):
+                return item
+        return None
+    
+    @staticmethod
+    def _touch(item: Optional[AnalysisResultEntity]) -> Optional[AnalysisResultEntity]:
+        if item is None or item.is_expired():
+            return None
+        item.last_accessed_at = datetime.utcnow()
+        item.hit_count += 1
+        return item
+    
+    async def upsert(self, result: AnalysisResultEntity) -> AnalysisResultEntity:
+        """保存分析结果"""
+        existing = self._find(result.user_id, result.analysis_type, result.params_hash)
+        if existing:
+            existing.result = result.result
+            existing.name = result.name or existing.name
+            existing.size_bytes = result.size_bytes
+            existing.last_accessed_at = result.last_accessed_at
+            existing.expires_at = result.expires_at
+            return existing
+        self.results[result.id] = result
+        return result
+    
+    async def get_by_params(
+        self,
+        user_id: UUID,
+        analysis_type: str,
+        params_hash: str
+    ) -> Optional[AnalysisResultEntity]:
+        """按参数哈希获取结果"""
+        return self._touch(self._find(user_id, analysis_type, params_hash))
+    
+    async def get_by_id(self, user_id: UUID, result_id: UUID) -> Optional[AnalysisResultEntity]:
+        """按ID获取结果"""
+        item = self.results.get(result_id)
+        return self._touch(item if item and item.user_id == user_id else None)
+    
+    async def list_history(
+        self,
+        user_id: UUID,
+        limit: int,
+        after: Optional[HistoryCursor] = None,
+        analysis_type: Optional[str] = None
+    ) -> List[AnalysisResultEntity]:
+        """列出历史"""
+        items = [
+            item for item in self.results.values()
+            if item.user_id == user_id
+            and not item.is_expired()
+            and (analysis_type is None or item.analysis_type == analysis_type)
+        ]
+        items.sort(key=lambda item: (item.created_at, str(item.id)), reverse=True)
+        if after:
+            items = [i for i in items if (i.created_at, str(i.id)) < (after.created_at, str(after.id))]
+        return items[:limit]
+    
+    async def delete(self, user_id: UUID, result_id: UUID) -> bool:
+        """删除分析结果"""
+        item = self.results.get(result_id)
+        if not item or item.user_id != user_id:
+            return False
+        del self.results[result_id]
+        return True
+    
+    async def delete_expired(self, user_id: Optional[UUID] = None) -> int:
+        """删除过期结果"""
+        expired = [
+            key for key, item in self.results.items()
+            if item.is_expired() and (user_id is None or item.user_id == user_id)
+        ]
+        for key in expired:
+            del self.results[key]
+        return len(expired)
+    
+    async def evict_lru(self, user_id: UUID, keep: int) -> int:
+        """LRU 淘汰"""
+        items = sorted(
+            (item for item in self.results.values() if item.user_id == user_id),
+            key=lambda item: item.last_accessed_at,
+            reverse=True
+        )
+        for item in items[keep:]:
+            del self.results[item.id]
+        return max(len(items) - keep, 0)
@@ -0,0 +1,94 @@
+"""
+空间分析结果领域服务模块
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from user.domains.analysis.entities import AnalysisResultEntity
+from user.domains.analysis.repositories import AnalysisResultRepository
+from user.domains.analysis.value_objects import HistoryCursor, canonicalize_params, params_hash
+
+
+class AnalysisResultService:
+    """分析结果服务：内容寻址保存、命中复用、历史分页与容量控制"""
+    
+    def __init__(
+        self,
+        analysis_result_repository: AnalysisResultRepository,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_results_per_user: int = 500,
+        max_history_limit: int = 100
+    ):
+        self.analysis_result_repository = analysis_result_repository
+        self.ttl_seconds = ttl_seconds
+        self.max_results_per_user = max_results_per_user
+        self.max_history_limit = max_history_limit
+    
+    async def find_result(
+        self,
+        user_id: UUID,
+        analysis_type: str,
+        params: Dict[str, Any]
+    ) -> Optional[AnalysisResultEntity]:
+        """查找相同参数的已保存结果"""
+        return await self.analysis_result_repository.get_by_params(
+            user_id, analysis_type, params_hash(analysis_type, params)
+        )
+    
+    async def save_result(
+        self,
+        user_id: UUID,
+        analysis_type: str,
+        params: Dict[str, Any],
+        result: Any,
+        name: Optional[str] = None
+    ) -> AnalysisResultEntity:
+        """保存分析结果（相同参数覆盖原记录），并执行过期清理与 LRU 淘汰"""
+        canonical = canonicalize_params(params)
+        entity = AnalysisResultEntity.create_new(
+            user_id=user_id,
+            analysis_type=analysis_type,
+            params_hash=params_hash(analysis_type, canonical),
+            params=canonical,
+            result=result,
+            ttl_seconds=self.ttl_seconds,
+            name=name
+        )
+        saved = await self.analysis_result_repository.upsert(entity)
+        await self.analysis_result_repository.delete_expired(user_id)
+        await self.analysis_result_repository.evict_lru(user_id, self.max_results_per_user)
+        return saved
+    
+    async def get_result(self, user_id: UUID, result_id: UUID) -> AnalysisResultEntity:
+        """获取分析结果，不存在或已过期时抛出异常"""
+        result = await self.analysis_result_repository.get_by_id(user_id, result_id)
+        if not result:
+            raise ValueError("分析结果不存在或已过期")
+        return result
+    
+    async def list_history(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        analysis_type: Optional[str] = None
+    ) -> Tuple[List[AnalysisResultEntity], Optional[str]]:
+        """分页获取历史记录，返回 (记录, 下一页游标)"""
+        limit = max(1, min(limit, self.max_history_limit))
+        after = HistoryCursor.decode(cursor) if cursor else None
+        items = await self.analysis_result_repository.list_history(
+            user_id, limit + 1, after=after, analysis_type=analysis_type
+        )
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = HistoryCursor(last.created_at, last.id).encode()
+        return items, next_cursor
+    
+    async def delete_result(self, user_id: UUID, result_id: UUID) -> bool:
+        """删除分析结果"""
+        return await self.analysis_result_repository.delete(user_id, result_id)
+    
+    async def purge_expired(self) -> int:
+        """清理所有用户的过期结果"""
+        return await self.analysis_result_repository.delete_expired()
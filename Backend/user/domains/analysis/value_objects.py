@@ -0,0 +1,61 @@
+"""
+空间分析结果值对象模块
+"""
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+
+def canonicalize_params(params: Any) -> Any:
+    """规范化分析参数：去掉空值、统一数值表示，使等价请求得到相同结果"""
+    if isinstance(params, dict):
+        return {
+            str(k): canonicalize_params(v)
+            for k, v in params.items()
+            if v is not None
+        }
+    if isinstance(params, (list, tuple)):
+        return [canonicalize_params(v) for v in params]
+    if isinstance(params, float) and params.is_integer():
+        return int(params)
+    return params
+
+
+def params_hash(analysis_type: str, params: Any) -> str:
+    """计算分析类型 + 规范化参数的内容哈希（SHA-256）"""
+    canonical = json.dumps(
+        canonicalize_params(params),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(f"{analysis_type}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class HistoryCursor:
+    """历史记录键集分页游标（created_at, id）
+
+    以 base64url 编码输出：isoformat 中的 "+00:00" 放进未编码的查询串时会被解码成空格。
+    """
+    created_at: datetime
+    id: UUID
+
+    @classmethod
+    def decode(cls, value: str) -> "HistoryCursor":
+        """解析游标字符串"""
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("ascii")
+            created_at, _, result_id = raw.rpartition("_")
+            return cls(datetime.fromisoformat(created_at), UUID(result_id))
+        except (ValueError, TypeError):
+            raise ValueError("分页游标格式不正确")
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}_{self.id}"
+        return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
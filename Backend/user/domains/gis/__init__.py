@@ -0,0 +1 @@
+# GIS 空间数据领域
\ No newline at end of file
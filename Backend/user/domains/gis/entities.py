@@ -0,0 +1,64 @@
+"""
+GIS 领域实体模块
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# SuperMap SDX+ 在数据集表中维护的系统字段（小写比较；前缀为 sm 的普通字段如 smoke 不在此列）
+SUPERMAP_SYSTEM_COLUMNS = frozenset({
+    "smid", "smuserid", "smkey", "smgeometry", "smgranule", "smlibtileid",
+    "smsdriw", "smsdrin", "smsdrie", "smsdris", "smgeoposition",
+    "smarea", "smperimeter", "smlength", "smtopoerror",
+    "smx", "smy", "smz", "smindexkey",
+    "smnodeid", "smfnode", "smtnode", "smedgeid", "smleftpolygon", "smrightpolygon",
+})
+
+
+@dataclass
+class LayerEntity:
+    """空间图层实体（对应 sdx schema 下的一张空间表）"""
+    name: str
+    schema: str
+    geometry_column: str
+    srid: int
+    geometry_type: str = "GEOMETRY"
+    id_column: Optional[str] = None
+    columns: Dict[str, str] = field(default_factory=dict)  # 列名 -> 数据类型
+    
+    @property
+    def attribute_columns(self) -> List[str]:
+        """对外输出的属性列（排除几何列与 SuperMap 系统字段）"""
+        return [
+            name for name, data_type in self.columns.items()
+            if name != self.geometry_column
+            and (name == self.id_column or name.lower() not in SUPERMAP_SYSTEM_COLUMNS)
+            and data_type not in ("geometry", "geography", "bytea", "raster")
+        ]
+    
+    def to_dict(self) -> dict:
+        """转换为字典格式"""
+        return {
+            "name": self.name,
+            "schema": self.schema,
+            "geometry_column": self.geometry_column,
+            "geometry_type": self.geometry_type,
+            "srid": self.srid,
+            "id_column": self.id_column,
+            "attributes": self.attribute_columns,
+        }
+
+
+@dataclass
+class FeatureEntity:
+    """空间要素实体（几何保留为数据库输出的 GeoJSON 文本，避免反复解析）"""
+    id: Optional[Any]
+    geometry: Optional[str]
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FeaturePage:
+    """要素分页结果"""
+    features: List[FeatureEntity]
+    next_cursor: Optional[Any] = None
@@ -0,0 +1,67 @@
+"""
+GIS 仓储层模块
+"""
+from typing import AsyncIterator, Dict, List, Optional
+from user.domains.gis.entities import FeatureEntity, FeaturePage, LayerEntity
+from user.domains.gis.value_objects import FeatureQuery, TileCoord
+
+
+class LayerRepository:
+    """空间图层仓储接口"""
+    
+    async def get_layer(self, name: str) -> Optional[LayerEntity]:
+        """根据图层名获取图层元数据"""
+        raise NotImplementedError
+    
+    async def list_layers(self) -> List[LayerEntity]:
+        """获取所有空间图层"""
+        raise NotImplementedError
+
+
+class TileRepository:
+    """矢量切片仓储接口"""
+    
+    async def get_tile(self, layer: LayerEntity, coord: TileCoord, tolerance: float) -> bytes:
+        """生成图层在指定瓦片内的 MVT 数据（未压缩）"""
+        raise NotImplementedError
+
+
+class FeatureRepository:
+    """空间要素仓储接口"""
+    
+    async def query_features(self, layer: LayerEntity, query: FeatureQuery) -> FeaturePage:
+        """按条件查询一页要素"""
+        raise NotImplementedError
+    
+    def iter_features(self, layer: LayerEntity, query: FeatureQuery) -> AsyncIterator[FeatureEntity]:
+        """按条件流式遍历要素（服务端游标，不整体加载到内存）"""
+        raise NotImplementedError
+    
+    def check_query(self, layer: LayerEntity, query: FeatureQuery) -> None:
+        """预先构造查询，条件值或游标无效时抛出 ValueError（不访问数据库）"""
+
+
+class MockLayerRepository(LayerRepository):
+    """模拟图层仓储实现"""
+    
+    def __init__(self):
+        self.layers: Dict[str, LayerEntity] = {}
+    
+    async def get_layer(self, name: str) -> Optional[LayerEntity]:
+        """根据图层名获取图层元数据"""
+        return self.layers.get(name)
+    
+    async def list_layers(self) -> List[LayerEntity]:
+        """获取所有空间图层"""
+        return list(self.layers.values())
+
+
+class MockTileRepository(TileRepository):
+    """模拟矢量切片仓储实现"""
+    
+    def __init__(self):
+        self.tiles: Dict[str, bytes] = {}
+    
+    async def get_tile(self, layer: LayerEntity, coord: TileCoord, tolerance: float) -> bytes:
+        """生成图层在指定瓦片内的 MVT 数据（未压缩）"""
+        return self.tiles.get(f"{layer.name}/{coord}", b"")
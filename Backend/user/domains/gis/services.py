@@ -0,0 +1,128 @@
+"""
+GIS 领域服务模块
+"""
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+from user.domains.gis.entities import FeatureEntity, FeaturePage, LayerEntity
+from user.domains.gis.repositories import FeatureRepository, LayerRepository, TileRepository
+from user.domains.gis.value_objects import FeatureQuery, TileCoord
+
+
+# 全球范围（Web 墨卡托可表示的经纬度范围）
+WORLD_BBOX = (-180.0, -85.0511287798, 180.0, 85.0511287798)
+
+
+class LayerService:
+    """空间图层服务"""
+    
+    def __init__(self, layer_repository: LayerRepository):
+        self.layer_repository = layer_repository
+    
+    async def get_layer(self, name: str) -> LayerEntity:
+        """获取图层，不存在时抛出异常"""
+        layer = await self.layer_repository.get_layer(name)
+        if not layer:
+            raise ValueError(f"图层不存在: {name}")
+        return layer
+    
+    async def list_layers(self) -> List[LayerEntity]:
+        """获取所有空间图层"""
+        return await self.layer_repository.list_layers()
+
+
+class TileService:
+    """矢量切片服务"""
+    
+    def __init__(
+        self,
+        layer_service: LayerService,
+        tile_repository: TileRepository,
+        min_zoom: int = 0,
+        max_zoom: int = 22,
+        simplify_pixels: float = 0.5,
+        simplify_max_zoom: int = 16
+    ):
+        self.layer_service = layer_service
+        self.tile_repository = tile_repository
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.simplify_pixels = simplify_pixels
+        self.simplify_max_zoom = simplify_max_zoom
+    
+    def make_coord(self, z: int, x: int, y: int) -> TileCoord:
+        """构建瓦片坐标并校验级别范围"""
+        if z < self.min_zoom or z > self.max_zoom:
+            raise ValueError(f"缩放级别超出范围: {self.min_zoom}-{self.max_zoom}")
+        return TileCoord(z, x, y)
+    
+    def simplify_tolerance(self, coord: TileCoord) -> float:
+        """按级别计算几何简化容差（米），高级别不简化"""
+        if coord.z >= self.simplify_max_zoom:
+            return 0.0
+        return coord.resolution * self.simplify_pixels
+    
+    async def render_tile(self, layer: LayerEntity, coord: TileCoord) -> bytes:
+        """生成图层在指定瓦片内的 MVT 数据"""
+        return await self.tile_repository.get_tile(layer, coord, self.simplify_tolerance(coord))
+    
+    def plan_seed(
+        self,
+        min_zoom: int,
+        max_zoom: int,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        max_tiles: Optional[int] = None
+    ) -> Iterator[TileCoord]:
+        """规划预热瓦片，超过数量上限时拒绝"""
+        if min_zoom > max_zoom:
+            raise ValueError("最小级别不能大于最大级别")
+        self.make_coord(min_zoom, 0, 0)
+        self.make_coord(max_zoom, 0, 0)
+        bbox = bbox or WORLD_BBOX
+        total = sum(TileCoord.count_covering(z, bbox) for z in range(min_zoom, max_zoom + 1))
+        if max_tiles is not None and total > max_tiles:
+            raise ValueError(f"预热瓦片数量 {total} 超过上限 {max_tiles}")
+        for z in range(min_zoom, max_zoom + 1):
+            yield from TileCoord.covering(z, bbox)
+
+
+class FeatureQueryService:
+    """空间要素查询服务"""
+    
+    def __init__(
+        self,
+        layer_service: LayerService,
+        feature_repository: FeatureRepository,
+        max_limit: int = 5000
+    ):
+        self.layer_service = layer_service
+        self.feature_repository = feature_repository
+        self.max_limit = max_limit
+    
+    def validate_query(self, layer: LayerEntity, query: FeatureQuery, paged: bool = True) -> None:
+        """校验查询字段属于图层的可查询属性"""
+        attributes = set(layer.attribute_columns)
+        for condition in query.conditions:
+            if condition.field_name not in attributes:
+                raise ValueError(f"图层 {layer.name} 不存在字段: {condition.field_name}")
+        if paged and query.limit > self.max_limit:
+            raise ValueError(f"limit 不能超过 {self.max_limit}")
+    
+    def prepare_stream(self, layer: LayerEntity, query: FeatureQuery) -> None:
+        """流式输出前的完整校验（含条件值类型与游标），错误须在响应头发出之前暴露"""
+        self.validate_query(layer, query, paged=False)
+        self.feature_repository.check_query(layer, query)
+    
+    async def query_features(self, layer_name: str, query: FeatureQuery) -> FeaturePage:
+        """查询一页要素"""
+        layer = await self.layer_service.get_layer(layer_name)
+        self.validate_query(layer, query)
+        return await self.feature_repository.query_features(layer, query)
+    
+    async def iter_features(
+        self,
+        layer: LayerEntity,
+        query: FeatureQuery
+    ) -> AsyncIterator[FeatureEntity]:
+        """流式遍历全部匹配要素（query.limit 作为总数上限）"""
+        self.validate_query(layer, query, paged=False)
+        async for feature in self.feature_repository.iter_features(layer, query):
+            yield feature
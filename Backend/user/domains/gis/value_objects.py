@@ -0,0 +1,125 @@
+"""
+GIS 领域值对象模块
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+import math
+
+
+# Web 墨卡托（EPSG:3857）投影的世界宽度（米）
+WEB_MERCATOR_WORLD_SIZE = 2 * 20037508.342789244
+# 计算分辨率所参照的瓦片像素尺寸
+TILE_PIXEL_SIZE = 256
+
+
+@dataclass(frozen=True)
+class TileCoord:
+    """瓦片坐标值对象（XYZ / Web 墨卡托切片方案）"""
+    z: int
+    x: int
+    y: int
+    
+    def __post_init__(self):
+        if not self.validate(self.z, self.x, self.y):
+            raise ValueError("瓦片坐标超出范围")
+    
+    @staticmethod
+    def validate(z: int, x: int, y: int) -> bool:
+        """验证瓦片坐标是否落在该级别的瓦片矩阵内"""
+        if z < 0 or z > 30:
+            return False
+        size = 1 << z
+        return 0 <= x < size and 0 <= y < size
+    
+    @property
+    def resolution(self) -> float:
+        """该级别每像素对应的地面距离（米）"""
+        return WEB_MERCATOR_WORLD_SIZE / (TILE_PIXEL_SIZE * (1 << self.z))
+    
+    @staticmethod
+    def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+        """经纬度转换为所在瓦片的行列号"""
+        lat = max(min(lat, 85.0511287798), -85.0511287798)
+        size = 1 << z
+        x = int((lon + 180.0) / 360.0 * size)
+        lat_rad = math.radians(lat)
+        y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * size)
+        return min(max(x, 0), size - 1), min(max(y, 0), size - 1)
+    
+    @classmethod
+    def covering(
+        cls,
+        z: int,
+        bbox: Tuple[float, float, float, float]
+    ) -> Iterator["TileCoord"]:
+        """枚举覆盖经纬度范围 (min_lon, min_lat, max_lon, max_lat) 的全部瓦片"""
+        min_x, min_y = cls.lonlat_to_tile(bbox[0], bbox[3], z)
+        max_x, max_y = cls.lonlat_to_tile(bbox[2], bbox[1], z)
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                yield cls(z, x, y)
+    
+    @classmethod
+    def count_covering(cls, z: int, bbox: Tuple[float, float, float, float]) -> int:
+        """统计覆盖范围所需的瓦片数量（不实际生成）"""
+        min_x, min_y = cls.lonlat_to_tile(bbox[0], bbox[3], z)
+        max_x, max_y = cls.lonlat_to_tile(bbox[2], bbox[1], z)
+        return (max_x - min_x + 1) * (max_y - min_y + 1)
+    
+    def __str__(self) -> str:
+        return f"{self.z}/{self.x}/{self.y}"
+    
+    def __repr__(self) -> str:
+        return f"TileCoord({self.z}, {self.x}, {self.y})"
+
+
+# 属性条件支持的比较操作符（与前端 ComparisonOperator 对齐，另加 ne / in）
+ATTRIBUTE_OPERATORS = ("eq", "ne", "gt", "lt", "gte", "lte", "like", "in")
+# 空间谓词：均蕴含外包框相交，可先用 && 走 GiST 索引
+SPATIAL_PREDICATES = ("intersects", "contains", "within", "touches", "crosses", "overlaps")
+
+
+@dataclass(frozen=True)
+class AttributeCondition:
+    """属性过滤条件值对象"""
+    field_name: str
+    operator: str
+    value: Any
+    
+    def __post_init__(self):
+        if self.operator not in ATTRIBUTE_OPERATORS:
+            raise ValueError(f"不支持的操作符: {self.operator}")
+        if self.operator == "in" and not isinstance(self.value, (list, tuple)):
+            raise ValueError("in 操作符的值必须是列表")
+
+
+@dataclass(frozen=True)
+class SpatialFilter:
+    """空间过滤条件值对象（几何为 GeoJSON，坐标系 EPSG:4326）"""
+    predicate: str
+    geometry: Dict[str, Any]
+    
+    def __post_init__(self):
+        if self.predicate not in SPATIAL_PREDICATES:
+            raise ValueError(f"不支持的空间关系: {self.predicate}")
+        if not isinstance(self.geometry, dict) or "type" not in self.geometry:
+            raise ValueError("空间过滤几何必须是 GeoJSON 几何对象")
+
+
+@dataclass(frozen=True)
+class FeatureQuery:
+    """要素查询值对象"""
+    bbox: Optional[Tuple[float, float, float, float]] = None
+    bbox_srid: int = 4326
+    spatial_filter: Optional[SpatialFilter] = None
+    conditions: Tuple[AttributeCondition, ...] = ()
+    match_all: bool = True
+    limit: int = 500
+    after: Optional[Any] = None  # 键集分页游标：上一页最后一个要素的主键（无主键图层为 ctid）
+    
+    def __post_init__(self):
+        if self.bbox is not None:
+            if len(self.bbox) != 4 or self.bbox[0] > self.bbox[2] or self.bbox[1] > self.bbox[3]:
+                raise ValueError("bbox 格式不正确")
+        if self.limit < 1:
+            raise ValueError("limit 必须大于0")
@@ -0,0 +1 @@
+# 后台任务领域
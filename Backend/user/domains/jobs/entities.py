@@ -0,0 +1,58 @@
+"""
+后台任务实体模块
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import uuid4
+from user.domains.jobs.value_objects import JobStatus
+
+
+@dataclass
+class JobEntity:
+    """后台任务实体"""
+    id: str
+    user_id: str
+    job_type: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: str = JobStatus.QUEUED
+    progress: float = 0.0
+    message: Optional[str] = None
+    result_id: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @classmethod
+    def create_new(cls, user_id: str, job_type: str, params: Dict[str, Any]) -> "JobEntity":
+        """创建新任务"""
+        return cls(
+            id=uuid4().hex,
+            user_id=user_id,
+            job_type=job_type,
+            params=params,
+            created_at=datetime.utcnow().isoformat(),
+        )
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in JobStatus.TERMINAL
+
+    def mark_running(self) -> None:
+        self.status = JobStatus.RUNNING
+        self.started_at = datetime.utcnow().isoformat()
+
+    def mark_finished(self, status: str, message: Optional[str] = None, error: Optional[str] = None) -> None:
+        self.status = status
+        self.finished_at = datetime.utcnow().isoformat()
+        if status == JobStatus.SUCCEEDED:
+            self.progress = 1.0
+        if message is not None:
+            self.message = message
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
@@ -0,0 +1,107 @@
+"""
+后台任务仓储层模块（任务记录 + 队列）
+"""
+import asyncio
+from typing import Dict, List, Optional
+from user.domains.jobs.entities import JobEntity
+from user.domains.jobs.value_objects import JobStatus
+
+
+class JobRepository:
+    """任务仓储接口：保存任务记录，并作为工作进程消费的队列"""
+    
+    async def enqueue(self, job: JobEntity, max_active: int) -> bool:
+        """保存并入队；用户进行中的任务已达上限时返回 False（检查与入队须原子）"""
+        raise NotImplementedError
+    
+    async def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        """取出下一个任务ID，超时返回 None"""
+        raise NotImplementedError
+    
+    async def get(self, job_id: str) -> Optional[JobEntity]:
+        """获取任务"""
+        raise NotImplementedError
+    
+    async def mark_running(self, job: JobEntity) -> bool:
+        """将任务转为运行中；库中状态已不是排队中（如已取消）时不写入并返回 False（检查与写入须原子）"""
+        raise NotImplementedError
+    
+    async def save(self, job: JobEntity) -> None:
+        """保存任务状态/进度"""
+        raise NotImplementedError
+    
+    async def finish(self, job: JobEntity) -> None:
+        """保存终态并释放用户并发名额"""
+        raise NotImplementedError
+    
+    async def list_by_user(self, user_id: str, limit: int = 50) -> List[JobEntity]:
+        """按创建时间倒序列出用户任务"""
+        raise NotImplementedError
+    
+    async def close(self) -> None:
+        """释放连接资源"""
+        return None
+
+
+class MockJobRepository(JobRepository):
+    """进程内任务仓储（asyncio 队列），用于测试与单进程运行"""
+    
+    def __init__(self, max_jobs: int = 10000):
+        self.jobs: Dict[str, JobEntity] = {}
+        self.max_jobs = max_jobs
+        self._queue: Optional[asyncio.Queue] = None
+    
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+    
+    async def enqueue(self, job: JobEntity, max_active: int) -> bool:
+        """保存并入队"""
+        active = sum(
+            1 for j in self.jobs.values()
+            if j.user_id == job.user_id and j.status in JobStatus.ACTIVE
+        )
+        if active >= max_active:
+            return False
+        self.jobs[job.id] = job
+        if len(self.jobs) > self.max_jobs:
+            for old in [j for j in self.jobs.values() if j.is_terminal][:len(self.jobs) - self.max_jobs]:
+                del self.jobs[old.id]
+        await self.queue.put(job.id)
+        return True
+    
+    async def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        """取出任务ID"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    async def get(self, job_id: str) -> Optional[JobEntity]:
+        """获取任务"""
+        return self.jobs.get(job_id)
+    
+    async def mark_running(self, job: JobEntity) -> bool:
+        """排队中的任务转为运行中"""
+        current = self.jobs.get(job.id)
+        if current is None or current.status != JobStatus.QUEUED:
+            return False
+        job.mark_running()
+        self.jobs[job.id] = job
+        return True
+    
+    async def save(self, job: JobEntity) -> None:
+        """保存任务"""
+        self.jobs[job.id] = job
+    
+    async def finish(self, job: JobEntity) -> None:
+        """保存终态"""
+        self.jobs[job.id] = job
+    
+    async def list_by_user(self, user_id: str, limit: int = 50) -> List[JobEntity]:
+        """列出用户任务"""
+        jobs = [j for j in self.jobs.values() if j.user_id == user_id]
+        jobs.sort(key=lambda j: j.created_at or "", reverse=True)
+        return jobs[:limit]
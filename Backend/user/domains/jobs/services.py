@@ -0,0 +1,69 @@
+"""
+后台任务领域服务模块
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from user.domains.jobs.entities import JobEntity
+from user.domains.jobs.repositories import JobRepository
+from user.domains.jobs.value_objects import JobStatus
+
+
+class JobService:
+    """后台任务服务：提交（含用户并发限制）、查询与取消"""
+    
+    def __init__(
+        self,
+        job_repository: JobRepository,
+        job_types: Sequence[str],
+        max_active_per_user: int = 3
+    ):
+        self.job_repository = job_repository
+        self.job_types = tuple(job_types)
+        self.max_active_per_user = max_active_per_user
+    
+    async def submit(self, user_id: str, job_type: str, params: Dict[str, Any]) -> JobEntity:
+        """提交任务"""
+        if job_type not in self.job_types:
+            raise ValueError(f"不支持的任务类型: {job_type}")
+        job = JobEntity.create_new(user_id, job_type, params)
+        if not await self.job_repository.enqueue(job, self.max_active_per_user):
+            raise ValueError(f"进行中的任务已达上限（{self.max_active_per_user} 个），请稍后再试")
+        return job
+    
+    async def create_completed(
+        self,
+        user_id: str,
+        job_type: str,
+        params: Dict[str, Any],
+        result_id: str
+    ) -> JobEntity:
+        """记录一个无需执行的已完成任务（结果已存在时使用）"""
+        job = JobEntity.create_new(user_id, job_type, params)
+        job.result_id = result_id
+        job.mark_finished(JobStatus.SUCCEEDED, message="命中已保存结果")
+        await self.job_repository.save(job)
+        return job
+    
+    async def get_job(self, user_id: str, job_id: str) -> JobEntity:
+        """获取任务（仅限本人）"""
+        job = await self.job_repository.get(job_id)
+        if not job or job.user_id != user_id:
+            raise ValueError("任务不存在")
+        return job
+    
+    async def list_jobs(self, user_id: str, limit: int = 50) -> List[JobEntity]:
+        """列出用户任务"""
+        return await self.job_repository.list_by_user(user_id, limit)
+    
+    async def cancel(self, user_id: str, job_id: str) -> JobEntity:
+        """取消任务：排队中的立即取消，运行中的由工作进程中止（处理函数不响应时结束其子进程）"""
+        job = await self.get_job(user_id, job_id)
+        if job.is_terminal:
+            raise ValueError("任务已结束")
+        # 同时记录取消标记：与工作进程并发转为运行中时，工作进程据此中止
+        job.cancel_requested = True
+        if job.status == JobStatus.QUEUED:
+            job.mark_finished(JobStatus.CANCELLED, message="任务已取消")
+            await self.job_repository.finish(job)
+        else:
+            await self.job_repository.save(job)
+        return job
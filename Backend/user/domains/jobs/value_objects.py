@@ -0,0 +1,19 @@
+"""
+后台任务值对象模块
+"""
+
+
+class JobStatus:
+    """任务状态"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    ACTIVE = (QUEUED, RUNNING)
+    TERMINAL = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """任务被取消（由任务进度回调抛出）"""
@@ -0,0 +1 @@
+# 知识库向量检索领域
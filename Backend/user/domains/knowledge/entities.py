@@ -0,0 +1,43 @@
+"""
+知识库向量检索实体模块
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union
+
+PointId = Union[int, str]
+
+
+@dataclass
+class VectorRecord:
+    """向量记录（向量 + 业务载荷）"""
+    id: PointId
+    vector: List[float]
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SearchHit:
+    """检索命中结果"""
+    id: PointId
+    score: float
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "score": self.score, "payload": self.payload}
+
+
+@dataclass
+class CollectionInfo:
+    """向量集合信息"""
+    name: str
+    dimension: int
+    distance: str
+    count: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "dimension": self.dimension,
+            "distance": self.distance,
+            "count": self.count,
+        }
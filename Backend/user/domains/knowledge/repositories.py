@@ -0,0 +1,34 @@
+"""
+知识库向量仓储层模块
+"""
+from typing import List, Optional, Sequence
+from user.domains.knowledge.entities import CollectionInfo, PointId, SearchHit, VectorRecord
+from user.domains.knowledge.value_objects import VectorQuery
+
+
+class VectorRepository:
+    """向量仓储接口"""
+    
+    async def ensure_collection(self, name: str, dimension: int, distance: str = "cosine") -> CollectionInfo:
+        """创建集合（已存在时直接返回）"""
+        raise NotImplementedError
+    
+    async def get_collection(self, name: str) -> Optional[CollectionInfo]:
+        """获取集合信息"""
+        raise NotImplementedError
+    
+    async def upsert(self, collection: str, records: Sequence[VectorRecord]) -> int:
+        """批量写入向量，返回写入数量"""
+        raise NotImplementedError
+    
+    async def search(self, query: VectorQuery) -> List[SearchHit]:
+        """带载荷过滤的 kNN 检索"""
+        raise NotImplementedError
+    
+    async def delete(self, collection: str, ids: Sequence[PointId]) -> int:
+        """删除向量，返回删除数量"""
+        raise NotImplementedError
+    
+    async def close(self) -> None:
+        """释放连接资源"""
+        return None
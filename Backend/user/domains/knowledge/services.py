@@ -0,0 +1,128 @@
+"""
+知识库向量检索领域服务模块
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import uuid4
+from user.domains.knowledge.entities import CollectionInfo, PointId, SearchHit, VectorRecord
+from user.domains.knowledge.repositories import VectorRepository
+from user.domains.knowledge.value_objects import DISTANCES, VectorQuery, validate_payload_filter
+
+
+class KnowledgeService:
+    """知识库检索服务：集合管理、批量写入与带缓存的向量检索
+
+    检索结果按查询向量哈希缓存在本进程（search_cache）；缓存键含集合代数，
+    代数存于各进程共享的 generation_cache（Redis），任一进程写入/删除后更换代数，
+    其它进程的旧缓存随即失效。代数不可读写时不使用缓存。
+    """
+    
+    def __init__(
+        self,
+        vector_repository: VectorRepository,
+        search_cache: Any = None,
+        generation_cache: Any = None,
+        cache_ttl: int = 300,
+        max_limit: int = 100
+    ):
+        self.vector_repository = vector_repository
+        self.search_cache = search_cache
+        self.generation_cache = generation_cache if generation_cache is not None else search_cache
+        self.cache_ttl = cache_ttl
+        self.max_limit = max_limit
+    
+    async def create_collection(self, name: str, dimension: int, distance: str = "cosine") -> CollectionInfo:
+        """创建向量集合"""
+        if distance not in DISTANCES:
+            raise ValueError(f"不支持的距离类型: {distance}")
+        if dimension <= 0:
+            raise ValueError("向量维度必须大于0")
+        existing = await self.vector_repository.get_collection(name)
+        if existing and (existing.dimension != dimension or existing.distance != distance):
+            raise ValueError(f"集合已存在且配置不同: {name}")
+        return existing or await self.vector_repository.ensure_collection(name, dimension, distance)
+    
+    async def get_collection(self, name: str) -> CollectionInfo:
+        """获取集合，不存在时抛出异常"""
+        info = await self.vector_repository.get_collection(name)
+        if not info:
+            raise ValueError(f"向量集合不存在: {name}")
+        return info
+    
+    async def upsert(self, collection: str, records: Sequence[VectorRecord]) -> int:
+        """批量写入向量"""
+        info = await self.get_collection(collection)
+        for record in records:
+            if len(record.vector) != info.dimension:
+                raise ValueError(f"向量维度不匹配: 期望 {info.dimension}，实际 {len(record.vector)}")
+        count = await self.vector_repository.upsert(collection, records)
+        await self._bump_generation(collection)
+        return count
+    
+    async def delete(self, collection: str, ids: Sequence[PointId]) -> int:
+        """删除向量"""
+        await self.get_collection(collection)
+        count = await self.vector_repository.delete(collection, ids)
+        await self._bump_generation(collection)
+        return count
+    
+    async def search(
+        self,
+        collection: str,
+        vector: Sequence[float],
+        limit: int = 10,
+        payload_filter: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None
+    ) -> List[SearchHit]:
+        """向量检索（命中缓存时不访问向量库）"""
+        validate_payload_filter(payload_filter)
+        query = VectorQuery(
+            collection=collection,
+            vector=tuple(float(v) for v in vector),
+            limit=max(1, min(limit, self.max_limit)),
+            payload_filter=payload_filter,
+            score_threshold=score_threshold
+        )
+        
+        cache_key = await self._cache_key(query) if self.search_cache is not None else None
+        if cache_key:
+            cached = await self.search_cache.get(cache_key)
+            if cached is not None:
+                return [SearchHit(**hit) for hit in cached]
+        
+        info = await self.get_collection(collection)
+        if len(query.vector) != info.dimension:
+            raise ValueError(f"向量维度不匹配: 期望 {info.dimension}，实际 {len(query.vector)}")
+        hits = await self.vector_repository.search(query)
+        
+        if cache_key:
+            await self.search_cache.set(cache_key, [hit.to_dict() for hit in hits], expire=self.cache_ttl)
+        return hits
+    
+    async def _generation(self, collection: str) -> Optional[str]:
+        """集合缓存代数（随机标识，缺失时新建，因此被淘汰也不会误用旧缓存；共享缓存不可用时为 None）"""
+        key = f"vector:gen:{collection}"
+        generation = await self.generation_cache.get(key)
+        if generation is None:
+            # 仅在键不存在时写入，避免覆盖其它进程刚更换的代数；以写入后读到的值为准
+            await self.generation_cache.set(key, uuid4().hex[:12], nx=True)
+            generation = await self.generation_cache.get(key)
+        return generation
+    
+    async def _bump_generation(self, collection: str) -> None:
+        if self.search_cache is not None:
+            await self.generation_cache.set(f"vector:gen:{collection}", uuid4().hex[:12])
+    
+    async def _cache_key(self, query: VectorQuery) -> Optional[str]:
+        """缓存键：集合代数 + 查询向量与条件的哈希（代数不可用时为 None，不缓存）"""
+        digest = hashlib.sha1()
+        digest.update(json.dumps(query.vector).encode())
+        digest.update(json.dumps(
+            [query.limit, query.payload_filter, query.score_threshold],
+            sort_keys=True, default=str
+        ).encode())
+        generation = await self._generation(query.collection)
+        if generation is None:
+            return None
+        return f"vector:search:{query.collection}:{generation}:{digest.hexdigest()}"
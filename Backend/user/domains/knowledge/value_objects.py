@@ -0,0 +1,63 @@
+"""
+知识库向量检索值对象模块
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+DISTANCES = ("cosine", "dot", "euclid")
+
+# 载荷过滤的范围操作符
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+
+
+def validate_payload_filter(payload_filter: Optional[Dict[str, Any]]) -> None:
+    """校验载荷过滤条件
+
+    格式：{字段: 值} 精确匹配；{字段: [值...]} 任一匹配；
+    {字段: {"gte": 1, "lt": 5}} 范围匹配。多个字段之间为“且”。
+    """
+    if not payload_filter:
+        return
+    for key, condition in payload_filter.items():
+        if not isinstance(key, str) or not key:
+            raise ValueError("过滤字段名不能为空")
+        if isinstance(condition, dict):
+            if not condition or any(op not in RANGE_OPERATORS for op in condition):
+                raise ValueError(f"不支持的范围操作符: {key}")
+            if any(not isinstance(v, (int, float)) for v in condition.values()):
+                raise ValueError(f"范围过滤值必须为数值: {key}")
+
+
+def match_payload(payload: Dict[str, Any], payload_filter: Optional[Dict[str, Any]]) -> bool:
+    """判断载荷是否满足过滤条件"""
+    if not payload_filter:
+        return True
+    for key, condition in payload_filter.items():
+        value = payload.get(key)
+        if isinstance(condition, dict):
+            if not isinstance(value, (int, float)):
+                return False
+            if "gt" in condition and not value > condition["gt"]:
+                return False
+            if "gte" in condition and not value >= condition["gte"]:
+                return False
+            if "lt" in condition and not value < condition["lt"]:
+                return False
+            if "lte" in condition and not value <= condition["lte"]:
+                return False
+        elif isinstance(condition, list):
+            if value not in condition:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+@dataclass(frozen=True)
+class VectorQuery:
+    """向量检索条件"""
+    collection: str
+    vector: tuple
+    limit: int = 10
+    payload_filter: Optional[Dict[str, Any]] = None
+    score_threshold: Optional[float] = None
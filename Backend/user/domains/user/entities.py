@@ -24,6 +24,7 @@ class UserEntity:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     last_login: Optional[datetime] = None
+    version: int = 1
 
     def __post_init__(self):
         if not self.created_at:
@@ -107,7 +108,8 @@ class UserEntity:
             "email": self.email,
             "phone": self.phone,
             "is_active": self.is_active,
-            "registered_at": self.created_at.isoformat() if self.created_at else None
+            "registered_at": self.created_at.isoformat() if self.created_at else None,
+            "version": self.version
         }
     
     def can_update_to(self, new_username: Optional[str] = None, new_email: Optional[str] = None) -> bool:
@@ -116,4 +118,39 @@ class UserEntity:
             return False
         if new_email and not self.validate_email(new_email):
             return False
-        return True
\ No newline at end of file
+        return True
+
+
+@dataclass
+class RefreshTokenEntity:
+    """刷新令牌实体（仅保存令牌哈希；同一次登录派生的令牌属于同一家族）"""
+    id: UUID
+    user_id: UUID
+    token_hash: str
+    family_id: UUID
+    expires_at: datetime
+    created_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+    replaced_by: Optional[UUID] = None
+    username: Optional[str] = None  # 轮换时随令牌一并查出，用于签发访问令牌
+
+    def __post_init__(self):
+        if not self.created_at:
+            self.created_at = datetime.utcnow()
+
+    @classmethod
+    def create_new(
+        cls,
+        user_id: UUID,
+        token_hash: str,
+        expires_at: datetime,
+        family_id: Optional[UUID] = None
+    ) -> "RefreshTokenEntity":
+        """创建新的刷新令牌记录"""
+        return cls(
+            id=uuid4(),
+            user_id=user_id,
+            token_hash=token_hash,
+            family_id=family_id or uuid4(),
+            expires_at=expires_at,
+        )
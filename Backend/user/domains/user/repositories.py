@@ -1,9 +1,13 @@
 """
 用户仓储层模块
 """
-from typing import Dict, List, Optional, Any
+import re
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Set, Tuple
 from uuid import UUID
-from user.domains.user.entities import UserEntity
+from datetime import datetime
+from user.domains.user.entities import RefreshTokenEntity, UserEntity
+from user.domains.user.value_objects import UserSearchCursor
 
 
 class UserRepository:
@@ -45,6 +49,23 @@ class UserRepository:
         """更新用户信息"""
         raise NotImplementedError
     
+    async def update_profile(
+        self,
+        user_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[UserEntity]:
+        """单条语句更新资料字段并递增版本号，返回更新后的用户
+
+        expected_version 不为空时仅在版本号一致时更新；用户不存在或版本不一致返回 None，
+        用户名/邮箱/手机号与其他用户冲突时抛出 ValueError。
+        """
+        raise NotImplementedError
+    
+    async def replace_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """仅当当前哈希仍为 old_hash 时替换为 new_hash"""
+        raise NotImplementedError
+    
     async def update_last_login(self, user_id: UUID) -> bool:
         """更新最后登录时间"""
         raise NotImplementedError
@@ -72,6 +93,130 @@ class UserRepository:
     async def get_user_stats(self) -> Dict[str, int]:
         """获取用户统计信息"""
         raise NotImplementedError
+    
+    async def find_existing(self, field: str, values: List[str]) -> Set[str]:
+        """返回 values 中已被占用的值（field 为 username/email/phone，值已规范化）"""
+        raise NotImplementedError
+    
+    def iter_identifiers(self, batch_size: int = 10000) -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+        """流式读取全部用户的 (用户名, 邮箱, 手机号)"""
+        raise NotImplementedError
+    
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[UserSearchCursor] = None
+    ) -> List[Tuple[UserEntity, float]]:
+        """按用户名/邮箱模糊搜索，返回 (用户, 相关度)，按相关度降序、id 升序
+
+        匹配条件：包含查询串，或与查询串的词相似度达到阈值（pg_trgm 的 <% 语义）。
+        """
+        raise NotImplementedError
+    
+    async def autocomplete(self, prefix: str, limit: int, after: Optional[str] = None) -> List[UserEntity]:
+        """用户名前缀补全，按用户名排序；after 为上一页最后一个用户名"""
+        raise NotImplementedError
+
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+WORD_SIMILARITY_THRESHOLD = 0.6  # 与 pg_trgm.word_similarity_threshold 默认值一致
+
+
+def _trigram_sequence(text: str) -> List[str]:
+    """按出现顺序排列的三元组（保留重复），供词相似度查找连续片段"""
+    sequence: List[str] = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded = f"  {word} "
+        sequence.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return sequence
+
+
+def trigrams(text: str) -> Set[str]:
+    """与 pg_trgm 一致的三元组：转小写，按字母数字切词，词前补两个空格、词后补一个空格"""
+    return set(_trigram_sequence(text))
+
+
+def word_similarity(query: str, text: str) -> float:
+    """与 pg_trgm word_similarity 一致：查询串三元组集合与文本三元组序列中最相似的连续片段的相似度
+
+    片段相似度 = 共有三元组数 / (查询三元组数 + 片段三元组数 - 共有三元组数)，
+    按 pg_trgm 的 iterate_word_similarity 逐个以查询中出现的三元组为上界、调整下界求最大值。
+    """
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return 0.0
+    sequence = _trigram_sequence(text)
+    ids: Dict[str, int] = {}
+    indexes = [ids.setdefault(gram, len(ids)) for gram in sequence]
+    found = [gram in query_trigrams for gram in ids]
+    query_count = len(query_trigrams)
+    last_position = [-1] * len(ids)
+    extent_count = common = 0
+    lower = -1
+    best = 0.0
+    for i, index in enumerate(indexes):
+        if lower >= 0 or found[index]:
+            if last_position[index] < 0:
+                extent_count += 1
+                if found[index]:
+                    common += 1
+            last_position[index] = i
+        if not found[index]:
+            continue
+        if lower == -1:
+            lower = i
+            extent_count = 1
+        current = common / (query_count + extent_count - common)
+        # 尝试右移下界以获得更高的相似度
+        tmp_common, tmp_extent, previous_lower = common, extent_count, lower
+        for tmp_lower in range(lower, i + 1):
+            similarity = tmp_common / (query_count + tmp_extent - tmp_common)
+            if similarity > current:
+                current, extent_count, lower, common = similarity, tmp_extent, tmp_lower, tmp_common
+            tmp_index = indexes[tmp_lower]
+            if last_position[tmp_index] == tmp_lower:
+                tmp_extent -= 1
+                if found[tmp_index]:
+                    tmp_common -= 1
+        best = max(best, current)
+        for tmp_lower in range(previous_lower, lower):
+            tmp_index = indexes[tmp_lower]
+            if last_position[tmp_index] == tmp_lower:
+                last_position[tmp_index] = -1
+    return best
+
+
+class TrigramIndex:
+    """内存三元组倒排索引：三元组 -> 键集合，用于模拟仓储的模糊搜索"""
+    
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._keys: Dict[str, Set[str]] = {}
+    
+    def add(self, key: str, *texts: str) -> None:
+        self.remove(key)
+        grams: Set[str] = set()
+        for text in texts:
+            grams |= trigrams(text)
+        self._keys[key] = grams
+        for gram in grams:
+            self._postings[gram].add(key)
+    
+    def remove(self, key: str) -> None:
+        for gram in self._keys.pop(key, ()):
+            self._postings[gram].discard(key)
+    
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """与查询串至少共享一个三元组的键；查询串不足以构成词内三元组时返回 None（需全量比较）"""
+        grams = trigrams(query)
+        inner = {gram for gram in grams if " " not in gram}
+        if not inner:
+            return None
+        result: Set[str] = set()
+        for gram in grams:
+            result |= self._postings.get(gram, set())
+        return result
 
 
 class MockUserRepository(UserRepository):
@@ -79,10 +224,15 @@ class MockUserRepository(UserRepository):
     
     def __init__(self):
         self.users: Dict[str, UserEntity] = {}
+        self.search_index = TrigramIndex()
+    
+    def _reindex(self, user: UserEntity) -> None:
+        self.search_index.add(str(user.id), user.username, user.email)
     
     async def create(self, user: UserEntity) -> UserEntity:
         """创建用户"""
         self.users[str(user.id)] = user
+        self._reindex(user)
         return user
     
     async def get_by_id(self, user_id: UUID) -> Optional[UserEntity]:
@@ -149,8 +299,40 @@ class MockUserRepository(UserRepository):
                 setattr(user, key, value)
         
         self.users[str(user_id)] = user
+        self._reindex(user)
         return user
     
+    async def update_profile(
+        self,
+        user_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[UserEntity]:
+        """比较版本号后更新资料字段"""
+        user = await self.get_by_id(user_id)
+        if not user or (expected_version is not None and user.version != expected_version):
+            return None
+        
+        messages = {"username": "用户名已存在", "email": "邮箱已存在", "phone": "手机号已存在"}
+        for field, value in changes.items():
+            if any(other.id != user.id and getattr(other, field) == value for other in self.users.values()):
+                raise ValueError(messages[field])
+        
+        for field, value in changes.items():
+            setattr(user, field, value)
+        self._reindex(user)
+        user.version += 1
+        user.updated_at = datetime.utcnow()
+        return user
+    
+    async def replace_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """比较后替换密码哈希"""
+        user = await self.get_by_id(user_id)
+        if not user or user.hashed_password != old_hash:
+            return False
+        user.hashed_password = new_hash
+        return True
+    
     async def update_last_login(self, user_id: UUID) -> bool:
         """更新最后登录时间"""
         user = await self.get_by_id(user_id)
@@ -165,6 +347,7 @@ class MockUserRepository(UserRepository):
         """删除用户"""
         if str(user_id) in self.users:
             del self.users[str(user_id)]
+            self.search_index.remove(str(user_id))
             return True
         return False
     
@@ -175,6 +358,7 @@ class MockUserRepository(UserRepository):
             return False
         
         user.is_active = False
+        user.version += 1
         self.users[str(user_id)] = user
         return True
     
@@ -190,6 +374,52 @@ class MockUserRepository(UserRepository):
         """检查手机号是否存在"""
         return await self.get_by_phone(phone) is not None
     
+    async def find_existing(self, field: str, values: List[str]) -> Set[str]:
+        """返回已被占用的值"""
+        taken = {getattr(user, field) for user in self.users.values()}
+        return {value for value in values if value in taken}
+    
+    async def iter_identifiers(self, batch_size: int = 10000) -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+        """流式读取全部用户标识"""
+        for user in list(self.users.values()):
+            yield user.username, user.email, user.phone
+    
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[UserSearchCursor] = None
+    ) -> List[Tuple[UserEntity, float]]:
+        """三元组索引取候选，再按包含/词相似度过滤与排序"""
+        query = query.strip().lower()
+        keys = self.search_index.candidates(query)
+        users: Iterable[UserEntity] = (
+            self.users.values() if keys is None else (self.users[key] for key in keys)
+        )
+        matches = []
+        for user in users:
+            texts = (user.username.lower(), user.email.lower())
+            score = max(word_similarity(query, text) for text in texts)
+            if score >= WORD_SIMILARITY_THRESHOLD or any(query in text for text in texts):
+                matches.append((user, score))
+        matches.sort(key=lambda item: (-item[1], str(item[0].id)))
+        if after is not None:
+            matches = [
+                (user, score) for user, score in matches
+                if score < after.score or (score == after.score and str(user.id) > str(after.id))
+            ]
+        return matches[:limit]
+    
+    async def autocomplete(self, prefix: str, limit: int, after: Optional[str] = None) -> List[UserEntity]:
+        """用户名前缀补全"""
+        users = sorted(
+            (user for user in self.users.values() if user.username.startswith(prefix)),
+            key=lambda user: user.username
+        )
+        if after is not None:
+            users = [user for user in users if user.username > after]
+        return users[:limit]
+    
     async def get_user_stats(self) -> Dict[str, int]:
         """获取用户统计信息"""
         total_users = len(self.users)
@@ -206,3 +436,91 @@ class MockUserRepository(UserRepository):
             "active_users": active_users,
             "new_users_today": new_users_today
         }
+
+
+class RefreshTokenRepository:
+    """刷新令牌仓储接口"""
+    
+    async def create(self, token: RefreshTokenEntity) -> RefreshTokenEntity:
+        """保存刷新令牌"""
+        raise NotImplementedError
+    
+    async def consume(self, token_hash: str, replaced_by: UUID) -> Optional[RefreshTokenEntity]:
+        """原子地作废一个有效令牌（未吊销、未过期、用户仍为活跃），返回被作废的令牌
+
+        令牌无效或已被使用过时返回 None。
+        """
+        raise NotImplementedError
+    
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshTokenEntity]:
+        """根据令牌哈希获取记录"""
+        raise NotImplementedError
+    
+    async def revoke_family(self, family_id: UUID) -> int:
+        """吊销整个令牌家族"""
+        raise NotImplementedError
+    
+    async def revoke_user(self, user_id: UUID) -> int:
+        """吊销用户的全部刷新令牌"""
+        raise NotImplementedError
+    
+    async def delete_expired(self) -> int:
+        """删除过期令牌"""
+        raise NotImplementedError
+
+
+class MockRefreshTokenRepository(RefreshTokenRepository):
+    """模拟刷新令牌仓储实现"""
+    
+    def __init__(self, user_repository: Optional[UserRepository] = None):
+        self.tokens: Dict[str, RefreshTokenEntity] = {}
+        self.user_repository = user_repository
+    
+    async def create(self, token: RefreshTokenEntity) -> RefreshTokenEntity:
+        """保存刷新令牌"""
+        self.tokens[token.token_hash] = token
+        return token
+    
+    async def consume(self, token_hash: str, replaced_by: UUID) -> Optional[RefreshTokenEntity]:
+        """作废有效令牌"""
+        token = self.tokens.get(token_hash)
+        if not token or token.revoked_at or token.expires_at <= datetime.utcnow():
+            return None
+        if self.user_repository is not None:
+            user = await self.user_repository.get_by_id(token.user_id)
+            if not user or not user.is_active:
+                return None
+            token.username = user.username
+        token.revoked_at = datetime.utcnow()
+        token.replaced_by = replaced_by
+        return token
+    
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshTokenEntity]:
+        """根据令牌哈希获取记录"""
+        return self.tokens.get(token_hash)
+    
+    async def revoke_family(self, family_id: UUID) -> int:
+        """吊销令牌家族"""
+        count = 0
+        for token in self.tokens.values():
+            if token.family_id == family_id and not token.revoked_at:
+                token.revoked_at = datetime.utcnow()
+                count += 1
+        return count
+    
+    async def revoke_user(self, user_id: UUID) -> int:
+        """吊销用户令牌"""
+        count = 0
+        for token in self.tokens.values():
+            if token.user_id == user_id and not token.revoked_at:
+                token.revoked_at = datetime.utcnow()
+                count += 1
+        return count
+    
+    async def delete_expired(self) -> int:
+        """删除过期令牌"""
+        now = datetime.utcnow()
+        expired = [h for h, t in self.tokens.items() if t.expires_at <= now]
+        for token_hash in expired:
+            del self.tokens[token_hash]
+        return len(expired)
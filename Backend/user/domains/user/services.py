@@ -1,17 +1,22 @@
 """
 用户服务层模块
 """
-from typing import Dict, List, Optional
-from uuid import UUID
-from user.domains.user.entities import UserEntity
-from user.domains.user.repositories import UserRepository
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+from user.domains.user.entities import RefreshTokenEntity, UserEntity
+from user.domains.user.repositories import RefreshTokenRepository, UserRepository
+from user.domains.user.value_objects import ProfileVersionConflict, RefreshTokenReused, UserSearchCursor
 
 
 class UserService:
     """用户服务"""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, identifier_filter: Any = None):
         self.user_repository = user_repository
+        self.identifier_filter = identifier_filter
     
     async def create_user(
         self,
@@ -46,7 +51,10 @@ class UserService:
         )
         
         # 保存到仓储
-        return await self.user_repository.create(user)
+        created_user = await self.user_repository.create(user)
+        if self.identifier_filter is not None:
+            await self.identifier_filter.remember(username=username, email=email, phone=phone)
+        return created_user
     
     async def get_user_by_id(self, user_id: UUID) -> Optional[UserEntity]:
         """根据ID获取用户"""
@@ -73,54 +81,86 @@ class UserService:
         user_id: UUID,
         username: Optional[str] = None,
         email: Optional[str] = None,
-        phone: Optional[str] = None
+        phone: Optional[str] = None,
+        expected_version: Optional[int] = None
     ) -> UserEntity:
-        """更新用户资料"""
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
-            raise ValueError("用户不存在")
-        
-        # 验证新用户名是否与其他用户冲突
-        if username and username != user.username:
-            existing_user = await self.user_repository.get_by_username(username)
-            if existing_user:
-                raise ValueError("用户名已存在")
-        
-        # 验证新邮箱是否与其他用户冲突
-        if email and email != user.email:
-            existing_user = await self.user_repository.get_by_email(email)
-            if existing_user:
-                raise ValueError("邮箱已存在")
-        
-        # 验证新手机号是否与其他用户冲突
-        if phone and phone != user.phone:
-            existing_user = await self.user_repository.get_by_phone(phone)
-            if existing_user:
-                raise ValueError("手机号已存在")
-        
-        # 更新用户资料
-        user.update_profile(username=username, email=email, phone=phone)
+        """更新用户资料
+
+        单条 UPDATE 完成：只写变更字段、比较并递增版本号，冲突由唯一约束判定。
+        仅在更新失败时再查询一次，区分用户不存在与版本冲突。
+        """
+        changes: Dict[str, Any] = {}
+        if username:
+            changes["username"] = username.strip()
+        if email:
+            changes["email"] = email.lower().strip()
+        if phone:
+            changes["phone"] = phone.strip()
+        if not changes:
+            raise ValueError("没有需要更新的字段")
         
-        # 保存到仓储
-        update_data = {
-            "username": user.username,
-            "email": user.email,
-            "phone": user.phone,
-            "is_active": user.is_active,
-            "is_superuser": user.is_superuser,
-            "updated_at": user.updated_at,
-            "last_login": user.last_login
-        }
-        result = await self.user_repository.update(user_id, update_data)
+        result = await self.user_repository.update_profile(user_id, changes, expected_version)
         if not result:
-            raise ValueError("用户更新失败")
+            if expected_version is not None and await self.user_repository.get_by_id(user_id):
+                raise ProfileVersionConflict("资料已被其他设备修改，请刷新后重试")
+            raise ValueError("用户不存在")
+        if self.identifier_filter is not None:
+            await self.identifier_filter.remember(**changes)
         return result
     
-    async def search_users(self, query: str) -> List[UserEntity]:
-        """搜索用户"""
-        # 使用get_all然后过滤，因为search_users方法已移除
-        all_users = await self.user_repository.get_all()
-        return [user for user in all_users if query.lower() in user.username.lower() or query.lower() in user.email.lower()]
+    async def check_availability(self, identifiers: Dict[str, List[str]]) -> Dict[str, Dict[str, bool]]:
+        """批量检查用户名/邮箱/手机号是否可用
+
+        过滤器判定一定未占用的值直接返回可用，其余值每类合并为一次数据库查询。
+        """
+        result: Dict[str, Dict[str, bool]] = {}
+        for field, values in identifiers.items():
+            if not values:
+                continue
+            normalized = {value: value.strip().lower() if field == "email" else value.strip() for value in values}
+            candidates = [
+                key for value, key in normalized.items()
+                if self.identifier_filter is None or self.identifier_filter.might_exist(field, key)
+            ]
+            taken = await self.user_repository.find_existing(field, candidates) if candidates else set()
+            result[field] = {value: key not in taken for value, key in normalized.items()}
+        return result
+    
+    async def search_users(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[UserEntity, float]], Optional[str]]:
+        """按用户名/邮箱模糊搜索（相关度排序，键集分页），返回 (结果, 下一页游标)"""
+        query = query.strip()
+        if not query:
+            raise ValueError("搜索关键字不能为空")
+        after = UserSearchCursor.decode(cursor) if cursor else None
+        matches = await self.user_repository.search(query, limit + 1, after)
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            user, score = matches[-1]
+            next_cursor = UserSearchCursor(score, user.id).encode()
+        return matches, next_cursor
+    
+    async def autocomplete_users(
+        self,
+        prefix: str,
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[UserEntity], Optional[str]]:
+        """用户名前缀补全，返回 (用户, 下一页游标)；游标为上一页最后一个用户名"""
+        prefix = prefix.strip()
+        if not prefix:
+            raise ValueError("前缀不能为空")
+        users = await self.user_repository.autocomplete(prefix, limit + 1, cursor)
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = users[-1].username
+        return users, next_cursor
     
     async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserEntity]:
         """获取用户列表"""
@@ -174,3 +214,70 @@ class UserService:
         if not updated:
             raise ValueError("密码修改失败")
         return updated
+    
+    async def upgrade_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """以新策略的哈希替换旧哈希（期间密码已被修改时放弃）"""
+        return await self.user_repository.replace_password_hash(user_id, old_hash, new_hash)
+
+
+
+class RefreshTokenService:
+    """刷新令牌服务：签发、轮换（含重放检测）与吊销
+
+    令牌为随机不透明字符串，库中只保存 SHA-256 哈希。每次刷新作废旧令牌并签发同家族的新令牌；
+    已作废的令牌再次出现说明可能被窃取，此时吊销整个家族，迫使重新登录。
+    """
+    
+    def __init__(self, refresh_token_repository: RefreshTokenRepository, expire_days: int = 14):
+        self.refresh_token_repository = refresh_token_repository
+        self.expire_days = expire_days
+    
+    @staticmethod
+    def hash_token(raw_token: str) -> str:
+        """计算令牌哈希（令牌本身为高熵随机串，无需加盐慢哈希）"""
+        return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
+    
+    async def issue(self, user_id: UUID, family_id: Optional[UUID] = None) -> str:
+        """签发刷新令牌，返回令牌原文"""
+        raw_token = secrets.token_urlsafe(32)
+        await self.refresh_token_repository.create(self._new_record(raw_token, user_id, family_id))
+        return raw_token
+    
+    def _new_record(self, raw_token: str, user_id: UUID, family_id: Optional[UUID]) -> RefreshTokenEntity:
+        return RefreshTokenEntity.create_new(
+            user_id=user_id,
+            token_hash=self.hash_token(raw_token),
+            expires_at=datetime.utcnow() + timedelta(days=self.expire_days),
+            family_id=family_id
+        )
+    
+    async def rotate(self, raw_token: str) -> Tuple[RefreshTokenEntity, str]:
+        """轮换刷新令牌，返回 (被作废的旧令牌记录, 新令牌原文)"""
+        token_hash = self.hash_token(raw_token)
+        new_raw_token = secrets.token_urlsafe(32)
+        new_id = uuid4()
+        consumed = await self.refresh_token_repository.consume(token_hash, replaced_by=new_id)
+        if consumed is None:
+            existing = await self.refresh_token_repository.get_by_hash(token_hash)
+            if existing and existing.replaced_by is not None:
+                # 已轮换过的令牌被重放：吊销整个家族（由调用方提交，不能随错误回滚）
+                await self.refresh_token_repository.revoke_family(existing.family_id)
+                raise RefreshTokenReused("刷新令牌已失效，请重新登录")
+            raise ValueError("刷新令牌无效或已过期，请重新登录")
+        
+        record = self._new_record(new_raw_token, consumed.user_id, consumed.family_id)
+        record.id = new_id
+        await self.refresh_token_repository.create(record)
+        return consumed, new_raw_token
+    
+    async def revoke(self, raw_token: str) -> bool:
+        """吊销令牌所在家族（登出）"""
+        existing = await self.refresh_token_repository.get_by_hash(self.hash_token(raw_token))
+        if not existing:
+            return False
+        await self.refresh_token_repository.revoke_family(existing.family_id)
+        return True
+    
+    async def revoke_user(self, user_id: UUID) -> int:
+        """吊销用户全部刷新令牌（修改密码后）"""
+        return await self.refresh_token_repository.revoke_user(user_id)
@@ -3,6 +3,7 @@
 """
 from dataclasses import dataclass
 from typing import Optional
+from uuid import UUID
 import re
 from datetime import datetime
 
@@ -170,3 +171,30 @@ class Timestamp:
     
     def __repr__(self) -> str:
         return f"Timestamp('{self.value.isoformat()}')"
+
+
+class ProfileVersionConflict(ValueError):
+    """资料版本号不一致（已被其他设备修改）"""
+
+
+class RefreshTokenReused(ValueError):
+    """已轮换的刷新令牌被重放（令牌家族已吊销，调用方须提交事务后再返回错误）"""
+
+
+@dataclass(frozen=True)
+class UserSearchCursor:
+    """用户搜索键集分页游标（相关度降序、id 升序）"""
+    score: float
+    id: UUID
+
+    @classmethod
+    def decode(cls, value: str) -> "UserSearchCursor":
+        """解析游标字符串"""
+        try:
+            score, _, user_id = value.rpartition("_")
+            return cls(float(score), UUID(user_id))
+        except (ValueError, TypeError):
+            raise ValueError("分页游标格式不正确")
+
+    def encode(self) -> str:
+        return f"{self.score!r}_{self.id}"
@@ -0,0 +1,190 @@
+"""
+空间分析结果 PostgreSQL 仓储实现
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple, cast
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from user.domains.analysis.entities import AnalysisResultEntity
+from user.domains.analysis.repositories import AnalysisResultRepository
+from user.domains.analysis.value_objects import HistoryCursor
+from user.infrastructure.database.postgres.models import AnalysisResultModel
+
+
+def _encode_result(result: Any, compress_threshold: int) -> Tuple[Any, Optional[bytes], int]:
+    """序列化结果，超过阈值时 zlib 压缩，返回 (JSONB 值, 压缩数据, 原始字节数)"""
+    raw = json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    if len(raw) > compress_threshold:
+        return None, zlib.compress(raw, 6), len(raw)
+    return result, None, len(raw)
+
+
+def _model_to_entity(model: AnalysisResultModel, with_result: bool = True) -> AnalysisResultEntity:
+    result = None
+    if with_result:
+        compressed = cast(Optional[bytes], model.result_compressed)
+        result = json.loads(zlib.decompress(compressed)) if compressed else model.result
+    return AnalysisResultEntity(
+        id=cast(UUID, model.id),
+        user_id=cast(UUID, model.user_id),
+        analysis_type=cast(str, model.analysis_type),
+        params_hash=cast(str, model.params_hash),
+        params=cast(dict, model.params),
+        result=result,
+        name=cast(Optional[str], model.name),
+        size_bytes=cast(int, model.size_bytes),
+        hit_count=cast(int, model.hit_count),
+        created_at=cast(Optional[datetime], model.created_at),
+        last_accessed_at=cast(Optional[datetime], model.last_accessed_at),
+        expires_at=cast(Optional[datetime], model.expires_at),
+    )
+
+
+class PostgreSQLAnalysisResultRepository(AnalysisResultRepository):
+    """基于 SQLAlchemy AsyncSession 的分析结果仓储实现"""
+
+    def __init__(self, session: AsyncSession, compress_threshold: int = 32768):
+        self.session = session
+        self.compress_threshold = compress_threshold
+
+    async def upsert(self, result: AnalysisResultEntity) -> AnalysisResultEntity:
+        value, compressed, size_bytes = _encode_result(result.result, self.compress_threshold)
+        created_at, last_accessed_at, expires_at = (
+            value.replace(tzinfo=timezone.utc) if value and value.tzinfo is None else value
+            for value in (result.created_at, result.last_accessed_at, result.expires_at)
+        )
+        stmt = insert(AnalysisResultModel).values(
+            id=result.id,
+            user_id=result.user_id,
+            analysis_type=result.analysis_type,
+            name=result.name,
+            params_hash=result.params_hash,
+            params=result.params,
+            result=value,
+            result_compressed=compressed,
+            size_bytes=size_bytes,
+            hit_count=0,
+            created_at=created_at,
+            last_accessed_at=last_accessed_at,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_analysis_results_params",
+            set_={
+                "name": func.coalesce(stmt.excluded.name, AnalysisResultModel.name),
+                "result": stmt.excluded.result,
+                "result_compressed": stmt.excluded.result_compressed,
+                "size_bytes": stmt.excluded.size_bytes,
+                "last_accessed_at": stmt.excluded.last_accessed_at,
+                "expires_at": stmt.excluded.expires_at,
+            }
+        ).returning(*self._summary_columns())
+        row = (await self.session.execute(stmt)).one()
+        entity = self._row_to_entity(row)
+        entity.result = result.result
+        return entity
+
+    @staticmethod
+    def _summary_columns():
+        return [c for c in AnalysisResultModel.__table__.c if c.key not in ("result", "result_compressed")]
+
+    @staticmethod
+    def _row_to_entity(row: Any) -> AnalysisResultEntity:
+        model = AnalysisResultModel(**row._mapping)
+        return _model_to_entity(model, with_result=("result" in row._mapping))
+
+    async def _touch(self, *criteria: Any) -> Optional[AnalysisResultEntity]:
+        """单条 UPDATE ... RETURNING 同时完成读取与访问记录（LRU 依据）"""
+        stmt = (
+            update(AnalysisResultModel)
+            .where(*criteria, AnalysisResultModel.expires_at > func.now())
+            .values(
+                last_accessed_at=func.clock_timestamp(),
+                hit_count=AnalysisResultModel.hit_count + 1
+            )
+            .returning(*AnalysisResultModel.__table__.c)
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
+        return self._row_to_entity(row) if row else None
+
+    async def get_by_params(
+        self,
+        user_id: UUID,
+        analysis_type: str,
+        params_hash: str
+    ) -> Optional[AnalysisResultEntity]:
+        return await self._touch(
+            AnalysisResultModel.user_id == user_id,
+            AnalysisResultModel.analysis_type == analysis_type,
+            AnalysisResultModel.params_hash == params_hash,
+        )
+
+    async def get_by_id(self, user_id: UUID, result_id: UUID) -> Optional[AnalysisResultEntity]:
+        return await self._touch(
+            AnalysisResultModel.id == result_id,
+            AnalysisResultModel.user_id == user_id,
+        )
+
+    async def list_history(
+        self,
+        user_id: UUID,
+        limit: int,
+        after: Optional[HistoryCursor] = None,
+        analysis_type: Optional[str] = None
+    ) -> List[AnalysisResultEntity]:
+        stmt = (
+            select(AnalysisResultModel)
+            .options(defer(AnalysisResultModel.result), defer(AnalysisResultModel.result_compressed))
+            .where(
+                AnalysisResultModel.user_id == user_id,
+                AnalysisResultModel.expires_at > func.now()
+            )
+        )
+        if analysis_type:
+            stmt = stmt.where(AnalysisResultModel.analysis_type == analysis_type)
+        if after:
+            stmt = stmt.where(
+                tuple_(AnalysisResultModel.created_at, AnalysisResultModel.id)
+                < tuple_(after.created_at, after.id)
+            )
+        stmt = stmt.order_by(
+            AnalysisResultModel.created_at.desc(), AnalysisResultModel.id.desc()
+        ).limit(limit)
+        result = await self.session.execute(stmt)
+        return [_model_to_entity(m, with_result=False) for m in result.scalars().all()]
+
+    async def delete(self, user_id: UUID, result_id: UUID) -> bool:
+        stmt = delete(AnalysisResultModel).where(
+            AnalysisResultModel.id == result_id,
+            AnalysisResultModel.user_id == user_id
+        )
+        result = await self.session.execute(stmt)
+        return (result.rowcount or 0) > 0
+
+    async def delete_expired(self, user_id: Optional[UUID] = None) -> int:
+        stmt = delete(AnalysisResultModel).where(AnalysisResultModel.expires_at <= func.now())
+        if user_id is not None:
+            stmt = stmt.where(AnalysisResultModel.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return result.rowcount or 0
+
+    async def evict_lru(self, user_id: UUID, keep: int) -> int:
+        stale = (
+            select(AnalysisResultModel.id)
+            .where(AnalysisResultModel.user_id == user_id)
+            .order_by(AnalysisResultModel.last_accessed_at.desc())
+            .offset(keep)
+            .scalar_subquery()
+        )
+        stmt = delete(AnalysisResultModel).where(AnalysisResultModel.id.in_(stale))
+        result = await self.session.execute(stmt)
+        return result.rowcount or 0
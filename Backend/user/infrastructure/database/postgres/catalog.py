@@ -0,0 +1,355 @@
+"""
+sdx schema 目录服务
+
+以少量集合式系统表查询（而非逐表查询）采集整个 schema 的列、主外键、索引与
+几何列信息，多条查询在连接池上并发执行；行数默认取 pg_class.reltuples 估算值，
+仅在显式要求时才执行 COUNT(*)。采集结果带内容版本号，缓存在内存与 JSON 文件中，
+供图层发现等接口直接读取，避免每个请求访问 information_schema。
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from user.domains.gis.entities import LayerEntity
+from user.domains.gis.repositories import LayerRepository
+
+
+# 目录 JSON 结构版本，结构变化时递增以淘汰旧缓存文件
+CATALOG_FORMAT_VERSION = 1
+
+_TABLES_SQL = text("""
+    SELECT
+        c.relname AS table_name,
+        c.reltuples::bigint AS estimated_rows,
+        pg_total_relation_size(c.oid) AS total_bytes
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = :schema
+    AND c.relkind IN ('r', 'p')
+    AND c.relname NOT LIKE 'sm%'
+    ORDER BY c.relname
+""")
+
+_COLUMNS_SQL = text("""
+    SELECT
+        c.relname AS table_name,
+        a.attnum AS ordinal_position,
+        a.attname AS column_name,
+        format_type(a.atttypid, NULL) AS data_type,
+        CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+        pg_get_expr(d.adbin, d.adrelid) AS column_default,
+        information_schema._pg_char_max_length(a.atttypid, a.atttypmod) AS character_maximum_length,
+        information_schema._pg_numeric_precision(a.atttypid, a.atttypmod) AS numeric_precision,
+        information_schema._pg_numeric_scale(a.atttypid, a.atttypmod) AS numeric_scale
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE n.nspname = :schema
+    AND c.relkind IN ('r', 'p')
+    AND a.attnum > 0
+    AND NOT a.attisdropped
+    ORDER BY c.relname, a.attnum
+""")
+
+_CONSTRAINTS_SQL = text("""
+    SELECT
+        c.relname AS table_name,
+        con.contype::text AS constraint_type,
+        con.conname AS constraint_name,
+        ARRAY(
+            SELECT a.attname
+            FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            ORDER BY k.ord
+        ) AS columns,
+        fc.relname AS foreign_table,
+        ARRAY(
+            SELECT a.attname
+            FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+            ORDER BY k.ord
+        ) AS foreign_columns
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_class fc ON fc.oid = con.confrelid
+    WHERE n.nspname = :schema
+    AND con.contype IN ('p', 'f')
+    ORDER BY c.relname, con.conname
+""")
+
+_INDEXES_SQL = text("""
+    SELECT tablename AS table_name, indexname, indexdef
+    FROM pg_indexes
+    WHERE schemaname = :schema
+    ORDER BY tablename, indexname
+""")
+
+_GEOMETRY_SQL = text("""
+    SELECT f_table_name AS table_name, f_geometry_column, srid, type
+    FROM geometry_columns
+    WHERE f_table_schema = :schema
+""")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SchemaCatalogService:
+    """schema 目录采集与缓存服务（进程级单例）"""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        schema: str,
+        cache_path: Optional[str] = None,
+        ttl: int = 3600,
+        count_concurrency: int = 4
+    ):
+        self.engine = engine
+        self.schema = schema
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.count_concurrency = count_concurrency
+        self._catalog: Optional[Dict[str, Any]] = None
+        self._catalog_json: Optional[bytes] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _fetch(self, statement, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """在独立的池连接上执行一条目录查询"""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(statement, params)
+            return [dict(row) for row in result.mappings()]
+
+    async def _fetch_geometry(self) -> List[Dict[str, Any]]:
+        """几何列信息（库中未安装 PostGIS 时返回空）"""
+        try:
+            return await self._fetch(_GEOMETRY_SQL, {"schema": self.schema})
+        except Exception:
+            return []
+
+    async def _exact_counts(self, tables: List[str]) -> Dict[str, int]:
+        """并发执行精确计数，并发度受限以免占满连接池"""
+        semaphore = asyncio.Semaphore(self.count_concurrency)
+
+        async def count(table: str) -> int:
+            async with semaphore:
+                async with self.engine.connect() as conn:
+                    sql = text(f"SELECT COUNT(*) FROM {_quote(self.schema)}.{_quote(table)}")
+                    return int((await conn.execute(sql)).scalar_one())
+
+        counts = await asyncio.gather(*(count(t) for t in tables))
+        return dict(zip(tables, counts))
+
+    async def collect(self, exact_counts: bool = False) -> Dict[str, Any]:
+        """采集 schema 目录（5 条集合式查询并发执行）"""
+        params = {"schema": self.schema}
+        tables, columns, constraints, indexes, geometries = await asyncio.gather(
+            self._fetch(_TABLES_SQL, params),
+            self._fetch(_COLUMNS_SQL, params),
+            self._fetch(_CONSTRAINTS_SQL, params),
+            self._fetch(_INDEXES_SQL, params),
+            self._fetch_geometry(),
+        )
+
+        catalog_tables: Dict[str, Dict[str, Any]] = {}
+        for row in tables:
+            estimated = int(row["estimated_rows"])
+            catalog_tables[row["table_name"]] = {
+                "columns": [],
+                "primary_keys": [],
+                "foreign_keys": [],
+                "indexes": [],
+                "geometry": None,
+                # reltuples 为 -1 表示从未 ANALYZE，估算值不可用
+                "row_count": max(estimated, 0),
+                "row_count_exact": False,
+                "total_bytes": int(row["total_bytes"]),
+            }
+
+        for row in columns:
+            table = catalog_tables.get(row["table_name"])
+            if table is None:
+                continue
+            table["columns"].append({
+                "name": row["column_name"],
+                "type": row["data_type"],
+                "nullable": row["is_nullable"],
+                "default": row["column_default"],
+                "max_length": row["character_maximum_length"],
+                "precision": row["numeric_precision"],
+                "scale": row["numeric_scale"],
+                "position": row["ordinal_position"],
+            })
+
+        for row in constraints:
+            table = catalog_tables.get(row["table_name"])
+            if table is None:
+                continue
+            if row["constraint_type"] == "p":
+                table["primary_keys"] = list(row["columns"])
+            else:
+                for column, foreign_column in zip(row["columns"], row["foreign_columns"]):
+                    table["foreign_keys"].append({
+                        "column": column,
+                        "foreign_table": row["foreign_table"],
+                        "foreign_column": foreign_column,
+                    })
+
+        for row in indexes:
+            table = catalog_tables.get(row["table_name"])
+            if table is not None:
+                table["indexes"].append({"name": row["indexname"], "definition": row["indexdef"]})
+
+        for row in geometries:
+            table = catalog_tables.get(row["table_name"])
+            if table is not None:
+                table["geometry"] = {
+                    "column": row["f_geometry_column"],
+                    "srid": int(row["srid"] or 0),
+                    "type": row["type"],
+                }
+
+        if exact_counts and catalog_tables:
+            for name, count in (await self._exact_counts(list(catalog_tables))).items():
+                catalog_tables[name]["row_count"] = count
+                catalog_tables[name]["row_count_exact"] = True
+
+        content = json.dumps(catalog_tables, sort_keys=True, default=str)
+        return {
+            "format_version": CATALOG_FORMAT_VERSION,
+            "version": hashlib.sha256(content.encode("utf-8")).hexdigest()[:16],
+            "schema": self.schema,
+            "generated_at": datetime.utcnow().isoformat(),
+            "tables": catalog_tables,
+        }
+
+    def _store(self, catalog: Dict[str, Any], loaded_at: Optional[float] = None) -> None:
+        self._catalog = catalog
+        self._catalog_json = json.dumps(catalog, ensure_ascii=False, default=str).encode("utf-8")
+        self._loaded_at = loaded_at if loaded_at is not None else time.time()
+
+    def _read_cache_file(self) -> bool:
+        """读取缓存文件，结构版本或 schema 不匹配、已过期时忽略"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            mtime = os.path.getmtime(self.cache_path)
+            if self.ttl and time.time() - mtime > self.ttl:
+                return False
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if catalog.get("format_version") != CATALOG_FORMAT_VERSION or catalog.get("schema") != self.schema:
+            return False
+        self._store(catalog, loaded_at=mtime)
+        return True
+
+    def _write_cache_file(self) -> None:
+        if not self.cache_path or self._catalog_json is None:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 每次写入使用独立的临时文件（多个工作进程可能同时刷新），写完后原子替换
+        tmp = tempfile.NamedTemporaryFile(
+            "wb",
+            dir=directory or ".",
+            prefix=f"{os.path.basename(self.cache_path)}.",
+            suffix=".tmp",
+            delete=False
+        )
+        try:
+            with tmp:
+                tmp.write(self._catalog_json)
+            os.replace(tmp.name, self.cache_path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+
+    def _is_fresh(self) -> bool:
+        return self._catalog is not None and (not self.ttl or time.time() - self._loaded_at < self.ttl)
+
+    async def refresh(self, exact_counts: bool = False) -> Dict[str, Any]:
+        """重新采集目录并更新缓存"""
+        async with self._lock:
+            self._store(await self.collect(exact_counts=exact_counts))
+            self._write_cache_file()
+            return self._catalog
+
+    async def get_catalog(self) -> Dict[str, Any]:
+        """获取目录：内存 → 缓存文件 → 重新采集"""
+        if self._is_fresh():
+            return self._catalog
+        async with self._lock:
+            if self._is_fresh() or self._read_cache_file():
+                return self._catalog
+            self._store(await self.collect())
+            self._write_cache_file()
+            return self._catalog
+
+    async def get_catalog_json(self) -> bytes:
+        """获取预序列化的目录 JSON（按版本复用，避免每次请求重新编码）"""
+        await self.get_catalog()
+        return self._catalog_json
+
+    async def get_layer(self, name: str) -> Optional[LayerEntity]:
+        """从目录构建图层实体，非空间表返回 None"""
+        catalog = await self.get_catalog()
+        table = catalog["tables"].get(name)
+        if not table or not table.get("geometry"):
+            return None
+        return _table_to_layer(catalog["schema"], name, table)
+
+    async def list_layers(self) -> List[LayerEntity]:
+        """列出目录中的全部空间图层"""
+        catalog = await self.get_catalog()
+        return [
+            _table_to_layer(catalog["schema"], name, table)
+            for name, table in catalog["tables"].items()
+            if table.get("geometry")
+        ]
+
+
+def _table_to_layer(schema: str, name: str, table: Dict[str, Any]) -> LayerEntity:
+    primary_keys = table["primary_keys"]
+    return LayerEntity(
+        name=name,
+        schema=schema,
+        geometry_column=table["geometry"]["column"],
+        srid=table["geometry"]["srid"],
+        geometry_type=table["geometry"]["type"],
+        id_column=primary_keys[0] if len(primary_keys) == 1 else None,
+        columns={column["name"]: column["type"] for column in table["columns"]},
+    )
+
+
+class CatalogLayerRepository(LayerRepository):
+    """基于目录缓存的图层仓储，目录中缺失的图层（如新建表）回退到实时查询"""
+
+    def __init__(self, catalog: SchemaCatalogService, fallback: Optional[LayerRepository] = None):
+        self.catalog = catalog
+        self.fallback = fallback
+
+    async def get_layer(self, name: str) -> Optional[LayerEntity]:
+        layer = await self.catalog.get_layer(name)
+        if layer is None and self.fallback is not None:
+            return await self.fallback.get_layer(name)
+        return layer
+
+    async def list_layers(self) -> List[LayerEntity]:
+        return await self.catalog.list_layers()
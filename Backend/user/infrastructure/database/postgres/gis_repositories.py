@@ -0,0 +1,316 @@
+"""
+PostgreSQL / PostGIS 空间仓储实现
+"""
+from __future__ import annotations
+
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Optional
+
+from sqlalchemy import String, and_, cast, func, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user.domains.gis.entities import FeatureEntity, FeaturePage, LayerEntity
+from user.domains.gis.repositories import FeatureRepository, LayerRepository, TileRepository
+from user.domains.gis.value_objects import AttributeCondition, FeatureQuery, TileCoord
+from user.infrastructure.database.postgres.models import build_sdx_table
+
+
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_INTEGER_TYPES = ("smallint", "integer", "bigint")
+_CTID_PATTERN = re.compile(r"^\(\d+,\d+\)$")
+
+
+def quote_ident(name: str) -> str:
+    """校验并引用 SQL 标识符（表名/列名不能走参数绑定）"""
+    if not _IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"非法的标识符: {name}")
+    return f'"{name}"'
+
+
+_LAYER_SQL = text("""
+    SELECT
+        gc.f_table_name AS table_name,
+        gc.f_geometry_column AS geometry_column,
+        gc.srid,
+        gc.type AS geometry_type,
+        (
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = c.oid AND i.indisprimary AND i.indnatts = 1
+        ) AS id_column,
+        (
+            SELECT json_object_agg(a.attname, format_type(a.atttypid, NULL) ORDER BY a.attnum)
+            FROM pg_attribute a
+            WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        ) AS columns
+    FROM geometry_columns gc
+    JOIN pg_namespace n ON n.nspname = gc.f_table_schema
+    JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = gc.f_table_name
+    WHERE gc.f_table_schema = :schema
+    AND (CAST(:name AS text) IS NULL OR gc.f_table_name = :name)
+    AND gc.f_table_name NOT LIKE 'sm%'
+    ORDER BY gc.f_table_name
+""")
+
+
+def _row_to_layer(row, schema: str) -> LayerEntity:
+    return LayerEntity(
+        name=row.table_name,
+        schema=schema,
+        geometry_column=row.geometry_column,
+        srid=int(row.srid or 0),
+        geometry_type=row.geometry_type,
+        id_column=row.id_column,
+        columns=dict(row.columns or {}),
+    )
+
+
+class PostgreSQLLayerRepository(LayerRepository):
+    """基于 PostGIS geometry_columns 视图的图层仓储实现"""
+
+    def __init__(self, session: AsyncSession, schema: str):
+        self.session = session
+        self.schema = schema
+
+    async def get_layer(self, name: str) -> Optional[LayerEntity]:
+        if not _IDENTIFIER_PATTERN.match(name):
+            return None
+        result = await self.session.execute(_LAYER_SQL, {"schema": self.schema, "name": name})
+        row = result.first()
+        return _row_to_layer(row, self.schema) if row else None
+
+    async def list_layers(self) -> List[LayerEntity]:
+        result = await self.session.execute(_LAYER_SQL, {"schema": self.schema, "name": None})
+        return [_row_to_layer(row, self.schema) for row in result]
+
+
+class PostgreSQLTileRepository(TileRepository):
+    """基于 ST_AsMVT 的矢量切片仓储实现（需要 PostGIS 3.1+）"""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        extent: int = 4096,
+        buffer: int = 64,
+        default_srid: int = 4326
+    ):
+        self.session = session
+        self.extent = extent
+        self.buffer = buffer
+        self.default_srid = default_srid
+
+    def _build_sql(self, layer: LayerEntity) -> str:
+        geom = f"t.{quote_ident(layer.geometry_column)}"
+        source = geom
+        envelope = "ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), :srid)"
+        if not layer.srid:
+            # 未登记 SRID 的图层：按默认坐标系解释，&& 比较仍在原始列上进行以命中索引
+            source = f"ST_SetSRID({geom}, :srid)"
+            envelope = f"ST_SetSRID({envelope}, 0)"
+        attributes = "".join(f", t.{quote_ident(c)}" for c in layer.attribute_columns)
+        # MVT 要素 ID 只接受整数，非整型主键不输出
+        has_id = layer.columns.get(layer.id_column or "") in _INTEGER_TYPES
+        feature_id = ", 'mvt_id'" if has_id else ""
+        id_select = f", t.{quote_ident(layer.id_column)} AS mvt_id" if has_id else ""
+        # 先用 && 命中 GiST 索引（在图层自身坐标系下比较），再裁剪/简化/量化到瓦片坐标
+        return f"""
+            WITH bounds AS (
+                SELECT
+                    ST_TileEnvelope(:z, :x, :y) AS geom_3857,
+                    {envelope} AS geom_native
+            ),
+            mvtgeom AS (
+                SELECT
+                    ST_AsMVTGeom(
+                        ST_Simplify(ST_Transform({source}, 3857), :tolerance, true),
+                        bounds.geom_3857, :extent, :buffer, true
+                    ) AS mvt_geom{id_select}{attributes}
+                FROM {quote_ident(layer.schema)}.{quote_ident(layer.name)} AS t, bounds
+                WHERE {geom} && bounds.geom_native
+            )
+            SELECT ST_AsMVT(mvtgeom.*, :layer_name, :extent, 'mvt_geom'{feature_id})
+            FROM mvtgeom
+            WHERE mvt_geom IS NOT NULL
+        """
+
+    async def get_tile(self, layer: LayerEntity, coord: TileCoord, tolerance: float) -> bytes:
+        params = {
+            "z": coord.z,
+            "x": coord.x,
+            "y": coord.y,
+            "margin": self.buffer / self.extent,
+            "srid": layer.srid or self.default_srid,
+            "tolerance": tolerance,
+            "extent": self.extent,
+            "buffer": self.buffer,
+            "layer_name": layer.name,
+        }
+        result = await self.session.execute(text(self._build_sql(layer)), params)
+        data = result.scalar_one_or_none()
+        return bytes(data) if data else b""
+
+
+_PREDICATE_FUNCTIONS = {
+    "intersects": func.ST_Intersects,
+    "contains": func.ST_Contains,
+    "within": func.ST_Within,
+    "touches": func.ST_Touches,
+    "crosses": func.ST_Crosses,
+    "overlaps": func.ST_Overlaps,
+}
+
+
+def _coerce_value(column, value: Any) -> Any:
+    """按列类型转换前端传入的条件值（前端统一以字符串传值）"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    try:
+        if python_type is bool:
+            return str(value).lower() in ("1", "true", "t", "yes")
+        if python_type in (int, float, Decimal):
+            return python_type(value)
+        if python_type in (datetime, date):
+            return python_type.fromisoformat(str(value))
+        return python_type(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"字段 {column.name} 的值类型不正确: {value}")
+
+
+class PostgreSQLFeatureRepository(FeatureRepository):
+    """基于 GeoAlchemy2 映射的空间要素仓储实现
+
+    过滤条件编译为 PostGIS SQL：先以 && 做外包框过滤命中 GiST 索引，
+    再以精确空间谓词复核；主键有序的键集分页避免 OFFSET 扫描。
+    无主键的图层按物理行号 ctid 分页（PostgreSQL 14+ 走 TID 范围扫描），
+    期间若有更新或 VACUUM FULL 移动了行，翻页可能重复或遗漏。
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        default_srid: int = 4326,
+        precision: int = 6,
+        batch_size: int = 1000
+    ):
+        self.session = session
+        self.default_srid = default_srid
+        self.precision = precision
+        self.batch_size = batch_size
+
+    def _to_layer_srid(self, layer: LayerEntity, geometry):
+        """将查询几何转换到图层坐标系（未登记 SRID 的图层比较时使用 0）"""
+        geometry = func.ST_Transform(geometry, layer.srid or self.default_srid)
+        return geometry if layer.srid else func.ST_SetSRID(geometry, 0)
+
+    def _condition_clause(self, table, condition: AttributeCondition):
+        column = table.c[condition.field_name]
+        op = condition.operator
+        if op == "like":
+            return cast(column, String).ilike(str(condition.value))
+        if op == "in":
+            return column.in_([_coerce_value(column, v) for v in condition.value])
+        value = _coerce_value(column, condition.value)
+        if op == "eq":
+            return column == value
+        if op == "ne":
+            return column != value
+        if op == "gt":
+            return column > value
+        if op == "lt":
+            return column < value
+        if op == "gte":
+            return column >= value
+        return column <= value
+
+    def _build_select(self, layer: LayerEntity, query: FeatureQuery, limit: int):
+        table = build_sdx_table(layer)
+        geom = table.c[layer.geometry_column]
+        source = geom if layer.srid else func.ST_SetSRID(geom, self.default_srid)
+        id_column = table.c[layer.id_column] if layer.id_column else None
+
+        columns = [
+            func.ST_AsGeoJSON(func.ST_Transform(source, 4326), self.precision).label("__geojson")
+        ]
+        if id_column is not None:
+            columns.append(id_column.label("__id"))
+        else:
+            columns.append(cast(literal_column("ctid"), String).label("__ctid"))
+        columns.extend(table.c[name] for name in layer.attribute_columns)
+        stmt = select(*columns)
+
+        # 1) 外包框过滤：&& 只比较外包框，由 GiST 索引直接回答
+        if query.bbox is not None:
+            envelope = self._to_layer_srid(
+                layer, func.ST_MakeEnvelope(*query.bbox, query.bbox_srid)
+            )
+            stmt = stmt.where(geom.op("&&")(envelope))
+
+        # 2) 空间谓词：同样先 && 走索引，再用精确谓词复核候选集
+        if query.spatial_filter is not None:
+            target = self._to_layer_srid(
+                layer,
+                func.ST_SetSRID(
+                    func.ST_GeomFromGeoJSON(json.dumps(query.spatial_filter.geometry)), 4326
+                )
+            )
+            predicate = _PREDICATE_FUNCTIONS[query.spatial_filter.predicate]
+            stmt = stmt.where(geom.op("&&")(target), predicate(geom, target))
+
+        # 3) 属性条件
+        if query.conditions:
+            clauses = [self._condition_clause(table, c) for c in query.conditions]
+            stmt = stmt.where(and_(*clauses) if query.match_all else or_(*clauses))
+
+        # 4) 键集分页（无主键时退回 ctid）
+        if id_column is not None:
+            if query.after is not None:
+                stmt = stmt.where(id_column > _coerce_value(id_column, query.after))
+            stmt = stmt.order_by(id_column)
+        else:
+            if query.after is not None:
+                if not _CTID_PATTERN.match(str(query.after)):
+                    raise ValueError(f"分页游标无效: {query.after}")
+                stmt = stmt.where(
+                    text("ctid > CAST(:after_ctid AS tid)").bindparams(after_ctid=str(query.after))
+                )
+            stmt = stmt.order_by(literal_column("ctid"))
+        return stmt.limit(limit)
+
+    @staticmethod
+    def _row_to_feature(layer: LayerEntity, row) -> FeatureEntity:
+        mapping = row._mapping
+        return FeatureEntity(
+            id=mapping.get("__id"),
+            geometry=mapping["__geojson"],
+            properties={name: mapping[name] for name in layer.attribute_columns},
+        )
+
+    async def query_features(self, layer: LayerEntity, query: FeatureQuery) -> FeaturePage:
+        # 多取一条用于判断是否还有下一页
+        stmt = self._build_select(layer, query, query.limit + 1)
+        rows = (await self.session.execute(stmt)).all()
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            last = rows[-1]._mapping
+            next_cursor = last["__id"] if layer.id_column else last["__ctid"]
+        features = [self._row_to_feature(layer, row) for row in rows]
+        return FeaturePage(features=features, next_cursor=next_cursor)
+
+    def check_query(self, layer: LayerEntity, query: FeatureQuery) -> None:
+        # 条件值转换与游标校验都在构造语句时完成
+        self._build_select(layer, query, query.limit)
+
+    async def iter_features(self, layer: LayerEntity, query: FeatureQuery) -> AsyncIterator[FeatureEntity]:
+        stmt = self._build_select(layer, query, query.limit)
+        result = await self.session.stream(stmt.execution_options(yield_per=self.batch_size))
+        async for row in result:
+            yield self._row_to_feature(layer, row)
@@ -0,0 +1,56 @@
+"""
+Alembic 迁移环境（异步引擎）
+
+连接串默认取 settings.database_url，可用 `alembic -x url=...` 覆盖。
+sdx 空间表使用独立 MetaData，不参与迁移。
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from user.core.config import settings
+from user.core.database import Base
+from user.infrastructure.database.postgres import models  # noqa: F401  注册模型
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _database_url() -> str:
+    return context.get_x_argument(as_dictionary=True).get("url") or settings.database_url
+
+
+def run_migrations_offline() -> None:
+    """生成 SQL 脚本（alembic upgrade head --sql）"""
+    context.configure(
+        url=_database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(_database_url())
+    async with engine.connect() as connection:
+        await connection.run_sync(_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
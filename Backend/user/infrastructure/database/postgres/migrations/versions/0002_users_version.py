@@ -0,0 +1,21 @@
+"""users.version：资料乐观并发版本号
+
+Revision ID: 0002_users_version
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0002_users_version"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS：兼容此前按 README 手工添加过该列的数据库
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1")
+
+
+def downgrade() -> None:
+    op.drop_column("users", "version")
@@ -0,0 +1,38 @@
+"""users 性能索引：lower(email) 唯一函数索引、created_at、活跃用户部分索引
+
+- 邮箱查询统一按 lower(email)，函数索引同时保证不区分大小写唯一，替换 ix_users_email；
+- 今日新增统计改为 created_at 范围比较，使用 ix_users_created_at；
+- is_active 选择性低，布尔索引替换为 WHERE is_active 的部分索引。
+索引以 CONCURRENTLY 创建/删除，不阻塞线上读写。
+
+Revision ID: 0003_users_performance_indexes
+Revises: 0002_users_version
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0003_users_performance_indexes"
+down_revision = "0002_users_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower ON users (lower(email))")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_created_at ON users (created_at)")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_active_created_at "
+            "ON users (created_at) WHERE is_active"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_is_active")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_is_active ON users (is_active)")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email ON users (email)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_active_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
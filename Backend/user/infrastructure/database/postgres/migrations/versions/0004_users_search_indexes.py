@@ -0,0 +1,39 @@
+"""users 搜索索引：pg_trgm 三元组 GIN 索引与用户名前缀索引
+
+- ix_users_username_trgm / ix_users_email_trgm：支持 ILIKE '%q%' 包含匹配与 <% 词相似度查询；
+- ix_users_username_prefix：C 排序规则，支持 LIKE 'q%' 前缀补全与按用户名排序的键集分页。
+创建 pg_trgm 扩展需要相应权限（云数据库一般已在白名单内）。
+
+Revision ID: 0004_users_search_indexes
+Revises: 0003_users_performance_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0004_users_search_indexes"
+down_revision = "0003_users_performance_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_trgm "
+            "ON users USING gin (username gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_trgm "
+            "ON users USING gin (lower(email) gin_trgm_ops)"
+        )
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_prefix ON users (username COLLATE "C")'
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_username_prefix")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_username_trgm")
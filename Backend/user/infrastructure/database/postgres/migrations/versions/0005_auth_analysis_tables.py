@@ -0,0 +1,65 @@
+"""refresh_tokens、analysis_results
+
+表不存在时才创建：此前由 create_all 或旧版基线迁移建好这两张表的数据库直接跳过。
+
+Revision ID: 0005_auth_analysis_tables
+Revises: 0004_users_search_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_auth_analysis_tables"
+down_revision = "0004_users_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("refresh_tokens"):
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("token_hash", sa.String(64), nullable=False, unique=True),
+            sa.Column("family_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("replaced_by", postgresql.UUID(as_uuid=True), nullable=True),
+        )
+        op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+        op.create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+        op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+    if not inspector.has_table("analysis_results"):
+        op.create_table(
+            "analysis_results",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("analysis_type", sa.String(50), nullable=False),
+            sa.Column("name", sa.String(100), nullable=True),
+            sa.Column("params_hash", sa.String(64), nullable=False),
+            sa.Column("params", postgresql.JSONB(), nullable=False),
+            sa.Column("result", postgresql.JSONB(), nullable=True),
+            sa.Column("result_compressed", sa.LargeBinary(), nullable=True),
+            sa.Column("size_bytes", sa.Integer(), nullable=False),
+            sa.Column("hit_count", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("last_accessed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.UniqueConstraint("user_id", "analysis_type", "params_hash", name="uq_analysis_results_params"),
+        )
+        op.create_index("ix_analysis_results_user_created", "analysis_results", ["user_id", "created_at", "id"])
+        op.create_index("ix_analysis_results_user_accessed", "analysis_results", ["user_id", "last_accessed_at"])
+        op.create_index("ix_analysis_results_expires_at", "analysis_results", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("analysis_results")
+    op.drop_table("refresh_tokens")
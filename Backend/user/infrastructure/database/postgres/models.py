@@ -2,6 +2,8 @@
 PostgreSQL数据库模型模块
 """
 from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, Float, ForeignKey
+from sqlalchemy import Date, Index, LargeBinary, MetaData, Numeric, SmallInteger, Table, UniqueConstraint
+from sqlalchemy.types import NullType
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -9,6 +11,7 @@ from datetime import datetime
 import uuid
 
 from user.core.database import Base
+from user.domains.gis.entities import LayerEntity
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy import BigInteger
 from sqlalchemy.dialects.postgresql import JSONB
@@ -26,14 +29,15 @@ class UserModel(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     username = Column(String(50), unique=True, nullable=False, index=True)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), nullable=False)  # 唯一性由 lower(email) 函数索引保证
     phone = Column(String(20), unique=True, nullable=True, index=True)
     hashed_password = Column(String(255), nullable=False)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, default=1, server_default="1", nullable=False)  # 资料版本号（乐观并发控制）
     
     def __repr__(self):
         return f"<UserModel(id={self.id}, username='{self.username}', email='{self.email}')>"
@@ -53,3 +57,107 @@ class UserModel(Base):
         }
 
 
+# 用户表性能索引（与迁移 0003 保持一致）：
+# - 邮箱按 lower(email) 查找并保证不区分大小写唯一；
+# - 注册时间范围统计走 created_at；
+# - 活跃用户查询/计数走部分索引，只包含 is_active 行。
+Index("ix_users_email_lower", func.lower(UserModel.email), unique=True)
+Index("ix_users_created_at", UserModel.created_at)
+Index("ix_users_active_created_at", UserModel.created_at, postgresql_where=UserModel.is_active)
+# 用户搜索（迁移 0004，需要 pg_trgm 扩展）：三元组 GIN 索引支持包含匹配与相似度查询，
+# C 排序规则的用户名索引支持前缀补全与按用户名的键集分页
+Index("ix_users_username_trgm", UserModel.username, postgresql_using="gin",
+      postgresql_ops={"username": "gin_trgm_ops"})
+Index("ix_users_email_trgm", func.lower(UserModel.email).label("email_lower"), postgresql_using="gin",
+      postgresql_ops={"email_lower": "gin_trgm_ops"})
+Index("ix_users_username_prefix", UserModel.username.collate("C"))
+
+
+class RefreshTokenModel(Base):
+    """刷新令牌表（只存 SHA-256 哈希）"""
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id", "user_id"),
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(UUID(as_uuid=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    replaced_by = Column(UUID(as_uuid=True), nullable=True)
+
+
+class AnalysisResultModel(Base):
+    """空间分析结果数据库模型（大结果压缩存入 result_compressed）"""
+    __tablename__ = "analysis_results"
+    __table_args__ = (
+        UniqueConstraint("user_id", "analysis_type", "params_hash", name="uq_analysis_results_params"),
+        Index("ix_analysis_results_user_created", "user_id", "created_at", "id"),
+        Index("ix_analysis_results_user_accessed", "user_id", "last_accessed_at"),
+        Index("ix_analysis_results_expires_at", "expires_at"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    analysis_type = Column(String(50), nullable=False)
+    name = Column(String(100), nullable=True)
+    params_hash = Column(String(64), nullable=False)
+    params = Column(JSONB, nullable=False)
+    result = Column(JSONB, nullable=True)
+    result_compressed = Column(LargeBinary, nullable=True)
+    size_bytes = Column(Integer, default=0, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<AnalysisResultModel(id={self.id}, user_id={self.user_id}, type='{self.analysis_type}')>"
+
+
+# sdx 空间表不参与建表，单独使用一份 MetaData 按图层元数据动态映射
+sdx_metadata = MetaData()
+
+_SDX_COLUMN_TYPES = {
+    "smallint": SmallInteger,
+    "integer": Integer,
+    "bigint": BigInteger,
+    "real": Float,
+    "double precision": Float,
+    "numeric": Numeric,
+    "boolean": Boolean,
+    "text": Text,
+    "character varying": String,
+    "character": String,
+    "date": Date,
+    "timestamp without time zone": DateTime,
+    "timestamp with time zone": lambda: DateTime(timezone=True),
+}
+
+
+def build_sdx_table(layer: LayerEntity) -> Table:
+    """按图层元数据构建 sdx 空间表映射（几何列使用 GeoAlchemy2 Geometry 类型）"""
+    key = f"{layer.schema}.{layer.name}"
+    table = sdx_metadata.tables.get(key)
+    if table is not None and set(table.c.keys()) == set(layer.columns):
+        return table
+    
+    columns = []
+    for name, data_type in layer.columns.items():
+        if name == layer.geometry_column:
+            column_type = Geometry(
+                geometry_type=layer.geometry_type,
+                srid=layer.srid or -1,
+                spatial_index=False
+            )
+        else:
+            factory = _SDX_COLUMN_TYPES.get(data_type)
+            column_type = factory() if factory else NullType()
+        columns.append(Column(name, column_type, primary_key=(name == layer.id_column)))
+    
+    return Table(layer.name, sdx_metadata, *columns, schema=layer.schema, extend_existing=True)
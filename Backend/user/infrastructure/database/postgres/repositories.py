@@ -3,16 +3,19 @@ PostgreSQL 仓储实现
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Any, cast
+from typing import AsyncIterator, Dict, List, Optional, Any, Set, Tuple, cast
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
 from sqlalchemy import select, update, delete, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from user.domains.user.entities import UserEntity
-from user.domains.user.repositories import UserRepository
-from user.infrastructure.database.postgres.models import UserModel
+from user.domains.user.entities import RefreshTokenEntity, UserEntity
+from user.domains.user.repositories import RefreshTokenRepository, UserRepository
+from user.domains.user.value_objects import UserSearchCursor
+from user.infrastructure.database.postgres.models import RefreshTokenModel, UserModel
+from user.infrastructure.database.postgres import statements
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any, Dict, cast
 
@@ -29,9 +32,32 @@ def _model_to_entity(model: UserModel) -> UserEntity:
         created_at=cast(Optional[datetime], model.created_at),
         updated_at=cast(Optional[datetime], model.updated_at),
         last_login=cast(Optional[datetime], model.last_login),
+        version=cast(int, model.version or 1),
     )
 
 
+def _row_to_entity(row: Any) -> UserEntity:
+    return UserEntity(**row._mapping)
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+_UNIQUE_FIELD_MESSAGES = {"username": "用户名已存在", "email": "邮箱已存在", "phone": "手机号已存在"}
+
+
+def _unique_violation_message(error: IntegrityError) -> Optional[str]:
+    """唯一约束冲突对应的提示（按约束名/DETAIL 中的列名判断）"""
+    detail = str(error.orig)
+    if "unique" not in detail.lower() and "duplicate" not in detail.lower():
+        return None
+    for field, message in _UNIQUE_FIELD_MESSAGES.items():
+        if f"users_{field}" in detail or f"({field})" in detail:
+            return message
+    return None
+
+
 class PostgreSQLUserRepository(UserRepository):
     """基于 SQLAlchemy AsyncSession 的用户仓储实现"""
 
@@ -53,44 +79,33 @@ class PostgreSQLUserRepository(UserRepository):
         await self.session.refresh(model)
         return _model_to_entity(model)
 
+    async def _fetch_one(self, stmt: Any, params: Dict[str, Any]) -> Optional[UserEntity]:
+        row = (await self.session.execute(stmt, params)).first()
+        return _row_to_entity(row) if row else None
+
+    async def _exists(self, stmt: Any, params: Dict[str, Any]) -> bool:
+        return bool((await self.session.execute(stmt, params)).scalar())
+
     async def get_by_id(self, user_id: UUID) -> Optional[UserEntity]:
-        stmt = select(UserModel).where(UserModel.id == user_id)
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
-        return _model_to_entity(model) if model else None
+        return await self._fetch_one(statements.GET_BY_ID, {"user_id": user_id})
 
     async def get_by_email(self, email: str) -> Optional[UserEntity]:
-        stmt = select(UserModel).where(UserModel.email == email.lower().strip())
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
-        return _model_to_entity(model) if model else None
+        return await self._fetch_one(statements.GET_BY_EMAIL, {"email": email.lower().strip()})
 
     async def get_by_username(self, username: str) -> Optional[UserEntity]:
-        stmt = select(UserModel).where(UserModel.username == username.strip())
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
-        return _model_to_entity(model) if model else None
+        return await self._fetch_one(statements.GET_BY_USERNAME, {"username": username.strip()})
 
     async def get_by_phone(self, phone: str) -> Optional[UserEntity]:
         if not phone:
             return None
-        stmt = select(UserModel).where(UserModel.phone == phone.strip())
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
-        return _model_to_entity(model) if model else None
+        return await self._fetch_one(statements.GET_BY_PHONE, {"phone": phone.strip()})
 
     async def get_by_login_identifier(self, identifier: str) -> Optional[UserEntity]:
         identifier = identifier.strip()
-        # username
-        user = await self.get_by_username(identifier)
-        if user:
-            return user
-        # email
-        user = await self.get_by_email(identifier)
-        if user:
-            return user
-        # phone
-        return await self.get_by_phone(identifier)
+        return await self._fetch_one(
+            statements.GET_BY_LOGIN_IDENTIFIER,
+            {"identifier": identifier, "email": identifier.lower()}
+        )
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[UserEntity]:
         stmt = select(UserModel).offset(skip).limit(limit)
@@ -99,7 +114,7 @@ class PostgreSQLUserRepository(UserRepository):
         return [_model_to_entity(m) for m in models]
 
     async def get_active_users(self) -> List[UserEntity]:
-        stmt = select(UserModel).where(UserModel.is_active.is_(True))
+        stmt = select(UserModel).where(UserModel.is_active)
         result = await self.session.execute(stmt)
         models = result.scalars().all()
         return [_model_to_entity(m) for m in models]
@@ -116,13 +131,37 @@ class PostgreSQLUserRepository(UserRepository):
         model = result.scalar_one_or_none()
         return _model_to_entity(model) if model else None
 
-    async def update_last_login(self, user_id: UUID) -> bool:
-        stmt = (
-            update(UserModel)
-            .where(UserModel.id == user_id)
-            .values(last_login=func.now(), updated_at=func.now())
+    async def update_profile(
+        self,
+        user_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[UserEntity]:
+        fields = tuple(sorted(changes))
+        params = {f"new_{field}": changes[field] for field in fields}
+        params["user_id"] = user_id
+        if expected_version is not None:
+            params["expected_version"] = expected_version
+        stmt = statements.update_profile(fields, expected_version is not None)
+        try:
+            row = (await self.session.execute(stmt, params)).first()
+        except IntegrityError as e:
+            # 唯一约束即冲突检查，不再预先逐项查询；失败事务由会话依赖回滚
+            message = _unique_violation_message(e)
+            if message is None:
+                raise
+            raise ValueError(message) from e
+        return _row_to_entity(row) if row else None
+
+    async def replace_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        result = await self.session.execute(
+            statements.REPLACE_PASSWORD_HASH,
+            {"user_id": user_id, "old_hash": old_hash, "new_hash": new_hash}
         )
-        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def update_last_login(self, user_id: UUID) -> bool:
+        result = await self.session.execute(statements.UPDATE_LAST_LOGIN, {"user_id": user_id})
         return result.rowcount > 0
 
     async def delete(self, user_id: UUID) -> bool:
@@ -134,37 +173,65 @@ class PostgreSQLUserRepository(UserRepository):
         stmt = (
             update(UserModel)
             .where(UserModel.id == user_id)
-            .values(is_active=False, updated_at=func.now())
+            .values(is_active=False, version=UserModel.version + 1, updated_at=func.now())
         )
         result = await self.session.execute(stmt)
         return result.rowcount > 0
 
     async def exists_by_username(self, username: str) -> bool:
-        stmt = select(func.count()).select_from(UserModel).where(UserModel.username == username.strip())
-        result = await self.session.execute(stmt)
-        return (result.scalar_one() or 0) > 0
+        return await self._exists(statements.EXISTS_BY_USERNAME, {"username": username.strip()})
 
     async def exists_by_email(self, email: str) -> bool:
-        stmt = select(func.count()).select_from(UserModel).where(UserModel.email == email.lower().strip())
-        result = await self.session.execute(stmt)
-        return (result.scalar_one() or 0) > 0
+        return await self._exists(statements.EXISTS_BY_EMAIL, {"email": email.lower().strip()})
 
     async def exists_by_phone(self, phone: str) -> bool:
         if not phone:
             return False
-        stmt = select(func.count()).select_from(UserModel).where(UserModel.phone == phone.strip())
-        result = await self.session.execute(stmt)
-        return (result.scalar_one() or 0) > 0
+        return await self._exists(statements.EXISTS_BY_PHONE, {"phone": phone.strip()})
 
-    async def get_user_stats(self) -> Dict[str, int]:
-        total_stmt = select(func.count()).select_from(UserModel)
-        active_stmt = select(func.count()).select_from(UserModel).where(UserModel.is_active.is_(True))
-        today = func.current_date()
-        new_today_stmt = select(func.count()).select_from(UserModel).where(func.date(UserModel.created_at) == today)
+    async def find_existing(self, field: str, values: List[str]) -> Set[str]:
+        if not values:
+            return set()
+        result = await self.session.execute(statements.EXISTING_IDENTIFIERS[field], {"values": values})
+        return set(result.scalars().all())
+
+    async def iter_identifiers(self, batch_size: int = 10000) -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+        # 服务端游标分批读取，避免一次性加载整张表
+        result = await self.session.stream(
+            statements.ALL_IDENTIFIERS.execution_options(yield_per=batch_size)
+        )
+        async for username, email, phone in result:
+            yield username, email, phone
 
-        total = (await self.session.execute(total_stmt)).scalar_one()
-        active = (await self.session.execute(active_stmt)).scalar_one()
-        new_today = (await self.session.execute(new_today_stmt)).scalar_one()
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[UserSearchCursor] = None
+    ) -> List[Tuple[UserEntity, float]]:
+        query = query.strip().lower()
+        params: Dict[str, Any] = {"query": query, "pattern": f"%{_like_escape(query)}%", "limit": limit}
+        if after is not None:
+            params.update(after_score=after.score, after_id=after.id)
+        result = await self.session.execute(statements.search_users(after is not None), params)
+        matches = []
+        for row in result:
+            mapping = dict(row._mapping)
+            score = float(mapping.pop("score"))
+            matches.append((UserEntity(**mapping), score))
+        return matches
+
+    async def autocomplete(self, prefix: str, limit: int, after: Optional[str] = None) -> List[UserEntity]:
+        params: Dict[str, Any] = {"pattern": f"{_like_escape(prefix.strip())}%", "limit": limit}
+        if after is not None:
+            params["after"] = after
+        result = await self.session.execute(statements.autocomplete_users(after is not None), params)
+        return [_row_to_entity(row) for row in result]
+
+    async def get_user_stats(self) -> Dict[str, int]:
+        total = (await self.session.execute(statements.COUNT_USERS)).scalar_one()
+        active = (await self.session.execute(statements.COUNT_ACTIVE_USERS)).scalar_one()
+        new_today = (await self.session.execute(statements.COUNT_NEW_USERS_TODAY)).scalar_one()
 
         return {
             "total_users": int(total or 0),
@@ -173,3 +240,89 @@ class PostgreSQLUserRepository(UserRepository):
         }
 
 
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    return value.replace(tzinfo=timezone.utc) if value and value.tzinfo is None else value
+
+
+def _refresh_token_to_entity(model: RefreshTokenModel, username: Optional[str] = None) -> RefreshTokenEntity:
+    return RefreshTokenEntity(
+        id=cast(UUID, model.id),
+        user_id=cast(UUID, model.user_id),
+        token_hash=cast(str, model.token_hash),
+        family_id=cast(UUID, model.family_id),
+        expires_at=cast(datetime, model.expires_at),
+        created_at=cast(Optional[datetime], model.created_at),
+        revoked_at=cast(Optional[datetime], model.revoked_at),
+        replaced_by=cast(Optional[UUID], model.replaced_by),
+        username=username,
+    )
+
+
+class PostgreSQLRefreshTokenRepository(RefreshTokenRepository):
+    """基于 SQLAlchemy AsyncSession 的刷新令牌仓储实现"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, token: RefreshTokenEntity) -> RefreshTokenEntity:
+        self.session.add(RefreshTokenModel(
+            id=token.id,
+            user_id=token.user_id,
+            token_hash=token.token_hash,
+            family_id=token.family_id,
+            created_at=_utc(token.created_at),
+            expires_at=_utc(token.expires_at),
+        ))
+        await self.session.flush()
+        return token
+
+    async def consume(self, token_hash: str, replaced_by: UUID) -> Optional[RefreshTokenEntity]:
+        # 单条 UPDATE ... FROM users 同时完成有效性校验、作废与用户状态检查，并发刷新时只有一个请求成功
+        tokens = RefreshTokenModel.__table__
+        users = UserModel.__table__
+        stmt = (
+            update(tokens)
+            .where(
+                tokens.c.token_hash == token_hash,
+                tokens.c.revoked_at.is_(None),
+                tokens.c.expires_at > func.now(),
+                tokens.c.user_id == users.c.id,
+                users.c.is_active.is_(True),
+            )
+            .values(revoked_at=func.now(), replaced_by=replaced_by)
+            .returning(*tokens.c, users.c.username)
+        )
+        row = (await self.session.execute(stmt)).mappings().first()
+        if row is None:
+            return None
+        return RefreshTokenEntity(**row)
+
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshTokenEntity]:
+        stmt = select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash)
+        model = (await self.session.execute(stmt)).scalar_one_or_none()
+        return _refresh_token_to_entity(model) if model else None
+
+    async def revoke_family(self, family_id: UUID) -> int:
+        stmt = (
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def revoke_user(self, user_id: UUID) -> int:
+        stmt = (
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.user_id == user_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def delete_expired(self) -> int:
+        stmt = delete(RefreshTokenModel).where(RefreshTokenModel.expires_at <= func.now())
+        result = await self.session.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,138 @@
+"""
+用户表热点语句
+
+语句在模块加载时构建一次、以绑定参数执行：
+- 复用同一语句对象，SQLAlchemy 缓存键只计算一次，编译结果命中 query cache；
+- SQL 文本固定，asyncpg 连接级预编译语句缓存（prepared_statement_cache_size）可直接复用；
+- 只查询列（Core），不经过 ORM 对象装配与 identity map。
+"""
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import and_, bindparam, case, exists, func, literal, or_, select, update
+
+from user.infrastructure.database.postgres.models import UserModel
+
+users = UserModel.__table__
+
+USER_COLUMNS = (
+    users.c.id, users.c.email, users.c.username, users.c.hashed_password, users.c.phone,
+    users.c.is_active, users.c.is_superuser, users.c.created_at, users.c.updated_at, users.c.last_login,
+    users.c.version,
+)
+
+GET_BY_ID = select(*USER_COLUMNS).where(users.c.id == bindparam("user_id"))
+# 邮箱条件统一写成 lower(email)，命中 ix_users_email_lower 函数索引
+EMAIL_KEY = func.lower(users.c.email)
+
+GET_BY_EMAIL = select(*USER_COLUMNS).where(EMAIL_KEY == bindparam("email"))
+GET_BY_USERNAME = select(*USER_COLUMNS).where(users.c.username == bindparam("username"))
+GET_BY_PHONE = select(*USER_COLUMNS).where(users.c.phone == bindparam("phone"))
+
+# 登录查找：一次查询覆盖用户名/邮箱/手机号（各自走唯一索引），按 用户名 > 邮箱 > 手机号 取第一条
+GET_BY_LOGIN_IDENTIFIER = (
+    select(*USER_COLUMNS)
+    .where(or_(
+        users.c.username == bindparam("identifier"),
+        EMAIL_KEY == bindparam("email"),
+        users.c.phone == bindparam("identifier"),
+    ))
+    .order_by(case(
+        (users.c.username == bindparam("identifier"), literal(0)),
+        (EMAIL_KEY == bindparam("email"), literal(1)),
+        else_=literal(2),
+    ))
+    .limit(1)
+)
+
+UPDATE_LAST_LOGIN = (
+    update(users)
+    .where(users.c.id == bindparam("user_id"))
+    .values(last_login=func.now(), updated_at=func.now())
+)
+
+# 后台密码哈希升级：哈希未被并发修改时才替换
+REPLACE_PASSWORD_HASH = (
+    update(users)
+    .where(users.c.id == bindparam("user_id"), users.c.hashed_password == bindparam("old_hash"))
+    .values(hashed_password=bindparam("new_hash"))
+)
+
+
+@lru_cache(maxsize=None)
+def update_profile(fields: Tuple[str, ...], check_version: bool):
+    """资料更新：只写变更字段，版本号 +1 并返回新行；check_version 时要求版本号等于 expected_version
+
+    按 (字段组合, 是否比较版本) 缓存，组合有限，SQL 文本同样固定。
+    """
+    stmt = update(users).where(users.c.id == bindparam("user_id"))
+    if check_version:
+        stmt = stmt.where(users.c.version == bindparam("expected_version"))
+    return (
+        stmt.values({
+            **{field: bindparam(f"new_{field}") for field in fields},
+            "version": users.c.version + 1,
+            "updated_at": func.now(),
+        })
+        .returning(*USER_COLUMNS)
+    )
+
+
+EXISTS_BY_USERNAME = select(exists().where(users.c.username == bindparam("username")))
+EXISTS_BY_EMAIL = select(exists().where(EMAIL_KEY == bindparam("email")))
+EXISTS_BY_PHONE = select(exists().where(users.c.phone == bindparam("phone")))
+
+# 批量可用性确认：一次查询返回已占用的值
+EXISTING_IDENTIFIERS = {
+    field: select(column).where(column.in_(bindparam("values", expanding=True)))
+    for field, column in (("username", users.c.username), ("email", EMAIL_KEY), ("phone", users.c.phone))
+}
+
+ALL_IDENTIFIERS = select(users.c.username, users.c.email, users.c.phone)
+
+# 统计：今日新增按时间范围比较（不对列套函数），走 created_at 索引；活跃数走部分索引
+COUNT_USERS = select(func.count()).select_from(users)
+# 条件写成 WHERE is_active（而非 IS true），才能与部分索引谓词匹配
+COUNT_ACTIVE_USERS = select(func.count()).select_from(users).where(users.c.is_active)
+COUNT_NEW_USERS_TODAY = (
+    select(func.count())
+    .select_from(users)
+    .where(users.c.created_at >= func.current_date(), users.c.created_at < func.current_date() + 1)
+)
+
+# 用户搜索（pg_trgm）：包含匹配（ILIKE/LIKE）与词相似度（<%）都由三元组 GIN 索引支持，
+# 相关度取用户名与邮箱的 word_similarity 较大值
+SEARCH_SCORE = func.greatest(
+    func.word_similarity(bindparam("query"), users.c.username),
+    func.word_similarity(bindparam("query"), EMAIL_KEY),
+)
+SEARCH_MATCH = or_(
+    users.c.username.ilike(bindparam("pattern")),
+    EMAIL_KEY.like(bindparam("pattern")),
+    bindparam("query").op("<%")(users.c.username),
+    bindparam("query").op("<%")(EMAIL_KEY),
+)
+
+# 前缀补全按 C 排序规则比较，LIKE 'abc%' 与 ORDER BY 都可走 ix_users_username_prefix
+USERNAME_PREFIX_KEY = users.c.username.collate("C")
+
+
+@lru_cache(maxsize=None)
+def search_users(after: bool):
+    """模糊搜索：相关度降序、id 升序；after 时从游标 (after_score, after_id) 之后继续"""
+    stmt = select(*USER_COLUMNS, SEARCH_SCORE.label("score")).where(SEARCH_MATCH)
+    if after:
+        stmt = stmt.where(or_(
+            SEARCH_SCORE < bindparam("after_score"),
+            and_(SEARCH_SCORE == bindparam("after_score"), users.c.id > bindparam("after_id")),
+        ))
+    return stmt.order_by(SEARCH_SCORE.desc(), users.c.id).limit(bindparam("limit"))
+
+
+@lru_cache(maxsize=None)
+def autocomplete_users(after: bool):
+    """用户名前缀补全：按用户名排序；after 时从上一页最后一个用户名之后继续"""
+    stmt = select(*USER_COLUMNS).where(USERNAME_PREFIX_KEY.like(bindparam("pattern")))
+    if after:
+        stmt = stmt.where(USERNAME_PREFIX_KEY > bindparam("after"))
+    return stmt.order_by(USERNAME_PREFIX_KEY).limit(bindparam("limit"))
@@ -0,0 +1,135 @@
+"""
+Redis 任务仓储（多进程/多实例共享的任务队列）
+
+键设计：
+- job:{id}            任务记录 JSON（带过期时间）
+- job:{id}:cancel     取消标记（与记录分开存放，避免进度写入覆盖取消请求）
+- jobs:queue          待执行队列（LPUSH / BRPOP）
+- jobs:active:{user}  用户进行中任务（ZSET，score 为心跳时间，超时自动回收名额）
+- jobs:user:{user}    用户任务列表（ZSET，score 为创建时间）
+"""
+import json
+import time
+from typing import List, Optional
+
+import redis.asyncio as redis
+
+from user.domains.jobs.entities import JobEntity
+from user.domains.jobs.repositories import JobRepository
+from user.domains.jobs.value_objects import JobStatus
+
+# 回收心跳超时的名额后检查并发上限，未超限则登记并入队（原子执行）
+_ENQUEUE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[4]) - tonumber(ARGV[6]))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[4], ARGV[2])
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[5])
+redis.call('ZADD', KEYS[4], ARGV[4], ARGV[2])
+redis.call('EXPIRE', KEYS[4], ARGV[5])
+redis.call('LPUSH', KEYS[3], ARGV[2])
+return 1
+"""
+
+
+# 仅当记录仍为排队中时写入运行中状态（取消请求与工作进程并发时不覆盖已取消的记录）
+_MARK_RUNNING_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw or cjson.decode(raw)['status'] ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('ZADD', KEYS[2], 'XX', ARGV[4], ARGV[5])
+return 1
+"""
+
+
+class RedisJobRepository(JobRepository):
+    """基于 Redis 的任务仓储"""
+
+    QUEUE_KEY = "jobs:queue"
+
+    def __init__(self, redis_url: str, job_ttl: int = 86400, stale_after: int = 3600):
+        self._redis = redis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+        self._enqueue = self._redis.register_script(_ENQUEUE_SCRIPT)
+        self._mark_running = self._redis.register_script(_MARK_RUNNING_SCRIPT)
+        self.job_ttl = job_ttl
+        self.stale_after = stale_after
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _dumps(job: JobEntity) -> str:
+        data = job.to_dict()
+        data.pop("cancel_requested", None)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+    async def enqueue(self, job: JobEntity, max_active: int) -> bool:
+        result = await self._enqueue(
+            keys=[
+                f"jobs:active:{job.user_id}",
+                self._job_key(job.id),
+                self.QUEUE_KEY,
+                f"jobs:user:{job.user_id}",
+            ],
+            args=[max_active, job.id, self._dumps(job), time.time(), self.job_ttl, self.stale_after],
+        )
+        return bool(result)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        item = await self._redis.brpop(self.QUEUE_KEY, timeout=max(int(timeout), 1))
+        return item[1] if item else None
+
+    async def get(self, job_id: str) -> Optional[JobEntity]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.get(self._job_key(job_id))
+            pipe.exists(f"{self._job_key(job_id)}:cancel")
+            raw, cancelled = await pipe.execute()
+        if not raw:
+            return None
+        job = JobEntity(**json.loads(raw))
+        job.cancel_requested = bool(cancelled)
+        return job
+
+    async def mark_running(self, job: JobEntity) -> bool:
+        job.mark_running()
+        result = await self._mark_running(
+            keys=[self._job_key(job.id), f"jobs:active:{job.user_id}"],
+            args=[JobStatus.QUEUED, self._dumps(job), self.job_ttl, time.time(), job.id],
+        )
+        return bool(result)
+
+    async def save(self, job: JobEntity) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._job_key(job.id), self._dumps(job), ex=self.job_ttl)
+            if job.cancel_requested:
+                pipe.set(f"{self._job_key(job.id)}:cancel", 1, ex=self.job_ttl)
+            # 刷新心跳（仅对仍在进行中的任务生效）
+            pipe.zadd(f"jobs:active:{job.user_id}", {job.id: time.time()}, xx=True)
+            pipe.zadd(f"jobs:user:{job.user_id}", {job.id: time.time()}, nx=True)
+            await pipe.execute()
+
+    async def finish(self, job: JobEntity) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), self._dumps(job), ex=self.job_ttl)
+            if job.cancel_requested:
+                pipe.set(f"{self._job_key(job.id)}:cancel", 1, ex=self.job_ttl)
+            pipe.zrem(f"jobs:active:{job.user_id}", job.id)
+            await pipe.execute()
+
+    async def list_by_user(self, user_id: str, limit: int = 50) -> List[JobEntity]:
+        user_key = f"jobs:user:{user_id}"
+        job_ids = await self._redis.zrevrange(user_key, 0, limit - 1)
+        if not job_ids:
+            return []
+        raws = await self._redis.mget([self._job_key(job_id) for job_id in job_ids])
+        expired = [job_id for job_id, raw in zip(job_ids, raws) if not raw]
+        if expired:
+            await self._redis.zrem(user_key, *expired)
+        return [JobEntity(**json.loads(raw)) for raw in raws if raw]
+
+    async def close(self) -> None:
+        await self._redis.close()
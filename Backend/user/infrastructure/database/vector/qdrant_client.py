@@ -0,0 +1,154 @@
+"""
+Qdrant 异步客户端
+
+基于 httpx 的 REST 客户端，进程内复用同一个连接池；
+批量写入按批次切分并限制并发，检索支持载荷过滤与 HNSW 参数。
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+_DISTANCE_NAMES = {"cosine": "Cosine", "dot": "Dot", "euclid": "Euclid"}
+
+
+class QdrantError(RuntimeError):
+    """Qdrant 请求失败"""
+
+
+def build_filter(payload_filter: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """载荷过滤条件转换为 Qdrant filter（多个字段为 must）"""
+    if not payload_filter:
+        return None
+    must = []
+    for key, condition in payload_filter.items():
+        if isinstance(condition, dict):
+            must.append({"key": key, "range": condition})
+        elif isinstance(condition, list):
+            must.append({"key": key, "match": {"any": condition}})
+        else:
+            must.append({"key": key, "match": {"value": condition}})
+    return {"must": must}
+
+
+class QdrantClient:
+    """Qdrant REST 异步客户端（连接池复用）"""
+    
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str] = None,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        upsert_batch_size: int = 256,
+        upsert_concurrency: int = 4,
+        hnsw_ef: Optional[int] = None
+    ):
+        self.url = url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_concurrency = upsert_concurrency
+        self.hnsw_ef = hnsw_ef
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """延迟创建连接池（需在事件循环内首次使用）"""
+        if self._client is None:
+            headers = {"api-key": self.api_key} if self.api_key else None
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+    
+    async def close(self) -> None:
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        response = await self.client.request(method, path, **kwargs)
+        if response.status_code == 404:
+            return None
+        if response.status_code >= 400:
+            raise QdrantError(f"Qdrant 请求失败 {response.status_code}: {response.text[:200]}")
+        return response.json().get("result")
+    
+    async def get_collection(self, name: str) -> Optional[Dict[str, Any]]:
+        """获取集合信息，不存在时返回 None"""
+        return await self._request("GET", f"/collections/{name}")
+    
+    async def create_collection(
+        self,
+        name: str,
+        dimension: int,
+        distance: str = "cosine",
+        hnsw_m: int = 16,
+        ef_construct: int = 100
+    ) -> None:
+        """创建集合"""
+        await self._request("PUT", f"/collections/{name}", json={
+            "vectors": {"size": dimension, "distance": _DISTANCE_NAMES[distance]},
+            "hnsw_config": {"m": hnsw_m, "ef_construct": ef_construct},
+        })
+    
+    async def create_payload_index(self, name: str, field_name: str, field_schema: str = "keyword") -> None:
+        """为过滤字段建立载荷索引"""
+        await self._request("PUT", f"/collections/{name}/index", params={"wait": "true"}, json={
+            "field_name": field_name,
+            "field_schema": field_schema,
+        })
+    
+    async def upsert(self, name: str, points: Sequence[Dict[str, Any]]) -> int:
+        """分批并发写入，返回写入数量"""
+        semaphore = asyncio.Semaphore(self.upsert_concurrency)
+        
+        async def send(batch: Sequence[Dict[str, Any]]) -> None:
+            async with semaphore:
+                await self._request(
+                    "PUT", f"/collections/{name}/points",
+                    params={"wait": "true"}, json={"points": list(batch)}
+                )
+        
+        batches = [
+            points[i:i + self.upsert_batch_size]
+            for i in range(0, len(points), self.upsert_batch_size)
+        ]
+        await asyncio.gather(*(send(batch) for batch in batches))
+        return len(points)
+    
+    async def search(
+        self,
+        name: str,
+        vector: Sequence[float],
+        limit: int = 10,
+        payload_filter: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """kNN 检索，返回 [{id, score, payload}]"""
+        body: Dict[str, Any] = {"vector": list(vector), "limit": limit, "with_payload": True}
+        query_filter = build_filter(payload_filter)
+        if query_filter:
+            body["filter"] = query_filter
+        if score_threshold is not None:
+            body["score_threshold"] = score_threshold
+        if self.hnsw_ef:
+            body["params"] = {"hnsw_ef": self.hnsw_ef}
+        return await self._request("POST", f"/collections/{name}/points/search", json=body) or []
+    
+    async def delete(self, name: str, ids: Sequence[Any]) -> int:
+        """按ID删除向量"""
+        await self._request(
+            "POST", f"/collections/{name}/points/delete",
+            params={"wait": "true"}, json={"points": list(ids)}
+        )
+        return len(ids)
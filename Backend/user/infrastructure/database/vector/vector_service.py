@@ -0,0 +1,181 @@
+"""
+向量仓储实现
+
+- QdrantVectorRepository：基于 Qdrant 的生产实现（HNSW 索引）
+- InMemoryVectorRepository：NumPy 暴力检索实现，用于测试与离线运行
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from user.domains.knowledge.entities import CollectionInfo, PointId, SearchHit, VectorRecord
+from user.domains.knowledge.repositories import VectorRepository
+from user.domains.knowledge.value_objects import VectorQuery, match_payload
+from user.infrastructure.database.vector.qdrant_client import QdrantClient
+
+_DISTANCE_KEYS = {"Cosine": "cosine", "Dot": "dot", "Euclid": "euclid"}
+
+
+class QdrantVectorRepository(VectorRepository):
+    """Qdrant 向量仓储"""
+
+    def __init__(self, client: QdrantClient):
+        self.client = client
+
+    async def ensure_collection(self, name: str, dimension: int, distance: str = "cosine") -> CollectionInfo:
+        info = await self.get_collection(name)
+        if info:
+            return info
+        await self.client.create_collection(name, dimension, distance)
+        return CollectionInfo(name=name, dimension=dimension, distance=distance, count=0)
+
+    async def get_collection(self, name: str) -> Optional[CollectionInfo]:
+        result = await self.client.get_collection(name)
+        if not result:
+            return None
+        vectors = result["config"]["params"]["vectors"]
+        return CollectionInfo(
+            name=name,
+            dimension=vectors["size"],
+            distance=_DISTANCE_KEYS.get(vectors["distance"], vectors["distance"].lower()),
+            count=result.get("points_count") or 0,
+        )
+
+    async def upsert(self, collection: str, records: Sequence[VectorRecord]) -> int:
+        points = [{"id": r.id, "vector": list(r.vector), "payload": r.payload} for r in records]
+        return await self.client.upsert(collection, points)
+
+    async def search(self, query: VectorQuery) -> List[SearchHit]:
+        results = await self.client.search(
+            query.collection,
+            query.vector,
+            limit=query.limit,
+            payload_filter=query.payload_filter,
+            score_threshold=query.score_threshold
+        )
+        return [SearchHit(id=r["id"], score=r["score"], payload=r.get("payload") or {}) for r in results]
+
+    async def delete(self, collection: str, ids: Sequence[PointId]) -> int:
+        return await self.client.delete(collection, ids)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class _MemoryCollection:
+    """单个内存集合：连续的 float32 矩阵 + 载荷列表，按需倍增扩容"""
+
+    def __init__(self, name: str, dimension: int, distance: str):
+        self.name = name
+        self.dimension = dimension
+        self.distance = distance
+        self.matrix = np.zeros((1024, dimension), dtype=np.float32)
+        self.alive = np.zeros(1024, dtype=bool)
+        self.size = 0
+        self.ids: List[PointId] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.rows: Dict[PointId, int] = {}
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        if self.distance == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return vectors / norms
+        return vectors
+
+    def upsert(self, records: Sequence[VectorRecord]) -> int:
+        vectors = self._prepare(np.asarray([r.vector for r in records], dtype=np.float32))
+        needed = self.size + sum(1 for r in records if r.id not in self.rows)
+        if needed > len(self.matrix):
+            capacity = max(needed, len(self.matrix) * 2)
+            matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+            matrix[:self.size] = self.matrix[:self.size]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self.size] = self.alive[:self.size]
+            self.matrix, self.alive = matrix, alive
+        for record, vector in zip(records, vectors):
+            row = self.rows.get(record.id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.rows[record.id] = row
+                self.ids.append(record.id)
+                self.payloads.append(record.payload)
+            else:
+                self.payloads[row] = record.payload
+            self.matrix[row] = vector
+            self.alive[row] = True
+        return len(records)
+
+    def delete(self, ids: Sequence[PointId]) -> int:
+        count = 0
+        for point_id in ids:
+            row = self.rows.pop(point_id, None)
+            if row is not None:
+                self.alive[row] = False
+                count += 1
+        return count
+
+    def search(self, query: VectorQuery) -> List[SearchHit]:
+        size = self.size
+        matrix, alive = self.matrix[:size], self.alive[:size].copy()
+        if query.payload_filter:
+            alive &= np.fromiter(
+                (match_payload(p, query.payload_filter) for p in self.payloads[:size]),
+                dtype=bool, count=size
+            )
+        candidates = np.flatnonzero(alive)
+        if len(candidates) == 0:
+            return []
+        vector = self._prepare(np.asarray([query.vector], dtype=np.float32))[0]
+        if self.distance == "euclid":
+            # 与 Qdrant 一致：欧氏距离越小越相近
+            scores = np.linalg.norm(matrix[candidates] - vector, axis=1)
+            order_scores = -scores
+        else:
+            scores = matrix[candidates] @ vector
+            order_scores = scores
+        k = min(query.limit, len(candidates))
+        top = np.argpartition(-order_scores, k - 1)[:k]
+        top = top[np.argsort(-order_scores[top])]
+        hits = []
+        for index in top:
+            score = float(scores[index])
+            if query.score_threshold is not None:
+                if self.distance == "euclid" and score > query.score_threshold:
+                    continue
+                if self.distance != "euclid" and score < query.score_threshold:
+                    continue
+            row = candidates[index]
+            hits.append(SearchHit(id=self.ids[row], score=score, payload=self.payloads[row]))
+        return hits
+
+    def info(self) -> CollectionInfo:
+        return CollectionInfo(self.name, self.dimension, self.distance, len(self.rows))
+
+
+class InMemoryVectorRepository(VectorRepository):
+    """进程内向量仓储（NumPy 暴力检索），未配置 Qdrant 时使用"""
+
+    def __init__(self):
+        self.collections: Dict[str, _MemoryCollection] = {}
+
+    async def ensure_collection(self, name: str, dimension: int, distance: str = "cosine") -> CollectionInfo:
+        if name not in self.collections:
+            self.collections[name] = _MemoryCollection(name, dimension, distance)
+        return self.collections[name].info()
+
+    async def get_collection(self, name: str) -> Optional[CollectionInfo]:
+        collection = self.collections.get(name)
+        return collection.info() if collection else None
+
+    async def upsert(self, collection: str, records: Sequence[VectorRecord]) -> int:
+        return self.collections[collection].upsert(records)
+
+    async def search(self, query: VectorQuery) -> List[SearchHit]:
+        # 矩阵运算释放 GIL，放到线程中避免阻塞事件循环
+        return await asyncio.to_thread(self.collections[query.collection].search, query)
+
+    async def delete(self, collection: str, ids: Sequence[PointId]) -> int:
+        return self.collections[collection].delete(ids)
@@ -0,0 +1,372 @@
+"""
+GIS 响应编码模块
+
+对 GeoJSON 要素集合做按级别的几何简化（Douglas–Peucker / Visvalingam–Whyatt）
+与坐标量化，并提供 GeoJSON、TopoJSON 与 FlatGeobuf 三种输出编码。
+简化与量化均在 NumPy 坐标数组上向量化计算。
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # 未安装 orjson 时退回标准库
+    orjson = None
+
+try:
+    import fiona  # type: ignore
+    from fiona.io import MemoryFile  # type: ignore
+except Exception:  # 允许在无 fiona/GDAL 环境下导入通过
+    fiona = None
+    MemoryFile = None
+
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+TOPOJSON_MEDIA_TYPE = "application/topo+json"
+FLATGEOBUF_MEDIA_TYPE = "application/flatgeobuf"
+
+SIMPLIFY_METHODS = ("dp", "vw")
+
+# 经纬度坐标下 256px 瓦片每像素对应的度数（0 级）
+_DEGREES_PER_PIXEL_Z0 = 360.0 / 256
+
+
+def tolerance_for_zoom(zoom: float, pixels: float = 0.5) -> float:
+    """按缩放级别计算简化容差（度），约等于屏幕上 pixels 个像素"""
+    return _DEGREES_PER_PIXEL_Z0 / (2 ** zoom) * pixels
+
+
+def precision_for_zoom(zoom: float) -> int:
+    """按缩放级别确定坐标保留的小数位：精度略高于一个像素即可"""
+    resolution = _DEGREES_PER_PIXEL_Z0 / (2 ** zoom)
+    return int(min(max(np.ceil(-np.log10(resolution)) + 1, 1), 8))
+
+
+def simplify_dp(coords: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas–Peucker 简化：每段的最大偏离点在 NumPy 上一次求出"""
+    n = len(coords)
+    if n < 3 or tolerance <= 0:
+        return coords
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = coords[start + 1:end]
+        a, b = coords[start], coords[end]
+        ab = b - a
+        length = np.hypot(ab[0], ab[1])
+        if length == 0:
+            distances = np.hypot(segment[:, 0] - a[0], segment[:, 1] - a[1])
+        else:
+            distances = np.abs(ab[0] * (segment[:, 1] - a[1]) - ab[1] * (segment[:, 0] - a[0])) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return coords[keep]
+
+
+def simplify_vw(coords: np.ndarray, tolerance: float) -> np.ndarray:
+    """Visvalingam–Whyatt 简化：以容差平方为面积阈值
+
+    每轮向量化计算全部内点的三角形面积，批量删除面积低于阈值的局部极小点
+    （局部极小点互不相邻，可同时删除），直到没有可删点。
+    """
+    min_area = tolerance * tolerance
+    while len(coords) > 2:
+        a, b, c = coords[:-2], coords[1:-1], coords[2:]
+        areas = np.abs(
+            (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (b[:, 1] - a[:, 1])
+        ) * 0.5
+        left = np.concatenate(([np.inf], areas[:-1]))
+        right = np.concatenate((areas[1:], [np.inf]))
+        removable = (areas < min_area) & (areas <= left) & (areas < right)
+        if not removable.any():
+            break
+        keep = np.ones(len(coords), dtype=bool)
+        keep[1:-1] = ~removable
+        coords = coords[keep]
+    return coords
+
+
+_SIMPLIFIERS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "dp": simplify_dp,
+    "vw": simplify_vw,
+}
+
+
+def _transform_line(
+    coords: List[Any],
+    simplify: Optional[Callable[[np.ndarray, float], np.ndarray]],
+    tolerance: float,
+    precision: Optional[int],
+    ring: bool = False
+) -> Optional[List[Any]]:
+    """简化并量化一条线/环，环退化（少于 4 个点）时返回 None"""
+    array = np.asarray(coords, dtype=np.float64)
+    if array.ndim != 2 or len(array) == 0:
+        return coords
+    if simplify is not None and tolerance > 0:
+        if ring:
+            # 闭合环首尾相同，拆开简化后重新闭合
+            array = np.vstack([simplify(array[:-1], tolerance), array[:1]])
+        else:
+            array = simplify(array, tolerance)
+    if ring and len(array) < 4:
+        return None
+    if precision is not None:
+        array = np.round(array, precision)
+    return array.tolist()
+
+
+def transform_geometry(
+    geometry: Optional[Dict[str, Any]],
+    tolerance: float = 0.0,
+    precision: Optional[int] = None,
+    method: str = "dp"
+) -> Optional[Dict[str, Any]]:
+    """对 GeoJSON 几何做简化与坐标量化，面退化时返回 None"""
+    if not geometry:
+        return geometry
+    simplify = _SIMPLIFIERS[method] if tolerance > 0 else None
+    kind = geometry.get("type")
+    coords = geometry.get("coordinates")
+
+    def line(c: List[Any]) -> Optional[List[Any]]:
+        return _transform_line(c, simplify, tolerance, precision)
+
+    def polygon(rings: List[Any]) -> Optional[List[Any]]:
+        result = [_transform_line(r, simplify, tolerance, precision, ring=True) for r in rings]
+        if not result or result[0] is None:
+            return None
+        return [r for r in result if r is not None]
+
+    if kind == "Point":
+        new = np.round(np.asarray(coords), precision).tolist() if precision is not None else coords
+    elif kind in ("MultiPoint", "LineString"):
+        new = line(coords) if kind == "LineString" else _transform_line(coords, None, 0, precision)
+    elif kind == "MultiLineString":
+        new = [line(c) for c in coords]
+    elif kind == "Polygon":
+        new = polygon(coords)
+    elif kind == "MultiPolygon":
+        new = [p for p in (polygon(c) for c in coords) if p is not None] or None
+    elif kind == "GeometryCollection":
+        members = [transform_geometry(g, tolerance, precision, method) for g in geometry.get("geometries", [])]
+        return {"type": kind, "geometries": [g for g in members if g is not None]}
+    else:
+        return geometry
+    if new is None:
+        return None
+    return {"type": kind, "coordinates": new}
+
+
+def transform_collection(
+    collection: Dict[str, Any],
+    zoom: Optional[float] = None,
+    method: str = "dp",
+    pixels: float = 0.5,
+    precision: Optional[int] = None
+) -> Dict[str, Any]:
+    """按缩放级别简化/量化整个要素集合（坐标为经纬度），退化的面要素被剔除"""
+    if method not in _SIMPLIFIERS:
+        raise ValueError(f"不支持的简化算法: {method}")
+    tolerance = tolerance_for_zoom(zoom, pixels) if zoom is not None else 0.0
+    if precision is None and zoom is not None:
+        precision = precision_for_zoom(zoom)
+    features = []
+    for feature in collection.get("features", []):
+        geometry = transform_geometry(feature.get("geometry"), tolerance, precision, method)
+        if geometry is None and feature.get("geometry") is not None:
+            continue
+        features.append({**feature, "geometry": geometry})
+    return {**collection, "features": features}
+
+
+def dumps(data: Any) -> bytes:
+    """紧凑 JSON 编码（优先 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_geojson(collection: Dict[str, Any]) -> bytes:
+    """GeoJSON 编码"""
+    return dumps(collection)
+
+
+def _parts_of(geometry: Optional[Dict[str, Any]]) -> List[Any]:
+    """几何中的坐标序列（点、线、环各为一个 (n, 2+) 序列；洞与多面的各部分长度可以不同）"""
+    if not geometry:
+        return []
+    kind = geometry.get("type")
+    coords = geometry.get("coordinates")
+    if kind == "GeometryCollection":
+        return [part for g in geometry.get("geometries", []) for part in _parts_of(g)]
+    if not coords:
+        return []
+    if kind == "Point":
+        return [[coords]]
+    if kind in ("MultiPoint", "LineString"):
+        return [coords]
+    if kind in ("MultiLineString", "Polygon"):
+        return list(coords)
+    if kind == "MultiPolygon":
+        return [ring for polygon in coords for ring in polygon]
+    return []
+
+
+def _bbox_of(collection: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    arrays = [
+        np.asarray(part, dtype=np.float64)[:, :2]
+        for feature in collection.get("features", [])
+        for part in _parts_of(feature.get("geometry"))
+        if len(part)
+    ]
+    if not arrays:
+        return (0.0, 0.0, 0.0, 0.0)
+    points = np.concatenate(arrays)
+    return (*points.min(axis=0).tolist(), *points.max(axis=0).tolist())
+
+
+def encode_topojson(collection: Dict[str, Any], quantization: int = 100000) -> bytes:
+    """TopoJSON 编码：整数量化 + 差分编码的弧段（每条线/环一条弧，不做共享边合并）"""
+    min_x, min_y, max_x, max_y = _bbox_of(collection)
+    kx = (max_x - min_x) / (quantization - 1) or 1.0
+    ky = (max_y - min_y) / (quantization - 1) or 1.0
+    scale = np.array([kx, ky])
+    translate = np.array([min_x, min_y])
+    arcs: List[Any] = []
+
+    def quantize(coords: Any) -> np.ndarray:
+        return np.round((np.asarray(coords, dtype=np.float64)[..., :2] - translate) / scale).astype(np.int64)
+
+    def arc(coords: Any) -> int:
+        q = quantize(coords)
+        delta = np.vstack([q[:1], np.diff(q, axis=0)])
+        arcs.append(delta.tolist())
+        return len(arcs) - 1
+
+    def convert(geometry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not geometry:
+            return {"type": None}
+        kind = geometry["type"]
+        coords = geometry.get("coordinates")
+        if kind == "Point":
+            return {"type": kind, "coordinates": quantize(coords).tolist()}
+        if kind == "MultiPoint":
+            return {"type": kind, "coordinates": quantize(coords).tolist()}
+        if kind == "LineString":
+            return {"type": kind, "arcs": [arc(coords)]}
+        if kind in ("MultiLineString", "Polygon"):
+            return {"type": kind, "arcs": [[arc(c)] for c in coords]}
+        if kind == "MultiPolygon":
+            return {"type": kind, "arcs": [[[arc(r)] for r in p] for p in coords]}
+        if kind == "GeometryCollection":
+            return {"type": kind, "geometries": [convert(g) for g in geometry.get("geometries", [])]}
+        return {"type": None}
+
+    geometries = []
+    for feature in collection.get("features", []):
+        item = convert(feature.get("geometry"))
+        if feature.get("id") is not None:
+            item["id"] = feature["id"]
+        if feature.get("properties"):
+            item["properties"] = feature["properties"]
+        geometries.append(item)
+
+    topology = {
+        "type": "Topology",
+        "transform": {"scale": scale.tolist(), "translate": translate.tolist()},
+        "objects": {"features": {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": arcs,
+    }
+    extra = {k: v for k, v in collection.items() if k not in ("type", "features")}
+    if extra:
+        topology["metadata"] = extra
+    return dumps(topology)
+
+
+def _fiona_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    return "str"
+
+
+def _fiona_value(value: Any, kind: str) -> Any:
+    if value is None or kind != "str":
+        return value
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+
+
+def encode_flatgeobuf(collection: Dict[str, Any]) -> bytes:
+    """FlatGeobuf 编码（通过 fiona/GDAL 写入内存文件，附带空间索引）"""
+    if MemoryFile is None:
+        raise RuntimeError("FlatGeobuf 编码需要安装 fiona")
+    features = [f for f in collection.get("features", []) if f.get("geometry")]
+    properties: Dict[str, str] = {}
+    for feature in features:
+        for key, value in (feature.get("properties") or {}).items():
+            if value is not None and key not in properties:
+                properties[key] = _fiona_type(value)
+    schema = {"geometry": "Unknown", "properties": properties}
+    with MemoryFile() as memfile:
+        with memfile.open(driver="FlatGeobuf", schema=schema, crs="EPSG:4326") as sink:
+            sink.writerecords(
+                {
+                    "geometry": f["geometry"],
+                    "properties": {
+                        k: _fiona_value((f.get("properties") or {}).get(k), kind)
+                        for k, kind in properties.items()
+                    },
+                }
+                for f in features
+            )
+        return memfile.read()
+
+
+ENCODERS: Dict[str, Callable[[Dict[str, Any]], bytes]] = {
+    GEOJSON_MEDIA_TYPE: encode_geojson,
+    TOPOJSON_MEDIA_TYPE: encode_topojson,
+    FLATGEOBUF_MEDIA_TYPE: encode_flatgeobuf,
+}
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """根据 Accept 头选择编码，未声明或不支持时使用 GeoJSON"""
+    if accept:
+        candidates = []
+        for index, part in enumerate(accept.split(",")):
+            pieces = part.strip().split(";")
+            media_type = pieces[0].strip().lower()
+            quality = 1.0
+            for param in pieces[1:]:
+                name, _, value = param.strip().partition("=")
+                if name == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            candidates.append((-quality, index, media_type))
+        for _, _, media_type in sorted(candidates):
+            if media_type == FLATGEOBUF_MEDIA_TYPE and MemoryFile is None:
+                continue
+            if media_type in ENCODERS:
+                return media_type
+    return GEOJSON_MEDIA_TYPE
+
+
+def encode_collection(collection: Dict[str, Any], media_type: str) -> bytes:
+    """按媒体类型编码要素集合"""
+    return ENCODERS[media_type](collection)
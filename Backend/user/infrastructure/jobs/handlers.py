@@ -0,0 +1,105 @@
+"""
+后台任务处理函数
+
+在独立进程中执行（需可被 pickle 引用：模块级函数，仅依赖 shapely/pyproj）。
+签名统一为 handler(params, report) -> 结果，report(progress, message) 回报进度，
+任务被取消时 report 会抛出 JobCancelled。
+"""
+from typing import Any, Callable, Dict, List
+
+import shapely
+from shapely.errors import ShapelyError
+from shapely.geometry import MultiPoint, box, mapping, shape
+from shapely.ops import transform
+from shapely.strtree import STRtree
+
+Report = Callable[..., None]
+
+_UNIT_METERS = {"meters": 1.0, "kilometers": 1000.0}
+
+
+def _to_shape(value: Any, label: str):
+    """解析 GeoJSON 几何或 Feature，缺失或格式不正确时抛出 ValueError"""
+    if isinstance(value, dict) and value.get("type") == "Feature":
+        value = value.get("geometry")
+    if not isinstance(value, dict) or not value.get("type"):
+        raise ValueError(f"{label}缺少 geometry")
+    try:
+        return shape(value)
+    except (KeyError, TypeError, ValueError, ShapelyError):
+        raise ValueError(f"{label}的 geometry 不是有效的 GeoJSON 几何")
+
+
+def thiessen(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """泰森多边形：points 为 GeoJSON 点列表（可带 properties），extent 为裁剪范围"""
+    points = params.get("points") or []
+    if len(points) < 2:
+        raise ValueError("泰森多边形至少需要2个点")
+    report(0.05, "解析点数据")
+    geometries = [_to_shape(p, f"第 {i + 1} 个点") for i, p in enumerate(points)]
+    properties: List[Dict[str, Any]] = [p.get("properties") or {} for p in points]
+    multipoint = MultiPoint(geometries)
+    extent = params.get("extent")
+    clip = box(*extent) if extent else multipoint.envelope.buffer(
+        max(multipoint.envelope.bounds[2] - multipoint.envelope.bounds[0],
+            multipoint.envelope.bounds[3] - multipoint.envelope.bounds[1]) * 0.05 or 1e-6,
+        join_style=2
+    )
+    
+    report(0.2, "计算 Voronoi 图")
+    cells = shapely.get_parts(shapely.voronoi_polygons(multipoint, extend_to=clip))
+    cells = shapely.intersection(cells, clip)
+    
+    report(0.7, "关联点属性")
+    # voronoi_polygons 输出顺序与输入无关，按“包含点”重新关联
+    tree = STRtree(cells)
+    point_index, cell_index = tree.query(geometries, predicate="intersects")
+    owner = dict(zip(cell_index.tolist(), point_index.tolist()))
+    
+    features = []
+    total = len(cells)
+    for i, cell in enumerate(cells):
+        if cell.is_empty:
+            continue
+        source = owner.get(i)
+        features.append({
+            "type": "Feature",
+            "geometry": mapping(cell),
+            "properties": {**(properties[source] if source is not None else {}), "point_index": source},
+        })
+        if i % 1000 == 0:
+            report(0.7 + 0.3 * i / total)
+    return {"type": "FeatureCollection", "features": features}
+
+
+def buffer(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """缓冲区：geometry 为 GeoJSON（EPSG:4326），distance 按 unit 计，在局部等距投影中计算"""
+    from pyproj import Transformer
+    
+    geometry = _to_shape(params.get("geometry"), "缓冲区参数")
+    distance = float(params.get("distance", 0)) * _UNIT_METERS.get(params.get("unit", "meters"), 1.0)
+    if distance <= 0:
+        raise ValueError("缓冲距离必须大于0")
+    report(0.1, "构建局部投影")
+    center = geometry.centroid
+    local = f"+proj=aeqd +lat_0={center.y} +lon_0={center.x} +datum=WGS84 +units=m"
+    forward = Transformer.from_crs("EPSG:4326", local, always_xy=True).transform
+    backward = Transformer.from_crs(local, "EPSG:4326", always_xy=True).transform
+    
+    report(0.4, "计算缓冲区")
+    buffered = transform(backward, transform(forward, geometry).buffer(distance, quad_segs=16))
+    report(0.9)
+    return {
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "geometry": mapping(buffered),
+            "properties": {"distance": distance, "unit": "meters"},
+        }],
+    }
+
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], Report], Any]] = {
+    "thiessen": thiessen,
+    "buffer": buffer,
+}
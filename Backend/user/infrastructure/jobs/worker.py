@@ -0,0 +1,218 @@
+"""
+后台任务工作器
+
+每个服务进程启动若干消费协程，从任务队列取出任务后在独立子进程中执行，
+避免 CPU 密集的分析阻塞事件循环。进度与取消标记通过 multiprocessing.Manager
+的共享字典在父子进程间传递；任务结果经管道返回，交给 result_sink 持久化。
+
+每个任务独占一个子进程（同时运行的子进程数不超过 max_workers）：
+处理函数不回报进度时，取消与超时也能通过结束子进程生效，且不影响其它任务。
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from user.domains.jobs.entities import JobEntity
+from user.domains.jobs.repositories import JobRepository
+from user.domains.jobs.value_objects import JobCancelled, JobStatus
+
+logger = logging.getLogger(__name__)
+
+ResultSink = Callable[[JobEntity, Any], Awaitable[Optional[str]]]
+
+
+def run_job(handler: Callable[..., Any], job_id: str, params: Dict[str, Any], shared: Any) -> Any:
+    """执行处理函数并通过共享字典回报进度"""
+    cancel_key = f"{job_id}:cancel"
+    
+    def report(progress: float, message: Optional[str] = None) -> None:
+        shared[job_id] = (float(progress), message)
+        if shared.get(cancel_key):
+            raise JobCancelled()
+    
+    return handler(params, report)
+
+
+def _job_process(handler: Callable[..., Any], job_id: str, params: Dict[str, Any], shared: Any, conn: Any) -> None:
+    """子进程入口：结果或异常经管道发回"""
+    try:
+        conn.send((True, run_job(handler, job_id, params, shared)))
+    except BaseException as e:
+        try:
+            conn.send((False, e))
+        except Exception:  # 异常对象无法 pickle
+            conn.send((False, RuntimeError(str(e) or e.__class__.__name__)))
+    finally:
+        conn.close()
+
+
+def _receive(conn: Any) -> Any:
+    """等待子进程结果（在线程中阻塞）；子进程被结束时抛出 EOFError"""
+    try:
+        ok, value = conn.recv()
+    finally:
+        conn.close()
+    if not ok:
+        raise value
+    return value
+
+
+class JobWorker:
+    """任务工作器（队列消费 + 子进程执行）"""
+    
+    def __init__(
+        self,
+        job_repository: JobRepository,
+        handlers: Dict[str, Callable[..., Any]],
+        result_sink: ResultSink,
+        max_workers: int = 2,
+        consumers: int = 2,
+        poll_interval: float = 0.5,
+        heartbeat_interval: float = 30.0,
+        job_timeout: float = 1800.0,
+        cancel_grace: float = 2.0
+    ):
+        self.job_repository = job_repository
+        self.handlers = handlers
+        self.result_sink = result_sink
+        self.max_workers = max_workers
+        self.consumers = consumers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.job_timeout = job_timeout
+        self.cancel_grace = cancel_grace
+        self._context: Any = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._processes: Set[Any] = set()
+        self._manager: Any = None
+        self._shared: Any = None
+        self._tasks: List[asyncio.Task] = []
+    
+    async def start(self) -> None:
+        """启动共享字典与消费协程"""
+        if self._tasks:
+            return
+        # 服务进程已有事件循环与线程，使用 spawn 避免 fork 带来的状态复制问题
+        self._context = multiprocessing.get_context("spawn")
+        self._manager = self._context.Manager()
+        self._shared = self._manager.dict()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.consumers)]
+    
+    async def stop(self) -> None:
+        """停止消费并结束子进程（运行中的任务标记为失败）"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for process in list(self._processes):
+            process.kill()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+    
+    async def _consume(self) -> None:
+        while True:
+            try:
+                job_id = await self.job_repository.dequeue(timeout=1.0)
+                if job_id is None:
+                    continue
+                job = await self.job_repository.get(job_id)
+                if job is None or job.is_terminal:
+                    continue
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("后台任务消费异常")
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _run(self, job: JobEntity) -> None:
+        async with self._slots:
+            # 仅当任务仍在排队时转为运行中（期间被取消的任务不再执行）
+            if not await self.job_repository.mark_running(job):
+                return
+            await self._execute(job)
+    
+    async def _execute(self, job: JobEntity) -> None:
+        loop = asyncio.get_running_loop()
+        cancel_key = f"{job.id}:cancel"
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_job_process,
+            args=(self.handlers[job.job_type], job.id, job.params, self._shared, sender),
+            daemon=True
+        )
+        process.start()
+        sender.close()
+        self._processes.add(process)
+        future = loop.run_in_executor(None, _receive, receiver)
+        # 服务关闭时结果可能无人读取，避免“异常未被获取”告警
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        
+        deadline = time.monotonic() + self.job_timeout
+        last_saved = time.monotonic()
+        timed_out = False
+        kill_at: Optional[float] = None
+        try:
+            while True:
+                wait = self.poll_interval if timed_out else min(self.poll_interval, max(deadline - time.monotonic(), 0))
+                done, _ = await asyncio.wait({future}, timeout=wait)
+                if done:
+                    break
+                if not timed_out and time.monotonic() >= deadline:
+                    # 超时不等待进度回报，直接结束子进程
+                    timed_out = True
+                    process.kill()
+                    continue
+                changed = False
+                progress = self._shared.get(job.id)
+                if progress and (progress[0], progress[1] or job.message) != (job.progress, job.message):
+                    job.progress, job.message = progress[0], progress[1] or job.message
+                    changed = True
+                if kill_at is None:
+                    latest = await self.job_repository.get(job.id)
+                    if latest is not None and latest.cancel_requested:
+                        # 先请求处理函数在下次回报进度时退出，宽限期后结束子进程
+                        job.cancel_requested = True
+                        self._shared[cancel_key] = True
+                        kill_at = time.monotonic() + self.cancel_grace
+                elif time.monotonic() >= kill_at:
+                    process.kill()
+                if changed or time.monotonic() - last_saved > self.heartbeat_interval:
+                    await self.job_repository.save(job)
+                    last_saved = time.monotonic()
+            
+            try:
+                result = future.result()
+            except EOFError:
+                if job.cancel_requested or timed_out:
+                    raise JobCancelled()
+                raise RuntimeError(f"任务进程异常退出（退出码 {process.exitcode}）")
+            if job.cancel_requested or timed_out:
+                raise JobCancelled()
+            job.result_id = await self.result_sink(job, result)
+            job.mark_finished(JobStatus.SUCCEEDED, message="任务完成")
+        except JobCancelled:
+            if timed_out:
+                job.mark_finished(JobStatus.FAILED, error="任务执行超时")
+            else:
+                job.mark_finished(JobStatus.CANCELLED, message="任务已取消")
+        except ValueError as e:
+            # 参数不合法等业务错误，直接回报给用户
+            job.mark_finished(JobStatus.FAILED, error=str(e))
+        except Exception as e:
+            logger.exception("后台任务执行失败: %s", job.id)
+            job.mark_finished(JobStatus.FAILED, error=str(e) or e.__class__.__name__)
+        finally:
+            if process.is_alive():
+                process.kill()
+            await loop.run_in_executor(None, process.join, 1)
+            self._processes.discard(process)
+            self._shared.pop(job.id, None)
+            self._shared.pop(cancel_key, None)
+            if not job.is_terminal:
+                job.mark_finished(JobStatus.FAILED, error="服务关闭，任务中断")
+            await self.job_repository.finish(job)
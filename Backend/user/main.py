@@ -1,14 +1,27 @@
 """
 SuperMap GIS + AI Backend - FastAPI应用主入口
 """
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from user.core.config import settings
 from user.api.v1 import api_v1_router
+from user.api.v1.user.admin import get_current_superuser_id
+from user.core.container import container, load_user_identifiers, purge_expired_analysis_results
+from user.core.availability import identifier_filter
+from user.core.revocation import token_revocation
+from user.core.cache import cache
+from user.core.rate_limit import RateLimitMiddleware, rate_limiter
+from user.core.responses import FastJSONResponse
+from user.core.database import engine
+from user.core.pool_metrics import pool_metrics
+from user.core.query_metrics import QueryMetricsMiddleware
+from user.core.deadline import deadline_metrics
+from user.core.compression import CompressionMiddleware
+from user.core.profiling import RequestProfileMiddleware, request_profiler, sampling_profiler
 
 '''
 python -m uvicorn user.main:app --reload --host 0.0.0.0 --port 8000
@@ -22,9 +35,32 @@ async def lifespan(app: FastAPI):
     print("🚀 User Service 正在启动...")
     print(f"📊 配置环境: {settings.environment}")
     print(f"🔐 JWT算法: {settings.algorithm}")
+    await cache.connect()
+    await token_revocation.start()
+    await rate_limiter.start()
+    await identifier_filter.start(load_user_identifiers)
+    if settings.profiling_enabled:
+        await request_profiler.start()
+    if settings.job_workers_enabled:
+        await container.get('job_worker').start()
+    purge_task = None
+    if settings.analysis_purge_interval > 0:
+        purge_task = asyncio.create_task(purge_expired_analysis_results(settings.analysis_purge_interval))
     yield
     # 关闭时执行
     print("🛑 User Service 正在关闭...")
+    if purge_task is not None:
+        purge_task.cancel()
+        await asyncio.gather(purge_task, return_exceptions=True)
+    await token_revocation.stop()
+    await cache.disconnect()
+    await rate_limiter.stop()
+    await identifier_filter.stop()
+    sampling_profiler.stop()
+    await request_profiler.stop()
+    await container.get('job_worker').stop()
+    await container.get('job_repository').close()
+    await container.get('vector_repository').close()
 
 
 # 创建FastAPI应用实例
@@ -34,9 +70,26 @@ app = FastAPI(
     description="用户管理微服务 - 提供用户认证、授权和用户信息管理功能",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
+# 单请求剖析（携带管理员签发的 X-Profile 令牌时生效）
+if settings.profiling_enabled:
+    app.add_middleware(RequestProfileMiddleware, profiler=request_profiler)
+
+# SQL 语句计数（响应头 X-DB-Queries / Server-Timing）
+app.add_middleware(QueryMetricsMiddleware)
+
+# 限流中间件（位于 CORS 之内，429 响应同样带跨域头）
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        trust_forwarded=settings.rate_limit_trust_forwarded,
+        trusted_hops=settings.rate_limit_trusted_hops
+    )
+
 # 配置CORS中间件
 app.add_middleware(
     CORSMiddleware,
@@ -46,12 +99,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 响应压缩（最外层，429/CORS 预检等小响应低于阈值不压缩）
+if settings.compress_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=settings.compress_encodings_list,
+        minimum_size=settings.compress_min_size,
+        offload_size=settings.compress_offload_size
+    )
+
 
 # 全局异常处理器
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """HTTP异常处理器"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -64,7 +126,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """通用异常处理器"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -84,6 +146,18 @@ async def root_health() -> dict:
     return {"status": "ok"}
 
 
+# 数据库连接池状态（签出等待、溢出使用与连接生命周期；仅超级用户）
+@app.get("/health/pool", dependencies=[Depends(get_current_superuser_id)])
+async def pool_health() -> dict:
+    return pool_metrics.snapshot(engine.sync_engine.pool)
+
+
+# 各路由请求数、超时（504）数与数据库语句超时数（仅超级用户）
+@app.get("/health/timeouts", dependencies=[Depends(get_current_superuser_id)])
+async def timeout_health() -> dict:
+    return deadline_metrics.snapshot()
+
+
 # 注册API路由 - 使用统一的路由管理器
 app.include_router(
     api_v1_router,
@@ -96,12 +170,12 @@ for route in app.routes:
     print(f"  {type(route).__name__}: {str(route)}")
 
 
-# 开发环境启动
+# 开发环境启动（生产环境使用 python user/utils/start_server.py --prod 启动多工作进程）
 if __name__ == "__main__":
     uvicorn.run(
         "user.main:app",
         host="localhost",
-        port=8000,
+        port=settings.server_port,
         reload=settings.debug,
         log_level=settings.log_level.lower()
     )
\ No newline at end of file
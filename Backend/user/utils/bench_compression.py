@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+响应压缩基准
+
+对典型载荷（GeoJSON 要素集合、用户资料 JSON）逐编码、逐级别测量：
+- 压缩耗时（毫秒，取最小值）与吞吐（MB/s，按原始字节计）；
+- 压缩后大小与压缩率；
+- 流式压缩（每批要素 flush 一次）相对整块压缩的体积损失。
+用于确定 user/core/compression.py 中各内容类型的压缩级别。
+
+用法：python user/utils/bench_compression.py [--features 20000] [--batch 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from user.core.compression import AVAILABLE_ENCODINGS, Compressor, compression_level
+from user.core.responses import json_dumps
+
+LEVELS = {
+    "gzip": (1, 3, 5, 6, 9),
+    "br": (1, 3, 4, 5, 6, 9),
+    "zstd": (1, 3, 6, 9, 15),
+}
+
+
+def _features(count: int, start: int = 0) -> list:
+    rng = random.Random(start)
+    features = []
+    for i in range(start, start + count):
+        x, y = 116.0 + rng.random(), 39.0 + rng.random()
+        ring = [[round(x + dx, 6), round(y + dy, 6)] for dx, dy in (
+            (0, 0), (0.0012, 0.0001), (0.0013, 0.0011), (0.0001, 0.0012), (0, 0)
+        )]
+        features.append({
+            "type": "Feature",
+            "id": i,
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+            "properties": {"name": f"地块{i}", "landuse": rng.choice(["住宅", "商业", "工业", "绿地"]),
+                           "area": round(rng.random() * 5000, 2)},
+        })
+    return features
+
+
+def _compress(encoding: str, level: int, chunks: list) -> bytes:
+    compressor = Compressor(encoding, level)
+    return b"".join(compressor.chunk(chunk, i == len(chunks) - 1) for i, chunk in enumerate(chunks))
+
+
+def _bench(encoding: str, level: int, chunks: list, repeat: int) -> float:
+    return min(timeit.repeat(lambda: _compress(encoding, level, chunks), number=repeat, repeat=3)) / repeat * 1000
+
+
+def _report(name: str, content_type: str, chunks: list, repeat: int) -> None:
+    size = sum(len(chunk) for chunk in chunks)
+    print(f"\n{name}（{content_type}，{size / 1024:.1f} KiB，{len(chunks)} 块）")
+    print(f"{'编码':<6}{'级别':>5}{'耗时(ms)':>11}{'MB/s':>9}{'压缩后(KiB)':>14}{'压缩率':>8}{'':>4}")
+    for encoding in AVAILABLE_ENCODINGS:
+        chosen = compression_level(content_type, encoding)
+        for level in LEVELS[encoding]:
+            elapsed = _bench(encoding, level, chunks, repeat)
+            compressed = len(_compress(encoding, level, chunks))
+            mark = "  <- 当前" if level == chosen else ""
+            print(f"{encoding:<6}{level:>5}{elapsed:>11.2f}{size / 1e6 / (elapsed / 1000):>9.1f}"
+                  f"{compressed / 1024:>14.1f}{size / compressed:>7.1f}x{mark}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="响应压缩基准")
+    parser.add_argument("--features", type=int, default=20000, help="GeoJSON 要素数量")
+    parser.add_argument("--batch", type=int, default=1000, help="流式输出每批要素数")
+    args = parser.parse_args()
+
+    print(f"可用编码: {', '.join(AVAILABLE_ENCODINGS)}")
+    features = _features(args.features)
+    collection = json_dumps({"type": "FeatureCollection", "features": features})
+    _report("要素查询 整块", "application/geo+json", [collection], 1)
+
+    batches = [json_dumps(features[i:i + args.batch]) for i in range(0, len(features), args.batch)]
+    _report("要素导出 流式", "application/geo+json", batches, 1)
+
+    profile = json_dumps({
+        "success": True, "message": "用户资料获取成功",
+        "data": {"id": 123456, "username": "bench_user", "email": "bench@example.com",
+                 "phone": "13800000000", "is_active": True, "registered_at": "2024-01-01T00:00:00",
+                 "version": 3},
+    })
+    history = json_dumps({"success": True, "data": [
+        {"id": i, "analysis_type": "buffer", "params": {"distance": i}, "created_at": "2024-01-01T00:00:00"}
+        for i in range(50)
+    ]})
+    _report("用户资料", "application/json", [profile], 200)
+    _report("分析历史", "application/json", [history], 200)
+
+
+if __name__ == "__main__":
+    main()
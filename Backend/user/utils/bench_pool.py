@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+连接池调优报告
+
+以固定并发（模拟单个工作进程的在途请求数）对不同 pool_size 施压，每个请求签出连接、
+执行一次查询（可用 --query-ms 模拟更慢的查询）后归还，报告吞吐、签出等待与溢出使用，
+并结合数据库 max_connections 与工作进程数给出建议值。
+
+用法：python user/utils/bench_pool.py --workers 4 --concurrency 50 --sizes 5,10,20,30
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from user.core.config import settings
+from user.core.pool_metrics import InstrumentedAsyncPool, PoolMetrics
+
+
+async def _run(url: str, pool_size: int, max_overflow: int, concurrency: int,
+               requests: int, query_ms: float) -> dict:
+    metrics = PoolMetrics()
+    pool_class = type("BenchPool", (InstrumentedAsyncPool,), {"metrics": metrics})
+    engine = create_async_engine(
+        url,
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=False
+    )
+    metrics.attach(engine.sync_engine.pool)
+    query = text("SELECT pg_sleep(:seconds)") if query_ms else text("SELECT 1")
+    params = {"seconds": query_ms / 1000} if query_ms else {}
+    remaining = requests
+    errors = 0
+
+    async def client() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(query, params)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    snapshot = metrics.snapshot(engine.sync_engine.pool)
+    await engine.dispose()
+    return {"rps": requests / elapsed, "errors": errors, **snapshot}
+
+
+async def _max_connections(url: str) -> int:
+    engine = create_async_engine(url)
+    async with engine.connect() as connection:
+        value = (await connection.execute(text("SHOW max_connections"))).scalar()
+    await engine.dispose()
+    return int(value)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    max_connections = await _max_connections(args.url)
+    # 预留 10% 给迁移、运维与其它服务
+    budget = int(max_connections * 0.9) // args.workers
+    print(f"数据库 max_connections={max_connections}，{args.workers} 个工作进程，每进程连接上限≈{budget}")
+    print(f"并发 {args.concurrency}，每轮 {args.requests} 个请求，查询耗时 {args.query_ms}ms\n")
+    print(f"{'pool_size':>9}{'overflow':>9}{'rps':>9}{'等待p95(ms)':>13}{'等待max(ms)':>13}"
+          f"{'峰值连接':>9}{'溢出峰值':>9}{'超时':>6}")
+
+    results = []
+    for size in args.sizes:
+        overflow = max(0, min(args.max_overflow, budget - size))
+        result = await _run(args.url, size, overflow, args.concurrency, args.requests, args.query_ms)
+        results.append((size, overflow, result))
+        wait = result["checkout_wait"]
+        print(f"{size:>9}{overflow:>9}{result['rps']:>9.0f}{wait['p95_ms']:>13.2f}{wait['max_ms']:>13.2f}"
+              f"{result['peak_checked_out']:>9}{result['peak_overflow']:>9}{result['timeouts']:>6}")
+
+    best_rps = max(result["rps"] for _, _, result in results)
+    # 建议：吞吐达到最佳值 95% 的最小池，且不超过每进程连接预算
+    for size, overflow, result in results:
+        if result["rps"] >= best_rps * 0.95 and size <= budget:
+            print(f"\n建议 DB_POOL_SIZE={size} DB_MAX_OVERFLOW={overflow}"
+                  f"（{args.workers} 进程合计最多 {(size + overflow) * args.workers} 个连接）")
+            break
+    else:
+        print("\n所有候选池大小都超出连接预算，请减少工作进程数或使用 PgBouncer（DB_PGBOUNCER=true）")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="连接池调优报告")
+    parser.add_argument("--url", default=settings.database_url, help="数据库连接串")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="服务工作进程数")
+    parser.add_argument("--concurrency", type=int, default=50, help="每个工作进程的在途请求数")
+    parser.add_argument("--requests", type=int, default=5000, help="每轮请求数")
+    parser.add_argument("--query-ms", type=float, default=0.0, help="模拟的查询耗时（毫秒）")
+    parser.add_argument("--max-overflow", type=int, default=settings.db_max_overflow)
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")], default=[5, 10, 20, 30])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
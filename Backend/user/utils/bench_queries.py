@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+用户仓储热点查询基准
+
+对每个热点查询分别测量（单次，微秒）：
+- 原写法：每次调用构建 ORM 语句（旧版 PostgreSQLUserRepository 写法）
+- 语句层：复用 statements.py 中预构建的语句
+- 线路耗时：同一 SQL 直接用 asyncpg 预编译语句执行
+Python 开销 = 总耗时 - 线路耗时。测试数据在事务中写入，结束时回滚。
+
+用法：python user/utils/bench_queries.py [--url postgresql+asyncpg://...] [-n 2000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from uuid import uuid4
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from user.core.config import settings
+from user.infrastructure.database.postgres import statements
+from user.infrastructure.database.postgres.models import UserModel
+
+
+async def _timed(func, n: int) -> float:
+    for _ in range(min(n, 50)):
+        await func()
+    start = time.perf_counter()
+    for _ in range(n):
+        await func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def run(url: str, n: int) -> None:
+    engine = create_async_engine(
+        url,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args={"prepared_statement_cache_size": settings.db_prepared_statement_cache_size}
+    )
+    dialect = engine.sync_engine.dialect
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection)
+        user_id = uuid4()
+        username = f"bench_{user_id.hex[:8]}"
+        email = f"{username}@example.com"
+        await session.execute(UserModel.__table__.insert().values(
+            id=user_id, username=username, email=email, hashed_password="x", is_active=True, is_superuser=False
+        ))
+        raw = (await connection.get_raw_connection()).driver_connection
+
+        async def legacy_login():
+            for stmt in (
+                select(UserModel).where(UserModel.username == email),
+                select(UserModel).where(UserModel.email == email),
+            ):
+                if (await session.execute(stmt)).scalar_one_or_none():
+                    return
+
+        cases = [
+            (
+                "get_by_id",
+                lambda: session.execute(select(UserModel).where(UserModel.id == user_id)),
+                statements.GET_BY_ID, {"user_id": user_id},
+            ),
+            (
+                "get_by_login_identifier(邮箱)",
+                legacy_login,
+                statements.GET_BY_LOGIN_IDENTIFIER, {"identifier": email, "email": email},
+            ),
+            (
+                "update_last_login",
+                lambda: session.execute(
+                    update(UserModel).where(UserModel.id == user_id)
+                    .values(last_login=func.now(), updated_at=func.now())
+                ),
+                statements.UPDATE_LAST_LOGIN, {"user_id": user_id},
+            ),
+            (
+                "exists_by_username",
+                lambda: session.execute(
+                    select(func.count()).select_from(UserModel).where(UserModel.username == username)
+                ),
+                statements.EXISTS_BY_USERNAME, {"username": username},
+            ),
+        ]
+
+        print(f"{'查询':<30}{'原写法':>10}{'语句层':>10}{'线路':>10}{'Python开销':>12}")
+        for name, legacy, stmt, params in cases:
+            compiled = stmt.compile(dialect=dialect)
+            bound = compiled.construct_params(params)
+            args = [bound[key] for key in compiled.positiontup]
+            prepared = await raw.prepare(str(compiled))
+
+            before = await _timed(legacy, n)
+            after = await _timed(lambda: session.execute(stmt, params), n)
+            wire = await _timed(lambda: prepared.fetch(*args), n)
+            print(f"{name:<30}{before:>10.1f}{after:>10.1f}{wire:>10.1f}{after - wire:>12.1f}")
+
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="用户仓储热点查询基准")
+    parser.add_argument("--url", default=settings.database_url, help="数据库连接串")
+    parser.add_argument("-n", type=int, default=2000, help="每个查询的执行次数")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+响应序列化基准
+
+对比各接口典型响应的两条编码路径（单次耗时，微秒）：
+- 原路径：响应模型校验 + jsonable_encoder + 标准库 json（FastAPI 默认行为）
+- 现路径：FastJSONRoute 直接以 orjson 编码
+
+用法：python user/utils/bench_serialization.py [--features 10000]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+from uuid import uuid4
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from user.application.dto.user_dto import AuthResponseDTO
+from user.core.responses import json_dumps, orjson
+from user.domains.user.entities import UserEntity
+
+
+def _user() -> UserEntity:
+    return UserEntity(
+        id=uuid4(),
+        email="bench@example.com",
+        username="bench_user",
+        hashed_password="x" * 60,
+        phone="13800000000",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        last_login=datetime.utcnow(),
+    )
+
+
+def _feature_collection(count: int) -> dict:
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": i,
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [[[116.0 + i * 1e-4, 39.0], [116.001 + i * 1e-4, 39.0],
+                                     [116.001 + i * 1e-4, 39.001], [116.0 + i * 1e-4, 39.0]]]
+                },
+                "properties": {"name": f"地块{i}", "area": i * 1.5, "updated": datetime.utcnow()}
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def _stdlib(content, adapter=None) -> bytes:
+    if adapter is not None:
+        content = adapter.dump_python(adapter.validate_python(content))
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False).encode("utf-8")
+
+
+def _bench(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="响应序列化基准")
+    parser.add_argument("--features", type=int, default=10000, help="GeoJSON 要素数量")
+    args = parser.parse_args()
+
+    user = _user()
+    auth_adapter = TypeAdapter(AuthResponseDTO)
+    cases = [
+        ("POST /user/login", {
+            "success": True, "message": "登录成功", "token": "t" * 180,
+            "refresh_token": "r" * 43, "expires_in": 900, "data": {"username": user.username}
+        }, auth_adapter, 20000),
+        ("GET /user/profile", {
+            "success": True, "message": "用户资料获取成功", "data": user.to_profile_dict()
+        }, None, 20000),
+        ("POST /features/{layer}/query", _feature_collection(args.features), None, 3),
+    ]
+
+    print(f"编码器: {'orjson ' + orjson.__version__ if orjson else '标准库 json'}")
+    print(f"{'接口':<32}{'原路径(us)':>14}{'现路径(us)':>14}{'加速':>8}")
+    for name, content, adapter, repeat in cases:
+        assert json.loads(json_dumps(content)) == json.loads(_stdlib(content))
+        before = _bench(lambda: _stdlib(content, adapter), repeat)
+        after = _bench(lambda: json_dumps(content), repeat)
+        print(f"{name:<32}{before:>14.1f}{after:>14.1f}{before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+密码哈希成本标定
+
+在目标机器上逐级提高成本参数并测量单次哈希耗时（取中位数），选出不超过目标耗时的最高成本：
+- bcrypt：rounds（每 +1 耗时约翻倍）；
+- argon2id：固定内存与并行度，调整 time_cost。
+同时按 PASSWORD_HASH_WORKERS 估算单进程每秒可处理的登录数，输出可直接写入 .env 的配置。
+
+用法：python user/utils/calibrate_password_hash.py --scheme bcrypt --target-ms 250
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from user.core.config import settings
+from user.core.security import build_password_context
+
+_SAMPLE_PASSWORD = "calibrate-Password-123"
+
+
+def _measure(context, samples: int) -> float:
+    """单次哈希耗时中位数（毫秒）"""
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash(_SAMPLE_PASSWORD)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def _candidates(args: argparse.Namespace):
+    if args.scheme == "bcrypt":
+        for rounds in range(args.min_cost or 10, (args.max_cost or 16) + 1):
+            yield f"rounds={rounds}", {"PASSWORD_BCRYPT_ROUNDS": rounds}, build_password_context(
+                "bcrypt", bcrypt_rounds=rounds
+            )
+    else:
+        for time_cost in range(args.min_cost or 1, (args.max_cost or 10) + 1):
+            yield f"time_cost={time_cost}", {
+                "PASSWORD_ARGON2_TIME_COST": time_cost,
+                "PASSWORD_ARGON2_MEMORY_COST": args.memory_cost,
+                "PASSWORD_ARGON2_PARALLELISM": args.parallelism,
+            }, build_password_context(
+                "argon2",
+                argon2_time_cost=time_cost,
+                argon2_memory_cost=args.memory_cost,
+                argon2_parallelism=args.parallelism,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="密码哈希成本标定")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.password_hash_scheme)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="单次哈希目标耗时（毫秒）")
+    parser.add_argument("--samples", type=int, default=5, help="每档测量次数")
+    parser.add_argument("--min-cost", type=int, default=None)
+    parser.add_argument("--max-cost", type=int, default=None)
+    parser.add_argument("--memory-cost", type=int, default=settings.password_argon2_memory_cost, help="argon2 内存（KiB）")
+    parser.add_argument("--parallelism", type=int, default=settings.password_argon2_parallelism)
+    parser.add_argument("--workers", type=int, default=settings.password_hash_workers, help="哈希线程数")
+    args = parser.parse_args()
+
+    print(f"算法 {args.scheme}，目标耗时 {args.target_ms:.0f}ms，每档测量 {args.samples} 次\n")
+    print(f"{'参数':<16}{'耗时(ms)':>10}{'登录/秒/进程':>14}")
+    chosen = None
+    for label, env, context in _candidates(args):
+        elapsed = _measure(context, args.samples)
+        print(f"{label:<16}{elapsed:>10.1f}{args.workers * 1000 / elapsed:>14.1f}")
+        if elapsed > args.target_ms:
+            break
+        chosen = (env, elapsed)
+
+    if chosen is None:
+        print("\n最低成本也超过目标耗时，请降低 --min-cost 或放宽 --target-ms")
+        return
+    env, elapsed = chosen
+    print(f"\n建议配置（单次哈希约 {elapsed:.0f}ms）：")
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    for key, value in env.items():
+        print(f"{key}={value}")
+    print(f"PASSWORD_HASH_WORKERS={args.workers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+仓储查询执行计划检查
+
+在一个最终回滚的事务中调用各 PostgreSQL 仓储方法，捕获实际执行的 SQL 与参数，
+逐条以 EXPLAIN (FORMAT JSON) 查看执行计划（SET LOCAL enable_seqscan = off，
+存在可用索引时规划器必然选用）。出现对业务表的 Seq Scan 即说明缺少对应索引，
+以非零退出码结束，可在 CI 中于 `alembic upgrade head` 之后执行；
+tests/test_query_plans.py 在设置 DATABASE_URL 时以同样方式检查。
+
+用法：python user/utils/check_query_plans.py [--url postgresql+asyncpg://...]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from user.core.config import settings
+from user.domains.analysis.entities import AnalysisResultEntity
+from user.domains.user.entities import RefreshTokenEntity, UserEntity
+from user.domains.user.value_objects import UserSearchCursor
+from user.infrastructure.database.postgres.analysis_repositories import PostgreSQLAnalysisResultRepository
+from user.infrastructure.database.postgres.repositories import (
+    PostgreSQLRefreshTokenRepository, PostgreSQLUserRepository
+)
+
+CHECKED_TABLES = {"users", "refresh_tokens", "analysis_results"}
+
+# 按设计需要全表读取的方法（分页导出、构建标识过滤器）
+FULL_SCAN_ALLOWED = {"users.get_all", "users.iter_identifiers"}
+
+Captured = List[Tuple[str, str, Any]]
+
+
+async def _exercise(session: AsyncSession, label: List[str]) -> None:
+    """依次调用仓储方法（label[0] 标记当前方法，供语句捕获使用）"""
+    users = PostgreSQLUserRepository(session)
+    tokens = PostgreSQLRefreshTokenRepository(session)
+    results = PostgreSQLAnalysisResultRepository(session)
+    suffix = uuid4().hex[:8]
+    user = UserEntity.create_new(f"plan_{suffix}@example.com", f"plan_{suffix}", "x", f"199{suffix[:8]}")
+
+    async def call(name: str, coroutine: Any) -> Any:
+        label[0] = name
+        return await coroutine
+
+    await call("users.create", users.create(user))
+    await call("users.get_by_id", users.get_by_id(user.id))
+    await call("users.get_by_email", users.get_by_email(user.email.upper()))
+    await call("users.get_by_username", users.get_by_username(user.username))
+    await call("users.get_by_phone", users.get_by_phone(user.phone))
+    await call("users.get_by_login_identifier", users.get_by_login_identifier(user.email))
+    await call("users.get_all", users.get_all(0, 10))
+    await call("users.get_active_users", users.get_active_users())
+    await call("users.exists_by_username", users.exists_by_username(user.username))
+    await call("users.exists_by_email", users.exists_by_email(user.email))
+    await call("users.exists_by_phone", users.exists_by_phone(user.phone))
+    for field in ("username", "email", "phone"):
+        await call("users.find_existing", users.find_existing(field, [getattr(user, field), "absent"]))
+    label[0] = "users.iter_identifiers"
+    async for _ in users.iter_identifiers(100):
+        break
+    await call("users.get_user_stats", users.get_user_stats())
+    await call("users.search", users.search(suffix, 20))
+    await call("users.search", users.search(suffix, 20, UserSearchCursor(0.5, user.id)))
+    await call("users.autocomplete", users.autocomplete("plan_", 10))
+    await call("users.autocomplete", users.autocomplete("plan_", 10, user.username))
+    await call("users.update_profile", users.update_profile(user.id, {"username": f"plan2_{suffix}"}, 1))
+    await call("users.update", users.update(user.id, {"hashed_password": "y"}))
+    await call("users.replace_password_hash", users.replace_password_hash(user.id, "y", "z"))
+    await call("users.update_last_login", users.update_last_login(user.id))
+
+    token = RefreshTokenEntity(
+        id=uuid4(), user_id=user.id, token_hash=uuid4().hex * 2, family_id=uuid4(),
+        expires_at=datetime.utcnow() + timedelta(days=1), created_at=datetime.utcnow()
+    )
+    await call("refresh_tokens.create", tokens.create(token))
+    await call("refresh_tokens.consume", tokens.consume(token.token_hash, uuid4()))
+    await call("refresh_tokens.get_by_hash", tokens.get_by_hash(token.token_hash))
+    await call("refresh_tokens.revoke_family", tokens.revoke_family(token.family_id))
+    await call("refresh_tokens.revoke_user", tokens.revoke_user(user.id))
+    await call("refresh_tokens.delete_expired", tokens.delete_expired())
+
+    result = AnalysisResultEntity.create_new(user.id, "buffer", "0" * 64, {"distance": 1}, {"ok": True}, 3600)
+    await call("analysis_results.upsert", results.upsert(result))
+    await call("analysis_results.get_by_params", results.get_by_params(user.id, "buffer", "0" * 64))
+    await call("analysis_results.get_by_id", results.get_by_id(user.id, result.id))
+    await call("analysis_results.list_history", results.list_history(user.id, 20, analysis_type="buffer"))
+    await call("analysis_results.evict_lru", results.evict_lru(user.id, 10))
+    await call("analysis_results.delete", results.delete(user.id, result.id))
+    await call("analysis_results.delete_expired", results.delete_expired(user.id))
+
+    await call("users.soft_delete", users.soft_delete(user.id))
+    await call("users.delete", users.delete(user.id))
+
+
+def _seq_scans(plan: Dict[str, Any]) -> List[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def check(url: str, verbose: bool = False) -> int:
+    engine = create_async_engine(url)
+    captured: Captured = []
+    label = [""]
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.lstrip().upper().startswith(("EXPLAIN", "SET", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+            captured.append((label[0], statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    failures = 0
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            await _exercise(AsyncSession(bind=connection), label)
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            for name, statement, parameters in captured:
+                plan = (await connection.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )).scalar()
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+                scans = _seq_scans(plan)
+                ok = not scans or name in FULL_SCAN_ALLOWED
+                failures += 0 if ok else 1
+                status = "OK " if ok else "SEQ"
+                detail = f"  全表扫描: {', '.join(scans)}" if scans else ""
+                print(f"[{status}] {name:<34}{detail}")
+                if verbose or not ok:
+                    print("      " + " ".join(statement.split())[:300])
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"\n共检查 {len(captured)} 条语句，{failures} 条未使用索引")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="仓储查询执行计划检查")
+    parser.add_argument("--url", default=settings.database_url, help="数据库连接串（需已执行迁移）")
+    parser.add_argument("-v", "--verbose", action="store_true", help="输出每条 SQL")
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(check(args.url, args.verbose)) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+gunicorn 生产配置（由 start_server.py --prod 使用，也可直接 gunicorn -c user/utils/gunicorn_conf.py user.main:app）
+
+- 工作进程数按 CPU 核数（SERVER_WORKERS 覆盖），每个进程一个 uvicorn 事件循环；
+- preload：主进程先导入应用再 fork，工作进程共享只读内存页；
+- SIGHUP：按新配置启动新工作进程，旧进程处理完进行中请求后退出，期间监听套接字不中断；
+  preload 时代码不会重新加载，发布新代码用 SIGUSR2 启动新主进程，再向旧主进程发送 SIGTERM；
+- SIGTERM/SIGINT：停止接受新连接，等待进行中请求最多 SERVER_GRACEFUL_TIMEOUT 秒；
+- 多工作进程时任务队列须为 redis（JOB_QUEUE_BACKEND=memory 时拒绝启动）。
+"""
+import gc
+
+from user.core.config import settings
+
+bind = f"{settings.server_host}:{settings.server_port}"
+workers = settings.worker_count
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = settings.server_preload
+graceful_timeout = settings.server_graceful_timeout
+timeout = settings.server_timeout
+keepalive = settings.server_keepalive
+loglevel = settings.log_level.lower()
+accesslog = "-" if settings.debug else None
+
+# memory 任务队列为进程内状态：任务提交与查询/取消/SSE 可能落在不同工作进程
+if workers > 1 and settings.job_queue_backend == "memory":
+    raise RuntimeError("JOB_QUEUE_BACKEND=memory 不支持多工作进程，请设置 JOB_QUEUE_BACKEND=redis")
+
+
+def when_ready(server) -> None:
+    # 预加载产生的对象移出 GC 跟踪，避免 fork 后垃圾回收写入对象头导致共享页被复制
+    if preload_app:
+        gc.freeze()
+    server.log.info("主进程就绪：%d 个工作进程，监听 %s", workers, bind)
+
+
+def post_fork(server, worker) -> None:
+    # 预加载时引擎在主进程创建，丢弃继承的连接池状态，各工作进程建立自己的连接
+    from user.core.database import engine
+
+    engine.sync_engine.dispose(close=False)
@@ -5,188 +5,86 @@
 import asyncio
 import sys
 import os
-from typing import Dict, List, Any
 
 # 添加项目根目录到Python路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, project_root)
 
-async def read_sdx_schema():
-    """读取sdx schema下的所有表结构"""
+async def read_sdx_schema(exact_counts: bool = False):
+    """读取sdx schema下的所有表结构（集合式目录查询，结果写入目录缓存）"""
     print("🔍 开始读取sdx schema下的表结构...")
     
     try:
         from user.core.config import settings
-        import asyncpg
+        from user.core.database import engine
+        from user.infrastructure.database.postgres.catalog import SchemaCatalogService
         
-        # 连接到数据库
-        conn = await asyncpg.connect(
-            host=settings.postgres_host,
-            port=settings.postgres_port,
-            user=settings.postgres_user,
-            password=settings.postgres_password,
-            database=settings.postgres_db
+        catalog_service = SchemaCatalogService(
+            engine,
+            schema=settings.sdx_schema,
+            cache_path=settings.sdx_catalog_path
         )
         
-        print(f"✅ 成功连接到数据库: {settings.postgres_db}")
+        # 1. 采集目录：5 条系统表查询在连接池上并发执行，行数默认取估算值
+        catalog = await catalog_service.refresh(exact_counts=exact_counts)
+        schema_info = catalog['tables']
         
-        # 1. 获取sdx schema下的非sm开头的表
-        print("\n📋 获取sdx schema下的非sm开头的表:")
-        tables = await conn.fetch("""
-            SELECT table_name
-            FROM information_schema.tables 
-            WHERE table_schema = 'sdx'
-            AND table_type = 'BASE TABLE'
-            AND table_name NOT LIKE 'sm%'
-            ORDER BY table_name 
-        """)
+        print(f"✅ 成功读取数据库: {settings.postgres_db}（目录版本 {catalog['version']}）")
         
-        if not tables:
+        print("\n📋 获取sdx schema下的非sm开头的表:")
+        if not schema_info:
             print("❌ 未找到sdx schema下的表")
             return
         
-        print(f"找到 {len(tables)} 个表:")
-        for table in tables:
-            print(f"   - {table['table_name']}")
+        print(f"找到 {len(schema_info)} 个表:")
+        for table_name in schema_info:
+            print(f"   - {table_name}")
         
-        # 2. 读取每个表的详细结构
+        # 2. 显示每个表的详细结构
         print("\n" + "="*80)
         print("📊 详细表结构信息")
         print("="*80)
         
-        schema_info = {}
-        
-        for table in tables:
-            table_name = table['table_name']
+        for table_name, table_info in schema_info.items():
             print(f"\n🔍 表名: {table_name}")
             print("-" * 60)
             
-            # 获取表结构
-            columns = await conn.fetch("""
-                SELECT 
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default,
-                    character_maximum_length,
-                    numeric_precision,
-                    numeric_scale,
-                    ordinal_position
-                FROM information_schema.columns 
-                WHERE table_schema = 'sdx' 
-                AND table_name = $1
-                ORDER BY ordinal_position
-            """, table_name)
-            
-            # 获取主键信息
-            primary_keys = await conn.fetch("""
-                SELECT kcu.column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu 
-                    ON tc.constraint_name = kcu.constraint_name
-                WHERE tc.table_schema = 'sdx'
-                AND tc.table_name = $1
-                AND tc.constraint_type = 'PRIMARY KEY'
-                ORDER BY kcu.ordinal_position
-            """, table_name)
-            
-            # 获取外键信息
-            foreign_keys = await conn.fetch("""
-                SELECT 
-                    kcu.column_name,
-                    ccu.table_name AS foreign_table_name,
-                    ccu.column_name AS foreign_column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu 
-                    ON tc.constraint_name = kcu.constraint_name
-                JOIN information_schema.constraint_column_usage ccu 
-                    ON ccu.constraint_name = tc.constraint_name
-                WHERE tc.table_schema = 'sdx'
-                AND tc.table_name = $1
-                AND tc.constraint_type = 'FOREIGN KEY'
-                ORDER BY kcu.ordinal_position
-            """, table_name)
-            
-            # 获取索引信息
-            indexes = await conn.fetch("""
-                SELECT 
-                    indexname,
-                    indexdef
-                FROM pg_indexes
-                WHERE schemaname = 'sdx'
-                AND tablename = $1
-                ORDER BY indexname
-            """, table_name)
-            
-            # 获取表的行数
-            row_count = await conn.fetchval(f"SELECT COUNT(*) FROM sdx.{table_name}")
-            
-            # 存储表信息
-            table_info = {
-                'columns': [],
-                'primary_keys': [],
-                'foreign_keys': [],
-                'indexes': [],
-                'row_count': row_count
-            }
-            
             # 显示列信息
+            columns = table_info['columns']
             print(f"📋 列结构 (共{len(columns)}列):")
             for col in columns:
-                col_info = {
-                    'name': col['column_name'],
-                    'type': col['data_type'],
-                    'nullable': col['is_nullable'],
-                    'default': col['column_default'],
-                    'max_length': col['character_maximum_length'],
-                    'precision': col['numeric_precision'],
-                    'scale': col['numeric_scale']
-                }
-                table_info['columns'].append(col_info)
-                
-                # 格式化显示
-                nullable_str = "可空" if col['is_nullable'] == 'YES' else "非空"
-                default_str = f"默认: {col['column_default']}" if col['column_default'] else ""
-                length_str = f"长度: {col['character_maximum_length']}" if col['character_maximum_length'] else ""
-                precision_str = f"精度: {col['numeric_precision']}" if col['numeric_precision'] else ""
+                nullable_str = "可空" if col['nullable'] == 'YES' else "非空"
+                default_str = f"默认: {col['default']}" if col['default'] else ""
+                length_str = f"长度: {col['max_length']}" if col['max_length'] else ""
+                precision_str = f"精度: {col['precision']}" if col['precision'] else ""
                 
-                print(f"   {col['ordinal_position']:2d}. {col['column_name']:<20} {col['data_type']:<15} {nullable_str:<6} {default_str} {length_str} {precision_str}")
+                print(f"   {col['position']:2d}. {col['name']:<20} {col['type']:<15} {nullable_str:<6} {default_str} {length_str} {precision_str}")
             
             # 显示主键信息
-            if primary_keys:
-                pk_columns = [pk['column_name'] for pk in primary_keys]
-                table_info['primary_keys'] = pk_columns
-                print(f"🔑 主键: {', '.join(pk_columns)}")
+            if table_info['primary_keys']:
+                print(f"🔑 主键: {', '.join(table_info['primary_keys'])}")
             
             # 显示外键信息
-            if foreign_keys:
+            if table_info['foreign_keys']:
                 print(f"🔗 外键关系:")
-                for fk in foreign_keys:
-                    fk_info = {
-                        'column': fk['column_name'],
-                        'foreign_table': fk['foreign_table_name'],
-                        'foreign_column': fk['foreign_column_name']
-                    }
-                    table_info['foreign_keys'].append(fk_info)
-                    print(f"   {fk['column_name']} -> {fk['foreign_table_name']}.{fk['foreign_column_name']}")
+                for fk in table_info['foreign_keys']:
+                    print(f"   {fk['column']} -> {fk['foreign_table']}.{fk['foreign_column']}")
             
             # 显示索引信息
-            if indexes:
+            if table_info['indexes']:
                 print(f"📇 索引:")
-                for idx in indexes:
-                    idx_info = {
-                        'name': idx['indexname'],
-                        'definition': idx['indexdef']
-                    }
-                    table_info['indexes'].append(idx_info)
-                    print(f"   {idx['indexname']}")
+                for idx in table_info['indexes']:
+                    print(f"   {idx['name']}")
             
-            # 显示行数
-            print(f"📊 数据行数: {row_count:,}")
+            # 显示几何列
+            if table_info['geometry']:
+                geometry = table_info['geometry']
+                print(f"🗺️  几何列: {geometry['column']} ({geometry['type']}, SRID {geometry['srid']})")
             
-            # 存储到总信息中
-            schema_info[table_name] = table_info
+            # 显示行数
+            count_label = "" if table_info['row_count_exact'] else "（估算）"
+            print(f"📊 数据行数{count_label}: {table_info['row_count']:,}")
         
         # 3. 生成SQL创建语句
         print("\n" + "="*80)
@@ -256,7 +154,8 @@ async def read_sdx_schema():
         for table_name, table_info in sorted_tables:
             print(f"   {table_name:<25} {table_info['row_count']:>10,} 行")
         
-        await conn.close()
+        await engine.dispose()
+        print(f"\n💾 目录已缓存: {settings.sdx_catalog_path}")
         print("\n🎉 sdx schema结构读取完成！")
         
         return schema_info
@@ -280,5 +179,5 @@ if __name__ == "__main__":
     print(f"   用户: {settings.postgres_user}")
     print()
     
-    # 执行读取
-    asyncio.run(read_sdx_schema())
+    # 执行读取（--exact-counts 时执行精确计数，大表较慢）
+    asyncio.run(read_sdx_schema(exact_counts="--exact-counts" in sys.argv))
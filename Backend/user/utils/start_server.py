@@ -3,6 +3,7 @@
 SuperMap GIS + AI Backend 启动脚本
 包含依赖检查、数据库初始化和服务启动
 """
+import argparse
 import asyncio
 import sys
 import os
@@ -43,55 +44,110 @@ async def test_database_connection():
 
 
 async def init_database():
-    """初始化数据库"""
+    """初始化数据库（执行 Alembic 迁移至最新版本）"""
     print("\n🚀 初始化数据库...")
     
     try:
-        from user.core.config import settings
-        from user.infrastructure.database.postgres.models import Base
-        from user.core.database import engine
+        from alembic import command
+        from alembic.config import Config
         
-        # 创建所有表
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        config = Config(os.path.join(project_root, "alembic.ini"))
+        config.set_main_option(
+            "script_location",
+            os.path.join(project_root, "user", "infrastructure", "database", "postgres", "migrations")
+        )
+        # env.py 内部使用 asyncio.run，放到线程中执行
+        await asyncio.to_thread(command.upgrade, config, "head")
         
-        print("✅ 数据库表创建成功")
+        print("✅ 数据库迁移完成")
         return True
     except Exception as e:
         print(f"❌ 数据库初始化失败: {e}")
+        print("  已有手工建表的数据库请先执行: alembic stamp 0001_baseline")
         return False
 
 
-def start_server():
-    """启动服务器"""
+def _server_env(workers: int, production: bool = False) -> dict:
+    """子进程环境：工作进程数写入 SERVER_WORKERS，各进程据此均分数据库连接预算
+
+    多进程生产模式下任务队列默认使用 redis（memory 队列各进程独立，任务无法跨进程查询与取消）。
+    """
+    from user.core.config import settings
+    
+    env = dict(os.environ)
+    env["SERVER_WORKERS"] = str(workers)
+    if production and workers > 1 and settings.job_queue_backend == "memory":
+        if "job_queue_backend" in settings.model_fields_set:
+            raise SystemExit("❌ JOB_QUEUE_BACKEND=memory 不支持多工作进程，请改用 redis 或 --workers 1")
+        env["JOB_QUEUE_BACKEND"] = "redis"
+        print("  ℹ️ 多工作进程模式，任务队列使用 redis")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [project_root, env.get("PYTHONPATH")]))
+    return env
+
+
+def start_server(production: bool = False, workers: int = 0):
+    """启动服务器
+
+    开发模式：单个 uvicorn 进程，代码变更自动重载；
+    生产模式：gunicorn 主进程管理 N 个 uvicorn 工作进程（见 gunicorn_conf.py），
+    SIGHUP 平滑重载，SIGTERM 等待进行中请求完成后退出。
+    """
+    from user.core.config import settings
+    from user.core.database import pool_limits
+    
     print("\n🚀 启动API服务器...")
     
-    try:
-        # 使用uvicorn启动服务器
+    workers = workers or (settings.worker_count if production else 1)
+    port = str(settings.server_port)
+    if not production:
         cmd = [
             sys.executable, "-m", "uvicorn",
             "user.main:app",
-            "--host", "0.0.0.0",
-            "--port", "8000",
+            "--host", settings.server_host,
+            "--port", port,
             "--reload"
         ]
-        
-        print(f"执行命令: {' '.join(cmd)}")
-        print("\n📋 服务器信息:")
-        print("  🌐 API地址: http://localhost:8000")
-        print("  📚 API文档: http://localhost:8000/docs")
-        print("  🔍 健康检查: http://localhost:8000/health")
-        print("\n按 Ctrl+C 停止服务器")
-        
-        subprocess.run(cmd)
-        
+    elif sys.platform != "win32":
+        cmd = [
+            sys.executable, "-m", "gunicorn",
+            "user.main:app",
+            "-c", os.path.join(current_dir, "gunicorn_conf.py")
+        ]
+    else:
+        # gunicorn 不支持 Windows：退回 uvicorn 多进程（无预加载与平滑重载）
+        print("⚠️ Windows 下不支持 gunicorn，使用 uvicorn --workers")
+        cmd = [
+            sys.executable, "-m", "uvicorn",
+            "user.main:app",
+            "--host", settings.server_host,
+            "--port", port,
+            "--workers", str(workers),
+            "--timeout-keep-alive", str(settings.server_keepalive)
+        ]
+    
+    pool_size, max_overflow = pool_limits(settings.db_connection_budget, workers)
+    print(f"执行命令: {' '.join(cmd)}")
+    print("\n📋 服务器信息:")
+    print(f"  🌐 API地址: http://localhost:{port}")
+    print(f"  📚 API文档: http://localhost:{port}/docs")
+    print(f"  🔍 健康检查: http://localhost:{port}/health")
+    print(f"  ⚙️ 工作进程: {workers}，每进程连接池 {pool_size} + 溢出 {max_overflow}")
+    if production and sys.platform != "win32":
+        print("  🔄 平滑重载: kill -HUP <主进程PID>")
+    print("\n按 Ctrl+C 停止服务器")
+    
+    process = subprocess.Popen(cmd, env=_server_env(workers, production))
+    try:
+        process.wait()
     except KeyboardInterrupt:
+        # 终端的 Ctrl+C 同时发给子进程，这里等待其完成排空
+        process.wait()
         print("\n🛑 服务器已停止")
     except Exception as e:
         print(f"❌ 启动服务器失败: {e}")
 
 
-async def main():
+async def main(args: argparse.Namespace):
     """主函数"""
     print("=" * 60)
     print("SuperMap GIS + AI Backend 启动工具")
@@ -110,8 +166,11 @@ async def main():
         return
     
     # 4. 启动服务器
-    start_server()
+    start_server(args.prod, args.workers)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="SuperMap GIS + AI Backend 启动工具")
+    parser.add_argument("--prod", action="store_true", help="生产模式（多工作进程，不自动重载）")
+    parser.add_argument("--workers", type=int, default=0, help="工作进程数（默认 SERVER_WORKERS 或 CPU 核数）")
+    asyncio.run(main(parser.parse_args()))
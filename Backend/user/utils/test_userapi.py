@@ -103,6 +103,48 @@ async def test_user_login():
             return None
 
 
+async def test_refresh_token_reuse():
+    """测试刷新令牌重放检测：旧令牌被重放后，同家族的新令牌也不可用"""
+    print(f"\n🔍 测试刷新令牌重放检测...")
+    
+    login_data = {
+        "login_identifier": TEST_USER["username"],
+        "password": TEST_USER["password"]
+    }
+    
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.post(f"{BASE_URL}/api/v1/user/login", json=login_data)
+            old_token = response.json().get("refresh_token")
+            if response.status_code != 200 or not old_token:
+                print(f"❌ 登录未返回刷新令牌: {response.status_code}")
+                return False
+            
+            response = await client.post(f"{BASE_URL}/api/v1/user/refresh", json={"refresh_token": old_token})
+            if response.status_code != 200:
+                print(f"❌ 首次刷新失败: {response.status_code}")
+                print(f"响应内容: {response.text}")
+                return False
+            sibling_token = response.json().get("refresh_token")
+            
+            # 重放已轮换的旧令牌：应返回 401 并吊销整个家族
+            response = await client.post(f"{BASE_URL}/api/v1/user/refresh", json={"refresh_token": old_token})
+            if response.status_code != 401:
+                print(f"❌ 重放旧令牌未被拒绝: {response.status_code}")
+                return False
+            
+            response = await client.post(f"{BASE_URL}/api/v1/user/refresh", json={"refresh_token": sibling_token})
+            if response.status_code != 401:
+                print(f"❌ 重放后同家族令牌仍可使用: {response.status_code}")
+                return False
+            
+            print(f"✅ 刷新令牌重放检测成功：家族已吊销")
+            return True
+        except Exception as e:
+            print(f"❌ 刷新令牌重放检测异常: {e}")
+            return False
+
+
 async def test_user_profile(token):
     """测试获取用户资料"""
     print(f"\n🔍 测试获取用户资料...")
@@ -361,6 +403,7 @@ async def main():
         "health_check": False,
         "user_register": False,
         "user_login": False,
+        "refresh_token_reuse": False,
         "user_profile": False,
         "user_info": False,
         "user_stats": False,
@@ -392,6 +435,13 @@ async def main():
         return
     test_results["user_login"] = True
     
+    # 3.1 测试刷新令牌重放检测
+    print("\n📋 测试步骤 3.1/10: 刷新令牌重放检测")
+    test_results["refresh_token_reuse"] = await test_refresh_token_reuse()
+    if not test_results["refresh_token_reuse"]:
+        print("❌ 刷新令牌重放检测失败")
+        return
+    
     # 4. 测试获取用户资料
     print("\n📋 测试步骤 4/10: 获取用户资料")
     test_results["user_profile"] = await test_user_profile(token)
@@ -454,6 +504,7 @@ async def main():
     print("  ✅ 系统健康检查")
     print("  ✅ 用户注册 (POST /register)")
     print("  ✅ 用户登录 (POST /login)")
+    print("  ✅ 刷新令牌重放检测 (POST /refresh)")
     print("  ✅ 获取用户资料 (GET /profile)")
     print("  ✅ 获取用户信息 (GET /me)")
     print("  ✅ 获取用户统计 (GET /stats)")